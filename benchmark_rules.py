@@ -1,86 +1,18 @@
 import pandas as pd
-import ast
 import time
-import re
-from collections import defaultdict
-from typing import Dict, List, Set, DefaultDict, Any
 
-# --- Mock Data and Functions ---
-STOPWORDS = {
-    "message", "info", "via", "from", "to", "route", "system", "topics", "log", "time", "date",
-    "ospf-1", "router-id", "area", "area-0", "election", "version", "instance", "created",
-    "broadcast", "loopback", "dr", "bdr", "me", "other", "loading", "full", "exchange",
-    "done", "established", "init", "twoway", "address", "ip",
-}
+from rca.engine import CompiledRuleEngine
+from rca.inference import Matcher, load_rule_sets
+from rca.rules import DASHBOARD_RULES_PATHS, GENERIC_KEYWORDS
+from rca.tokenizer import DEFAULT_TOKENIZER
 
-GENERIC_KEYWORDS = {
-    "interface", "link", "ethernet", "port", "0x0800", "udp", "admin", "bridge",
-    "proto", "icmp", "type", "code",
-}
-
-def clean_text(text):
-    if not isinstance(text, str):
-        return set()
-    text = text.lower()
-    text = re.sub(r"([^\w\s])", r" \1 ", text)
-    text = re.sub(r"[^a-z0-9\s_]", " ", text)
-    tokens = set(text.split())
-    return {t for t in tokens if t not in STOPWORDS and not t.isdigit() and len(t) > 2}
-
-def parse_antecedents(x):
-    if pd.isna(x):
-        return set()
-    if isinstance(x, (list, set)):
-        return set(x)
-    s = str(x).strip()
-    try:
-        if s.startswith("["):
-            return set(ast.literal_eval(s))
-    except Exception:
-        pass
-    parts = [p.strip() for p in s.split(",") if p.strip()]
-    return set(parts)
+# Tokenizer, stopwords & GENERIC_KEYWORDS sama dengan dashboard (rca.*)
+clean_text = DEFAULT_TOKENIZER.tokenize
 
 def load_rules():
     print("Loading rules...")
     t0 = time.time()
-    rules_path_auto = "Data/rules/ACTIVE_DASHBOARD_RULES_AUTO.csv"
-    rules_path_cur = "Data/rules/ACTIVE_DASHBOARD_RULES_CURATED.csv"
-
-    df_auto = pd.read_csv(rules_path_auto, low_memory=False)
-    df_cur = pd.read_csv(rules_path_cur, low_memory=False)
-    
-    df_cur = df_cur.rename(
-        columns={
-            "Root Cause (Gejala)": "antecedents",
-            "Impact (Akibat)": "consequents",
-            "Confidence (%)": "confidence",
-            "Lift Ratio": "lift",
-        }
-    )
-
-    df_auto = df_auto.copy()
-    df_auto["antecedents"] = df_auto["antecedents"].apply(parse_antecedents)
-
-    df_cur = df_cur.copy()
-    df_cur["antecedents"] = df_cur["antecedents"].apply(parse_antecedents)
-
-    rules_df = pd.concat([df_auto, df_cur], ignore_index=True, sort=False)
-    
-    # Pre-filter logic from dashboard.py
-    def map_diagnosis(val):
-        s = str(val).upper()
-        if "NORMAL" in s: return None
-        if "UPSTREAM_FAILURE" in s: return "UPSTREAM_FAILURE"
-        if "LINK_FAILURE" in s: return "LINK_FAILURE"
-        if "STORM" in s or "LOOPED" in s: return "BROADCAST_STORM"
-        if "DDOS" in s: return "DDoS"
-        return None
-
-    rules_df["final_diagnosis"] = rules_df["consequents"].apply(map_diagnosis)
-    rules_df["antecedents"] = rules_df["antecedents"].apply(lambda x: set(x) - STOPWORDS)
-    rules_df = rules_df[rules_df["antecedents"].map(len) > 0].dropna(subset=["final_diagnosis"])
-    
+    rules_df = load_rule_sets(DASHBOARD_RULES_PATHS)
     print(f"Loaded {len(rules_df)} rules in {time.time()-t0:.2f}s")
     return rules_df
 
@@ -140,67 +72,14 @@ def matched_to_dict(chunk_df, rules_list):
             
     return time.time() - start_time, matched_count
 
-class RuleEngine:
-    def __init__(self, rules_df):
-        self.rules: List[Dict[str, Any]] = []
-        self.token_map: DefaultDict[str, List[int]] = defaultdict(list)
-        
-        # Pre-process rules into list of dicts and build index
-        for idx, rule in rules_df.iterrows():
-            antecedents = rule["antecedents"]
-            # Filter generic single-word rules ONCE during load
-            if len(antecedents) == 1 and list(antecedents)[0] in GENERIC_KEYWORDS:
-                continue
-                
-            rule_obj = {
-                "antecedents": antecedents,
-                "confidence": float(rule.get("confidence", 0) or 0),
-                "lift": float(rule.get("lift", 0) or 0),
-                "final_diagnosis": rule["final_diagnosis"],
-                "idx": len(self.rules)
-            }
-            self.rules.append(rule_obj)
-            
-            for token in antecedents:
-                self.token_map[token].append(int(rule_obj["idx"])) # type: ignore
-                
-    def process(self, chunk_df):
-        matched_count = 0
-        start_time = time.time()
-        
-        for idx, row in chunk_df.iterrows():
-            msg = str(row.get("message", ""))
-            tokens = clean_text(msg)
-            
-            candidate_counts: DefaultDict[int, int] = defaultdict(int) # type: ignore
-            relevant_rules_indices = set()
-            
-            # 1. Gather candidates
-            for token in tokens:
-                if token in self.token_map:
-                    for rule_idx in self.token_map[str(token)]: # Force cast to str to satisfy Pyre
-                        candidate_counts[rule_idx] += 1
-                        relevant_rules_indices.add(rule_idx)
-            
-            # 2. Check candidates
-            best_rule = None
-            best_conf = -1.0
-            
-            for rule_idx in relevant_rules_indices:
-                rule = self.rules[rule_idx]
-                # Optimization: Count match
-                if candidate_counts[rule_idx] == len(rule["antecedents"]): # type: ignore
-                     # Strict subset check (double verification not strictly needed if count matches distinct tokens, but safe)
-                     # Actually count is enough if tokens are unique sets.
-                     
-                     if rule["confidence"] > best_conf or (rule["confidence"] == best_conf and rule["lift"] > (best_rule["lift"] if best_rule else 0)): # type: ignore
-                         best_rule = rule
-                         best_conf = rule["confidence"]
-                         
-            if best_rule:
-                matched_count += 1
-                
-        return time.time() - start_time, matched_count
+def matched_engine(chunk_df, rules_df):
+    # Jalur produksi: filter generic sekali saat load, lalu rca.inference.Matcher (batch)
+    single_generic = rules_df["antecedents"].map(lambda a: len(a) == 1 and next(iter(a)) in GENERIC_KEYWORDS)
+    matcher = Matcher(CompiledRuleEngine(rules_df[~single_generic]))
+    start_time = time.time()
+    messages = chunk_df["message"].astype(str).tolist()
+    matched_count = sum(1 for m in matcher.match_many(messages) if m is not None)
+    return time.time() - start_time, matched_count
 
 # --- Main ---
 if __name__ == "__main__":
@@ -228,10 +107,9 @@ if __name__ == "__main__":
     t_dict, c_dict = matched_to_dict(chunk_df, rules_list)
     print(f"Time: {t_dict:.4f}s | Matches: {c_dict}")
     
-    # 3. Indexed Engine
-    print("\n--- Strategy 3: Inverted Index (Complex) ---")
-    engine = RuleEngine(rules_df)
-    t_idx, c_idx = engine.process(chunk_df)
+    # 3. Shared compiled matcher (rca.inference)
+    print("\n--- Strategy 3: Compiled Matcher (rca.inference) ---")
+    t_idx, c_idx = matched_engine(chunk_df, rules_df)
     print(f"Time: {t_idx:.4f}s | Matches: {c_idx}")
     
     print(f"\nSpeedup (Dict vs Iterrows): {t_iter/t_dict:.2f}x")
@@ -0,0 +1,119 @@
+"""
+Benchmark agregasi chunk: loop iterrows lama (referensi dari dashboard.py) vs
+agregasi kolom rca.aggregation (group-by per diagnosis). Kedua hasil (dict
+issues) dibandingkan pada setiap capture Data/*.csv dengan chunk CHUNK_SIZE.
+
+Jalankan dari root project:
+    python benchmarks/bench_aggregation.py [--chunk 2000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.aggregation import aggregate_chunk  # noqa: E402
+from rca.diagnosis import Diagnoser  # noqa: E402
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+
+
+# Loop agregasi lama dari dashboard.py (referensi)
+def legacy_aggregate(chunk_df, diagnoser, issues):
+    matched_count = 0
+    if "message" in chunk_df.columns:
+        messages = chunk_df["message"].astype(str).tolist()
+    else:
+        messages = [""] * len(chunk_df)
+    if "source_router" in chunk_df.columns:
+        devices = chunk_df["source_router"].tolist()
+    else:
+        devices = [""] * len(chunk_df)
+    diagnoses = diagnoser.diagnose_batch(messages, devices)
+
+    for (idx, row), msg, result in zip(chunk_df.iterrows(), messages, diagnoses):
+        diag, prio, evidence, confidence = result
+        if diag:
+            matched_count += 1
+            if diag not in issues:
+                issues[diag] = {
+                    "count": 0,
+                    "priority": prio,
+                    "routers": set(),
+                    "last_seen": row.get("time", "-"),
+                    "evidence": set(),
+                    "logs": [],
+                    "lift": 0,
+                }
+            issue = issues[diag]
+            issue["count"] += 1
+            issue["routers"].add(row.get("source_router", "Unknown"))
+            issue["last_seen"] = row.get("time", "-")
+            issue["evidence"].update(evidence)
+            conf_display = f"{confidence * 100:.1f}%" if confidence is not None else "100.0%"
+            if len(issue["logs"]) < 200:
+                issue["logs"].append({
+                    "Time": row.get("time", "-"),
+                    "Device": row.get("source_router", "Unknown"),
+                    "Diagnosis": diag,
+                    "Priority": prio,
+                    "Symptoms (Antecedents)": ", ".join(sorted(str(e) for e in evidence)),
+                    "Confidence": conf_display,
+                    "Trigger Message": msg[:120] + "..." if len(msg) > 120 else msg,
+                })
+    return matched_count
+
+
+def normalize(value):
+    # NaN (time/source_router kosong) tidak sama dengan dirinya sendiri
+    if isinstance(value, dict):
+        return [(k, normalize(v)) for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if isinstance(value, set):
+        return sorted(map(str, value))
+    if isinstance(value, float) and value != value:
+        return "nan"
+    return value
+
+
+def run(func, df, diagnoser, chunk):
+    issues = {}
+    matched = 0
+    t0 = time.perf_counter()
+    for start in range(0, len(df), chunk):
+        matched += func(df.iloc[start:start + chunk], diagnoser, issues)
+    return time.perf_counter() - t0, matched, issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agregasi chunk")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--chunk", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = CompiledRuleEngine(load_rules_df(os.path.join(PROJECT_ROOT, args.rules)))
+
+    print(f"{'Capture':<58} {'Baris':>7} {'iterrows':>10} {'Kolom':>9} {'Speedup':>8} {'Sama':>5}")
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path)
+        if "message" not in df.columns:
+            continue
+        # Diagnoser tanpa cache agar kedua jalur mengukur pekerjaan yang sama
+        t_old, m_old, old = run(legacy_aggregate, df, Diagnoser(engine, cache_size=0), args.chunk)
+        t_new, m_new, new = run(aggregate_chunk, df, Diagnoser(engine, cache_size=0), args.chunk)
+        same = m_old == m_new and normalize(old) == normalize(new)
+        print(
+            f"{os.path.basename(path):<58} {len(df):>7} {t_old * 1000:>8.1f}ms "
+            f"{t_new * 1000:>7.1f}ms {t_old / t_new:>7.1f}x {str(same):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
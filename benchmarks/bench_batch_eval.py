@@ -0,0 +1,176 @@
+"""
+Benchmark evaluasi offline: Master_Dataset_Gabungan_v3.0.csv (~14k baris)
+terhadap SEMUA rule grid Data/rules/Rules_Sup*_Conf*_v3.0.csv (49 file).
+
+- legacy : predict_with_rules lama (iterrows + literal_eval per baris +
+           inverted index + issubset), hanya untuk --legacy-files file pertama
+           karena terlalu lambat untuk seluruh grid
+- engine : rca.inference.Matcher (CompiledRuleEngine, best-first per baris)
+- batch  : predict_with_rules sekarang (rca.batch.TransactionMatrix: transaksi
+           CSR di-encode sekali untuk semua file, matriks token x rule per file)
+
+Prediksi, confidence & lift dicek identik per baris untuk setiap file.
+
+Jalankan dari root project:
+    python benchmarks/bench_batch_eval.py [--legacy-files 1] [--pattern "Rules_Sup*_Conf*_v3.0.csv"]
+"""
+
+import argparse
+import ast
+import contextlib
+import glob
+import importlib.util
+import io
+import os
+import sys
+import time
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.batch import TransactionMatrix  # noqa: E402
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.inference import Matcher  # noqa: E402
+
+EVALUATE_RULES = os.path.join(PROJECT_ROOT, "rules_evaluation", "test_run_20260415", "evaluate_rules.py")
+RULES_DIR = os.path.join(PROJECT_ROOT, "Data", "rules")
+
+
+def load_evaluate_rules():
+    spec = importlib.util.spec_from_file_location("evaluate_rules", EVALUATE_RULES)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def quiet(fn, *args):
+    """Panggil fungsi evaluate_rules tanpa log progres ke stdout"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def legacy_predict(df_test, df_rules):
+    """Referensi: loop predict_with_rules lama, return list (prediksi, confidence, lift)"""
+    rules_list = [
+        {
+            "antecedents": rule["antecedents_set"],
+            "diagnosis": rule["diagnosis"],
+            "confidence": float(rule.get("confidence", 0)),
+            "lift": float(rule.get("lift", 0)),
+        }
+        for _, rule in df_rules.iterrows()
+    ]
+    token_to_rules = defaultdict(list)
+    for idx, rule in enumerate(rules_list):
+        for token in rule["antecedents"]:
+            token_to_rules[token].append(idx)
+
+    out = []
+    for _, row in df_test.iterrows():
+        items = row["items"]
+        if isinstance(items, str):
+            items = ast.literal_eval(items)
+        items_set = set(items)
+        candidate_indices = set()
+        for token in items_set:
+            candidate_indices.update(token_to_rules.get(token, ()))
+        best_rule, best_conf, best_lift = None, -1.0, -1.0
+        for rule_idx in candidate_indices:
+            rule = rules_list[rule_idx]
+            if rule["antecedents"].issubset(items_set):
+                conf, lift = rule["confidence"], rule["lift"]
+                if conf > best_conf or (conf == best_conf and lift > best_lift):
+                    best_rule, best_conf, best_lift = rule, conf, lift
+        if best_rule is None:
+            out.append(("NORMAL", 0.0, 0.0))
+        else:
+            out.append((best_rule["diagnosis"], best_conf, best_lift))
+    return out
+
+
+def engine_predict(items_sets, df_rules):
+    matcher = Matcher(CompiledRuleEngine({
+        "antecedents": a, "final_diagnosis": d, "confidence": c, "lift": l,
+    } for a, d, c, l in zip(df_rules["antecedents_set"], df_rules["diagnosis"],
+                            df_rules["confidence"], df_rules["lift"])))
+    return [
+        ("NORMAL", 0.0, 0.0) if r is None else (r["final_diagnosis"], r["confidence"], r["lift"])
+        for r in matcher.match_tokens(items_sets)
+    ]
+
+
+def detail_tuples(match_details):
+    return [(d["predicted"], float(d["confidence"]), float(d["lift"])) for d in match_details]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch matcher evaluasi rule grid")
+    parser.add_argument("--pattern", default="Rules_Sup*_Conf*_v3.0.csv")
+    parser.add_argument("--legacy-files", type=int, default=1, help="jumlah file yang juga dicek dgn loop lama")
+    args = parser.parse_args()
+
+    er = load_evaluate_rules()
+    paths = sorted(glob.glob(os.path.join(RULES_DIR, args.pattern)))
+    df = quiet(er.preprocess_master_dataset, er.MASTER_DATASET)
+    items_sets = [set(items) for items in df["items"]]
+    t0 = time.perf_counter()
+    transactions = TransactionMatrix(df["items"])
+    t_encode = time.perf_counter() - t0
+    print(
+        f"Dataset: {os.path.basename(er.MASTER_DATASET)} ({len(df)} baris, {transactions.n_unique} transaksi unik, "
+        f"encode {t_encode * 1000:.0f}ms) | rule files: {len(paths)}"
+    )
+
+    t_load = t_batch = t_engine = t_legacy = 0.0
+    n_legacy = 0
+    all_same = True
+    print(f"{'file':<36} {'rules':>6} {'batch':>9} {'engine':>9} {'legacy':>9} {'cocok':>6}  identik")
+    for i, path in enumerate(paths):
+        t0 = time.perf_counter()
+        df_rules = quiet(er.load_rules, path)
+        t_load += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df_result, details = quiet(er.predict_with_rules, df, df_rules, transactions)
+        elapsed_batch = time.perf_counter() - t0
+        t_batch += elapsed_batch
+        batch = detail_tuples(details)
+        same = list(df_result["Prediksi"]) == [p for p, _, _ in batch]
+
+        t0 = time.perf_counter()
+        engine = engine_predict(items_sets, df_rules)
+        elapsed_engine = time.perf_counter() - t0
+        t_engine += elapsed_engine
+        same = same and engine == batch
+
+        legacy_col = f"{'-':>9}"
+        if i < args.legacy_files:
+            t0 = time.perf_counter()
+            legacy = legacy_predict(df, df_rules)
+            elapsed_legacy = time.perf_counter() - t0
+            t_legacy += elapsed_legacy
+            n_legacy += 1
+            legacy_col = f"{elapsed_legacy:8.2f}s"
+            same = same and legacy == batch
+
+        all_same = all_same and same
+        matched = sum(1 for d in details if d["matched"])
+        print(
+            f"{os.path.basename(path):<36} {len(df_rules):>6} {elapsed_batch:8.3f}s "
+            f"{elapsed_engine:8.3f}s {legacy_col} {matched / len(df):6.1%}  {same}"
+        )
+
+    print(f"\nTotal {len(paths)} file x {len(df)} baris:")
+    print(f"  load_rules (parse CSV)   : {t_load:.2f}s")
+    print(f"  batch (predict_with_rules): {t_batch:.2f}s")
+    print(f"  engine (Matcher)          : {t_engine:.2f}s")
+    if n_legacy:
+        per_file = t_legacy / n_legacy
+        print(f"  legacy                    : {per_file:.2f}s/file -> estimasi {per_file * len(paths):.0f}s untuk grid")
+    print("HASIL:", "IDENTIK" if all_same else "ADA BERBEDA")
+    sys.exit(0 if all_same else 1)
+
+
+if __name__ == "__main__":
+    main()
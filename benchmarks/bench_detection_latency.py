@@ -0,0 +1,427 @@
+"""
+Harness latensi deteksi end-to-end: router mencatat log -> issue tampil di
+dashboard. Pipeline yang diukur sama dengan mode live:
+
+  router (stand-in)  --GET /rest/log-->  live_log_collector.fetch_logs
+  --write_live_csv-->  live_log.csv  --LiveAnalyzer.poll-->  LiveSnapshot
+  --fragment run_every-->  dashboard
+
+- Router stand-in: server HTTP lokal per router di topologi (format REST
+  MikroTik: .id hex, time, topics, message; buffer memory --memory-lines
+  baris seperti "memory-lines" RouterOS), diisi beban latar dari capture
+  normal (--loads pesan/detik total) dan marker berkala.
+- Marker: pesan capture asli yang oleh pipeline produksi didiagnosis
+  sebagai --expect (default LINK_FAILURE); bisa diganti --marker-message.
+- Collector: fungsi live_log_collector (fetch_logs + write_live_csv) dengan
+  loop yang sama seperti main() tetapi interval poll dari --polls.
+- Analisis: LiveAnalyzer + Diagnoser (rule set aktif RuleSetRegistry).
+- Dashboard: fragment membaca snapshot setiap interval refresh; waktu tampil
+  dihitung dari waktu snapshot + fase timer acak (--viewers fase per
+  interval), sehingga semua --refresh dievaluasi dari satu run.
+
+Timestamp per marker: emit -> fetched -> written -> analyzed -> displayed.
+Marker yang tidak pernah terdeteksi (mis. tergeser dari buffer router
+sebelum dipoll) dihitung sebagai missed.
+
+Jalankan dari root project:
+    python benchmarks/bench_detection_latency.py [--polls 1,5] [--refresh 2,5] [--loads 0,50,500] [--duration 20]
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import live_log_collector as collector  # noqa: E402
+from rca.diagnosis import Diagnoser  # noqa: E402
+from rca.live import LIVE_LOG_COLUMNS, LiveAnalyzer  # noqa: E402
+from rca.registry import RuleSetRegistry  # noqa: E402
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+TOPOLOGY = os.path.join(PROJECT_ROOT, "topologi_Simulasi.json")
+MARKER_SOURCE = os.path.join(PROJECT_ROOT, "Data", "dataset_linkfailure.csv")
+BACKGROUND_SOURCE = os.path.join(PROJECT_ROOT, "Data", "dataset_normal.csv")
+STAGES = ["emit", "fetched", "written", "analyzed"]
+# Batas tunggu setelah marker terakhir, di luar poll collector + poll analyzer
+DRAIN_EXTRA_S = 5.0
+
+
+class StandInRouter:
+    """Pengganti router MikroTik: buffer log di memori, dilayani lewat GET /rest/log"""
+
+    def __init__(self, name, memory_lines=1000):
+        self.name = name
+        self._entries = deque(maxlen=memory_lines)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RestLogHandler)
+        self.server.router = self
+        self.address = f"127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name=f"router-{self.name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def emit(self, topics, message):
+        with self._lock:
+            log_id = f"*{self._next_id:X}"
+            self._next_id += 1
+            self._entries.append({
+                ".id": log_id,
+                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "topics": topics,
+                "message": message,
+            })
+        return log_id
+
+    def payload(self):
+        with self._lock:
+            return json.dumps(list(self._entries)).encode("utf-8")
+
+
+class _RestLogHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/rest/log":
+            self.send_error(404)
+            return
+        body = self.server.router.payload()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MarkerTracker:
+    """Timestamp per marker (router, log_id) untuk setiap tahap pipeline"""
+
+    def __init__(self):
+        self.markers = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def emitted(self, key, ts):
+        with self._lock:
+            self.markers[key] = {"emit": ts}
+            self._pending.add(key)
+
+    def mark(self, stage, keys, ts):
+        with self._lock:
+            for key in keys:
+                entry = self.markers.get(key)
+                if entry is not None and stage not in entry:
+                    entry[stage] = ts
+                    if stage == "analyzed":
+                        self._pending.discard(key)
+
+    def pending(self):
+        with self._lock:
+            return set(self._pending)
+
+
+def pick_marker(diagnoser, expect, routers):
+    """Baris capture asli yang didiagnosis `expect` oleh pipeline produksi (utamakan pesan 'down')"""
+    df = pd.read_csv(MARKER_SOURCE)
+    df = df[df["source_router"].isin(routers)]
+    results = diagnoser.diagnose_batch(df["message"].astype(str).tolist(), df["source_router"].tolist())
+    hits = df[[r.diagnosis == expect for r in results]]
+    if hits.empty:
+        raise SystemExit(f"[ERROR] Tidak ada pesan di {MARKER_SOURCE} yang didiagnosis {expect}; pakai --marker-message")
+    down = hits[hits["message"].astype(str).str.contains("down", case=False)]
+    router, topics, message = (down if len(down) else hits).groupby(
+        ["source_router", "topics", "message"]
+    ).size().idxmax()
+    return router, topics, message
+
+
+def background_pool(diagnoser, expect, routers):
+    """Pesan latar per router dari capture normal, tanpa pesan yang ikut didiagnosis `expect`"""
+    df = pd.read_csv(BACKGROUND_SOURCE)
+    results = diagnoser.diagnose_batch(df["message"].astype(str).tolist(), df["source_router"].tolist())
+    df = df[[r.diagnosis != expect for r in results]]
+    rows = list(zip(df["source_router"], df["topics"].fillna("").astype(str), df["message"].astype(str)))
+    pools = {name: [(t, m) for r, t, m in rows if r == name] for name in routers}
+    everything = [(t, m) for _, t, m in rows]
+    return {name: pool or everything for name, pool in pools.items()}
+
+
+def run_collector(live_path, poll_interval, tracker, marker_keys, stop):
+    """Loop live_log_collector.main() (tanpa print status) dengan timestamp fetched/written"""
+    while not stop.is_set():
+        all_new_logs = []
+        for router in collector.ROUTERS:
+            all_new_logs.extend(collector.fetch_logs(router))
+        fetched_at = time.time()
+        if all_new_logs:
+            keys = [(log["source_router"], log["log_id"]) for log in all_new_logs]
+            keys = [k for k in keys if k in marker_keys]
+            tracker.mark("fetched", keys, fetched_at)
+            success, _ = collector.write_live_csv(
+                pd.DataFrame(all_new_logs), live_path, max_rows=collector.MAX_LIVE_LOG_ROWS
+            )
+            if success:
+                tracker.mark("written", keys, time.time())
+        stop.wait(poll_interval)
+
+
+def watch_snapshots(analyzer, expect, tracker, stop, interval=0.01):
+    """Catat waktu publikasi snapshot pertama yang memuat baris marker + issue `expect`"""
+    version = None
+    while not stop.is_set():
+        snapshot = analyzer.snapshot()
+        if snapshot.version != version:
+            version = snapshot.version
+            pending = tracker.pending()
+            if pending and snapshot.live_df is not None and expect in snapshot.issues:
+                present = set(zip(snapshot.live_df["source_router"], snapshot.live_df["log_id"].astype(str)))
+                tracker.mark("analyzed", pending & present, snapshot.updated_at)
+        stop.wait(interval)
+
+
+def emit_background(routers, pools, load, stop, tick=0.05):
+    if load <= 0:
+        return
+    rng = random.Random(1)
+    names = list(routers)
+    carry = 0.0
+    while not stop.is_set():
+        carry += load * tick
+        n, carry = int(carry), carry - int(carry)
+        for _ in range(n):
+            name = rng.choice(names)
+            routers[name].emit(*rng.choice(pools[name]))
+        stop.wait(tick)
+
+
+def run_once(args, poll_interval, load, diagnoser, routers_cfg, marker, pools):
+    """Satu run pipeline untuk (poll interval, beban); return dict marker -> timestamp tahap"""
+    tracker = MarkerTracker()
+    marker_keys = set()
+    routers = {cfg["name"]: StandInRouter(cfg["name"], args.memory_lines).start() for cfg in routers_cfg}
+    workdir = tempfile.mkdtemp(prefix="rca_latency_")
+    topology_path = os.path.join(workdir, "topology.json")
+    live_path = os.path.join(workdir, "live_log.csv")
+    with open(topology_path, "w", encoding="utf-8") as f:
+        json.dump([{"name": name, "ip": r.address} for name, r in routers.items()], f)
+    collector.load_topology(topology_path)
+    pd.DataFrame(columns=LIVE_LOG_COLUMNS).to_csv(live_path, index=False, encoding="utf-8")  # wipe on startup
+
+    diagnoser.reload(diagnoser.engine)  # cache diagnosis dingin per run
+    analyzer = LiveAnalyzer(live_path, diagnoser, poll_interval=args.analyzer_poll, idle_timeout=math.inf)
+    stop_load, stop_pipeline = threading.Event(), threading.Event()
+    threads = [
+        threading.Thread(target=emit_background, args=(routers, pools, load, stop_load), daemon=True),
+        threading.Thread(target=run_collector, args=(live_path, poll_interval, tracker, marker_keys, stop_pipeline),
+                         daemon=True),
+        threading.Thread(target=watch_snapshots, args=(analyzer, args.expect, tracker, stop_pipeline), daemon=True),
+    ]
+    analyzer.start()
+    for t in threads:
+        t.start()
+
+    rng = random.Random(args.seed)
+    marker_router, topics, message = marker
+    start = time.time()
+    while time.time() - start < args.duration:
+        time.sleep(rng.uniform(0.5, 1.5) * args.marker_every)
+        log_id = routers[marker_router].emit(topics, message)
+        key = (marker_router, log_id)
+        marker_keys.add(key)
+        tracker.emitted(key, time.time())
+
+    deadline = time.time() + poll_interval + 3 * args.analyzer_poll + DRAIN_EXTRA_S
+    while tracker.pending() and time.time() < deadline:
+        time.sleep(0.05)
+
+    stop_load.set()
+    stop_pipeline.set()
+    for t in threads:
+        t.join()
+    analyzer.stop()
+    for r in routers.values():
+        r.stop()
+    for name in os.listdir(workdir):
+        os.remove(os.path.join(workdir, name))
+    os.rmdir(workdir)
+    return start, tracker.markers
+
+
+def displayed_times(analyzed, start, refresh, viewers, rng):
+    """Waktu tampil per marker untuk `viewers` fase timer fragment acak: tick pertama >= analyzed"""
+    phases = start + rng.uniform(0, refresh, size=viewers)
+    ticks = np.ceil((analyzed[:, None] - phases[None, :]) / refresh)
+    return phases[None, :] + np.maximum(ticks, 0) * refresh
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": round(float(np.percentile(values, 50)), 1),
+        "p95": round(float(np.percentile(values, 95)), 1),
+        "max": round(float(np.max(values)), 1),
+    }
+
+
+def summarize(start, markers, refresh, viewers, seed):
+    """Distribusi latensi (ms) per tahap + total untuk satu interval refresh"""
+    detected = [m for m in markers.values() if "analyzed" in m]
+    lost_at = {}
+    for m in markers.values():
+        if "analyzed" not in m:
+            reached = [s for s in STAGES if s in m][-1]
+            lost_at[reached] = lost_at.get(reached, 0) + 1
+    summary = {"markers": len(markers), "detected": len(detected), "missed": len(markers) - len(detected),
+               "missed_after_stage": lost_at}
+    if not detected:
+        summary["stages_ms"] = {}
+        return summary
+
+    rng = np.random.default_rng(seed)
+    stage = {s: np.array([m[s] for m in detected]) for s in STAGES}
+    displayed = displayed_times(stage["analyzed"], start, refresh, viewers, rng)
+    summary["stages_ms"] = {
+        "collect": percentiles((stage["fetched"] - stage["emit"]) * 1000),
+        "write": percentiles((stage["written"] - stage["fetched"]) * 1000),
+        "analyze": percentiles((stage["analyzed"] - stage["written"]) * 1000),
+        "display": percentiles(((displayed - stage["analyzed"][:, None]) * 1000).ravel()),
+        "total": percentiles(((displayed - stage["emit"][:, None]) * 1000).ravel()),
+    }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi deteksi end-to-end router -> dashboard")
+    parser.add_argument("--polls", default="1,5", help="interval poll collector (detik), default collector = 5")
+    parser.add_argument("--refresh", default="2,5", help="interval refresh fragment dashboard (detik)")
+    parser.add_argument("--loads", default="0,50,500", help="beban latar total (pesan/detik)")
+    parser.add_argument("--duration", type=float, default=20.0, help="durasi injeksi marker per run (detik)")
+    parser.add_argument("--marker-every", type=float, default=2.0, help="rata-rata jarak antar marker (detik)")
+    parser.add_argument("--analyzer-poll", type=float, default=1.0, help="poll_interval LiveAnalyzer")
+    parser.add_argument("--memory-lines", type=int, default=1000, help="buffer log router stand-in")
+    parser.add_argument("--viewers", type=int, default=20, help="fase timer refresh acak per marker")
+    parser.add_argument("--expect", default="LINK_FAILURE", help="diagnosis yang diharapkan dari marker")
+    parser.add_argument("--marker-message", default=None, help="pesan marker manual (default: dari capture)")
+    parser.add_argument("--marker-router", default=None)
+    parser.add_argument("--marker-topics", default="interface,info")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "detection_latency"))
+    args = parser.parse_args()
+
+    polls = [float(x) for x in args.polls.split(",") if x.strip()]
+    refreshes = [float(x) for x in args.refresh.split(",") if x.strip()]
+    loads = [float(x) for x in args.loads.split(",") if x.strip()]
+
+    with open(TOPOLOGY, encoding="utf-8") as f:
+        routers_cfg = json.load(f)
+    router_names = [r["name"] for r in routers_cfg]
+    registry = RuleSetRegistry()
+    diagnoser = Diagnoser(registry.engine())
+
+    if args.marker_message:
+        marker = (args.marker_router or router_names[0], args.marker_topics, args.marker_message)
+    else:
+        marker = pick_marker(diagnoser, args.expect, router_names)
+    check = diagnoser.diagnose(marker[2], marker[0])
+    if check.diagnosis != args.expect:
+        raise SystemExit(f"[ERROR] Marker didiagnosis {check.diagnosis}, bukan {args.expect}")
+    if marker[0] not in router_names:
+        routers_cfg.append({"name": marker[0]})
+        router_names.append(marker[0])
+    pools = background_pool(diagnoser, args.expect, router_names)
+
+    print(f"Rule set aktif: {registry.active.name} | router: {len(router_names)} | expect: {args.expect}")
+    print(f"Marker ({marker[0]}, {marker[1]}): {marker[2][:100]}")
+    header = (
+        f"{'poll s':>6} {'refresh s':>9} {'load/s':>7} {'marker':>6} {'miss':>5} "
+        f"{'collect':>8} {'write':>7} {'analyze':>8} {'display':>8} {'total p50':>10} {'p95':>8} {'max':>8}"
+    )
+    print("(latensi ms; kolom tahap = p50)")
+    print(header)
+    print("-" * len(header))
+
+    runs, rows = [], []
+    for poll_interval in polls:
+        for load in loads:
+            start, markers = run_once(args, poll_interval, load, diagnoser, routers_cfg, marker, pools)
+            run = {
+                "poll_s": poll_interval,
+                "load_per_s": load,
+                "markers": [
+                    {"router": key[0], "log_id": key[1],
+                     **{s: round(ts - start, 4) for s, ts in stamps.items()}}
+                    for key, stamps in markers.items()
+                ],
+                "by_refresh": {},
+            }
+            for refresh in refreshes:
+                summary = summarize(start, markers, refresh, args.viewers, args.seed)
+                run["by_refresh"][str(refresh)] = summary
+                st = summary["stages_ms"]
+                p50 = lambda name: st[name]["p50"] if name in st else None  # noqa: E731
+                fmt = lambda v, w: f"{v:>{w},.0f}" if v is not None else f"{'-':>{w}}"  # noqa: E731
+                print(
+                    f"{poll_interval:>6g} {refresh:>9g} {load:>7g} {summary['markers']:>6} {summary['missed']:>5} "
+                    f"{fmt(p50('collect'), 8)} {fmt(p50('write'), 7)} {fmt(p50('analyze'), 8)} "
+                    f"{fmt(p50('display'), 8)} {fmt(p50('total'), 10)} "
+                    f"{fmt(st['total']['p95'] if st else None, 8)} {fmt(st['total']['max'] if st else None, 8)}"
+                )
+                row = {"poll_s": poll_interval, "refresh_s": refresh, "load_per_s": load,
+                       "markers": summary["markers"], "missed": summary["missed"]}
+                for name, dist in st.items():
+                    for q, v in dist.items():
+                        row[f"{name}_{q}_ms"] = v
+                rows.append(row)
+            runs.append(run)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    with open(args.output + ".csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "rules": registry.active.name,
+            "expect": args.expect,
+            "marker": {"router": marker[0], "topics": marker[1], "message": marker[2]},
+            "duration_s": args.duration,
+            "marker_every_s": args.marker_every,
+            "analyzer_poll_s": args.analyzer_poll,
+            "memory_lines": args.memory_lines,
+            "live_window": collector.MAX_LIVE_LOG_ROWS,
+            "viewers": args.viewers,
+        },
+        "runs": runs,
+    }
+    with open(args.output + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] {args.output}.csv")
+    print(f"[OK] {args.output}.json")
+
+
+if __name__ == "__main__":
+    main()
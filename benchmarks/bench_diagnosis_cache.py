@@ -0,0 +1,63 @@
+"""
+Benchmark LRU cache Diagnoser (pesan -> diagnosis) pada capture Data/*.csv.
+Membandingkan Diagnoser tanpa cache (cache_size=0) vs dengan cache, memeriksa
+hasilnya identik, dan mencetak hit rate / eviction per capture.
+
+Jalankan dari root project:
+    python benchmarks/bench_diagnosis_cache.py [--cache-size 50000] [--batch 2000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.diagnosis import Diagnoser  # noqa: E402
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+
+
+def run(diagnoser, messages, devices, batch):
+    out = []
+    t0 = time.perf_counter()
+    for start in range(0, len(messages), batch):
+        out.extend(diagnoser.diagnose_batch(messages[start:start + batch], devices[start:start + batch]))
+    return time.perf_counter() - t0, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LRU cache diagnosis")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--cache-size", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = CompiledRuleEngine(load_rules_df(os.path.join(PROJECT_ROOT, args.rules)))
+
+    print(f"{'Capture':<58} {'Baris':>7} {'Tanpa cache':>12} {'Cache':>10} {'Hit rate':>9} {'Evict':>6} {'Beda':>5}")
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path)
+        if "message" not in df.columns:
+            continue
+        messages = df["message"].astype(str).tolist()
+        devices = df["source_router"].tolist() if "source_router" in df.columns else [""] * len(df)
+
+        t_plain, plain = run(Diagnoser(engine, cache_size=0), messages, devices, args.batch)
+        cached_diag = Diagnoser(engine, cache_size=args.cache_size)
+        t_cached, cached = run(cached_diag, messages, devices, args.batch)
+        stats = cached_diag.cache.stats()
+        mismatch = sum(1 for a, b in zip(plain, cached) if a != b)
+        print(
+            f"{os.path.basename(path):<58} {len(df):>7} {t_plain * 1000:>10.1f}ms "
+            f"{t_cached * 1000:>8.1f}ms {stats['hit_rate']:>9.2%} {stats['evictions']:>6} {mismatch:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
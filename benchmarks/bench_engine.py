@@ -0,0 +1,86 @@
+"""
+Benchmark RuleEngine (inverted index, per pesan) vs CompiledRuleEngine
+(token ID + matriks sparse, per batch) pada seluruh pesan di Data/*.csv.
+Hasil kedua engine dibandingkan baris per baris.
+
+Jalankan dari root project:
+    python benchmarks/bench_engine.py [--rules Data/rules/...csv] [--batch 2000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.engine import CompiledRuleEngine, RuleEngine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+from rca.tokenizer import clean_text_batch  # noqa: E402
+
+
+def load_token_rows():
+    messages = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path, usecols=lambda c: c == "message")
+        if "message" in df.columns:
+            messages.extend(df["message"].astype(str).tolist())
+    return clean_text_batch(messages)
+
+
+def rank_key(rule):
+    return None if rule is None else (rule["confidence"], rule["lift"], rule["final_diagnosis"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RuleEngine vs CompiledRuleEngine")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--batch", type=int, default=2000, help="Ukuran chunk (sama dengan dashboard)")
+    args = parser.parse_args()
+
+    rules_df = load_rules_df(os.path.join(PROJECT_ROOT, args.rules))
+    token_rows = load_token_rows()
+    n = len(token_rows)
+    print(f"Rules: {len(rules_df)} | Pesan: {n}")
+
+    t0 = time.perf_counter()
+    engine = RuleEngine(rules_df)
+    t_build_ref = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    compiled = CompiledRuleEngine(rules_df)
+    t_build_comp = time.perf_counter() - t0
+    print(f"Build: RuleEngine {t_build_ref * 1000:.1f} ms | CompiledRuleEngine {t_build_comp * 1000:.1f} ms")
+
+    t0 = time.perf_counter()
+    ref = [engine.match(tokens) for tokens in token_rows]
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    single = [compiled.match(tokens) for tokens in token_rows]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = []
+    for start in range(0, n, args.batch):
+        batched.extend(compiled.match_many(token_rows[start:start + args.batch]))
+    t_batch = time.perf_counter() - t0
+
+    for name, elapsed in [
+        ("RuleEngine.match (per pesan)", t_ref),
+        ("CompiledRuleEngine.match (per pesan)", t_single),
+        (f"CompiledRuleEngine.match_many (batch {args.batch})", t_batch),
+    ]:
+        print(f"{name:<46} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} pesan/s  {t_ref / elapsed:6.2f}x")
+
+    # Rule yang berbeda hanya boleh terjadi pada rule dengan (confidence, lift) identik
+    diff_single = sum(1 for a, b in zip(ref, single) if rank_key(a) != rank_key(b))
+    diff_batch = sum(1 for a, b in zip(ref, batched) if rank_key(a) != rank_key(b))
+    print(f"\nHasil berbeda (confidence, lift, diagnosis): single={diff_single}, batch={diff_batch}")
+
+
+if __name__ == "__main__":
+    main()
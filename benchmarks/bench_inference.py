@@ -0,0 +1,266 @@
+"""
+Benchmark suite hot path inferensi dengan data asli: setiap capture skenario
+Data/*.csv (kolom message) diputar ulang lewat jalur produksi dashboard:
+RuleSetRegistry().engine() (rule set aktif) -> Diagnoser (tokenizer +
+CompiledRuleEngine.match_many + override + LRU cache) -> rca.aggregation
+per chunk CHUNK_SIZE (sama dengan analisis file upload di dashboard.py).
+
+Per skenario dilaporkan:
+- rows/s end-to-end (Diagnoser baru = cache dingin, best of --repeat)
+- latensi per baris p50/p99/max (tokenize + match + override satu pesan,
+  tanpa cache = kasus terburuk)
+- breakdown per tahap batch: tokenize, match, override, agregasi
+- peak memory (tracemalloc selama end-to-end) + RSS maksimum proses
+
+Hasil disimpan sebagai JSON dan bisa dibandingkan dengan baseline yang
+disimpan sebelumnya; exit code 1 jika ada regresi melebihi --tolerance.
+
+Jalankan dari root project:
+    python benchmarks/bench_inference.py [--save-baseline] [--baseline benchmarks/results/baseline_inference.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.aggregation import aggregate_chunk, aggregate_frame, classify_chunk  # noqa: E402
+from rca.diagnosis import Diagnoser, apply_overrides, rule_diagnosis  # noqa: E402
+from rca.registry import RuleSetRegistry  # noqa: E402
+
+CHUNK_SIZE = 2000  # dashboard.py: pd.read_csv(..., chunksize=CHUNK_SIZE)
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "bench_inference.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline_inference.json")
+
+# Metrik yang dicek saat membandingkan dengan baseline: (path, arah lebih baik)
+COMPARED_METRICS = [
+    (("rows_per_s",), "higher"),
+    (("latency_us", "p50"), "lower"),
+    (("latency_us", "p99"), "lower"),
+    (("peak_mem_kb",), "lower"),
+]
+
+
+class _Precomputed:
+    """Pengganti Diagnoser untuk classify_chunk: mengembalikan hasil yang sudah dihitung"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def diagnose_batch(self, messages, devices=None, timer=None):
+        return self.results
+
+
+def load_scenarios(pattern):
+    scenarios = {}
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", pattern))):
+        df = pd.read_csv(path, low_memory=False)
+        if "message" in df.columns and len(df):
+            scenarios[os.path.splitext(os.path.basename(path))[0]] = df
+    return scenarios
+
+
+def run_production(df, engine):
+    """Jalur dashboard: Diagnoser baru (cache dingin) + aggregate_chunk per chunk"""
+    diagnoser = Diagnoser(engine)
+    issues = {}
+    matched = 0
+    for start in range(0, len(df), CHUNK_SIZE):
+        matched += aggregate_chunk(df.iloc[start:start + CHUNK_SIZE], diagnoser, issues)
+    return matched, issues
+
+
+def stage_breakdown(df, engine):
+    """Waktu per tahap (ms) untuk satu batch penuh, urutan sama dengan Diagnoser._compute"""
+    diagnoser = Diagnoser(engine, cache_size=0)
+    messages = df["message"].astype(str).tolist()
+    devices = df["source_router"].tolist() if "source_router" in df.columns else [""] * len(df)
+    stages = {}
+
+    t0 = time.perf_counter()
+    token_rows = diagnoser.tokenizer.tokenize_batch(messages)
+    stages["tokenize"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    best_rules = engine.match_many(token_rows)
+    stages["match"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    overrides = diagnoser.overrides
+    results = [
+        apply_overrides(msg.lower(), overrides.device_flags(dev), rule_diagnosis(rule), overrides)
+        for msg, dev, rule in zip(messages, devices, best_rules)
+    ]
+    stages["override"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    issues = {}
+    for start in range(0, len(df), CHUNK_SIZE):
+        chunk = df.iloc[start:start + CHUNK_SIZE]
+        frame, evidence_sets = classify_chunk(chunk, _Precomputed(results[start:start + CHUNK_SIZE]))
+        aggregate_frame(issues, frame, evidence_sets)
+    stages["aggregate"] = time.perf_counter() - t0
+    return {name: round(seconds * 1000, 2) for name, seconds in stages.items()}
+
+
+def row_latencies(df, engine):
+    """Latensi per baris (mikrodetik) jalur satu pesan tanpa cache"""
+    diagnoser = Diagnoser(engine, cache_size=0)
+    tokenizer, overrides = diagnoser.tokenizer, diagnoser.overrides
+    messages = df["message"].astype(str).tolist()
+    devices = df["source_router"].tolist() if "source_router" in df.columns else [""] * len(df)
+    out = np.empty(len(messages), dtype=np.float64)
+    clock = time.perf_counter_ns
+    for i, (msg, dev) in enumerate(zip(messages, devices)):
+        t0 = clock()
+        rule = engine.match(tokenizer.tokenize(msg))
+        apply_overrides(msg.lower(), overrides.device_flags(dev), rule_diagnosis(rule), overrides)
+        out[i] = clock() - t0
+    return out / 1000
+
+
+def bench_scenario(df, engine, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        matched, issues = run_production(df, engine)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    run_production(df, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = row_latencies(df, engine)
+    return {
+        "rows": len(df),
+        "diagnosed": matched,
+        "issues": sorted(issues),
+        "rows_per_s": round(len(df) / best, 1),
+        "total_ms": round(best * 1000, 2),
+        "latency_us": {
+            "p50": round(float(np.percentile(latencies, 50)), 2),
+            "p99": round(float(np.percentile(latencies, 99)), 2),
+            "max": round(float(latencies.max()), 2),
+        },
+        "stages_ms": stage_breakdown(df, engine),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def metric(entry, path):
+    for key in path:
+        entry = entry[key]
+    return entry
+
+
+def compare(current, baseline, tolerance):
+    """Return list regresi (skenario, metrik, baseline, sekarang, perubahan relatif)"""
+    regressions = []
+    for name, entry in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for path, better in COMPARED_METRICS:
+            old, new = metric(base, path), metric(entry, path)
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = change < -tolerance if better == "higher" else change > tolerance
+            if worse:
+                regressions.append((name, ".".join(path), old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot path inferensi dengan data asli")
+    parser.add_argument("--scenarios", default="*.csv", help="glob capture di Data/")
+    parser.add_argument("--repeat", type=int, default=3, help="ulangan end-to-end (ambil tercepat)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=None, help="JSON baseline untuk perbandingan")
+    parser.add_argument("--save-baseline", action="store_true", help=f"simpan hasil sebagai {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="batas regresi relatif (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    registry = RuleSetRegistry()
+    engine = registry.engine()
+    scenarios = load_scenarios(args.scenarios)
+    print(f"Rule set aktif: {registry.active.name} ({len(engine.rules)} rule) | skenario: {len(scenarios)}")
+
+    header = (
+        f"{'skenario':<52} {'baris':>7} {'baris/s':>9} {'p50 us':>8} {'p99 us':>8} "
+        f"{'tok ms':>7} {'match ms':>8} {'ovr ms':>7} {'agg ms':>7} {'peak KB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    results = {}
+    for name, df in scenarios.items():
+        entry = bench_scenario(df, engine, args.repeat)
+        results[name] = entry
+        st = entry["stages_ms"]
+        print(
+            f"{name[:52]:<52} {entry['rows']:>7} {entry['rows_per_s']:>9,.0f} "
+            f"{entry['latency_us']['p50']:>8.1f} {entry['latency_us']['p99']:>8.1f} "
+            f"{st['tokenize']:>7.1f} {st['match']:>8.1f} {st['override']:>7.1f} {st['aggregate']:>7.1f} "
+            f"{entry['peak_mem_kb']:>9,.0f}"
+        )
+
+    total_rows = sum(e["rows"] for e in results.values())
+    total_ms = sum(e["total_ms"] for e in results.values())
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rules": registry.active.name,
+            "n_rules": len(engine.rules),
+            "chunk_size": CHUNK_SIZE,
+            "repeat": args.repeat,
+        },
+        "total": {
+            "rows": total_rows,
+            "rows_per_s": round(total_rows / (total_ms / 1000), 1) if total_ms else None,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "scenarios": results,
+    }
+    print(f"\nTotal: {total_rows} baris, {report['total']['rows_per_s']:,.0f} baris/s | "
+          f"RSS maks {report['total']['max_rss_kb'] / 1024:.0f} MB")
+
+    output = DEFAULT_BASELINE if args.save_baseline else args.output
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[OK] {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        print(f"\nBanding dengan baseline {args.baseline} ({baseline['meta']['timestamp']}), "
+              f"toleransi {args.tolerance:.0%}:")
+        for name, path, old, new, change in regressions:
+            print(f"  [REGRESI] {name}: {path} {old:g} -> {new:g} ({change:+.1%})")
+        print("HASIL:", "ADA REGRESI" if regressions else "TIDAK ADA REGRESI")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark override: rantai if/elif lama (substring per kondisi) vs
+OverrideMatcher (satu regex multi-pattern dari OVERRIDE_TABLE).
+Hasil keduanya dibandingkan pada seluruh pesan Data/*.csv ditambah pesan
+sintetis yang menggabungkan literal override secara acak.
+
+Jalankan dari root project:
+    python benchmarks/bench_overrides.py
+"""
+
+import glob
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.overrides import HAS_AHOCORASICK, OverrideMatcher  # noqa: E402
+
+
+# Rantai override lama dari dashboard.py (referensi), return nama entri tabel
+def legacy_override(msg_lower, dev):
+    if "internet connection lost" in msg_lower or "8.8.8.8 rto" in msg_lower or ("ether1" in msg_lower and "link down" in msg_lower and "edge" in dev.lower()):
+        return "upstream_failure"
+    elif "looped packet" in msg_lower or "broadcast_storm" in msg_lower or "mac flapping" in msg_lower or "host moved" in msg_lower or "255.255.255.255" in msg_lower:
+        return "l2_loop"
+    elif "ospf" in msg_lower and "broadcast" in msg_lower and "state change to init" in msg_lower:
+        return "ospf_broadcast_init"
+    elif "ddos_detected" in msg_lower or "flood" in msg_lower:
+        return "ddos_flood"
+    elif "bandwidth-test" in msg_lower or "bandwidth test" in msg_lower:
+        return "bandwidth_test"
+    elif "port scan" in msg_lower or "port scan detected" in msg_lower or "scan" in msg_lower and "drop" in msg_lower:
+        return "port_scan"
+    elif "icmp flood" in msg_lower or ("icmp" in msg_lower and "limit" in msg_lower):
+        return "icmp_flood"
+    elif "udp flood" in msg_lower or "tcp flood" in msg_lower:
+        return "tcp_udp_flood"
+    return None
+
+
+def load_rows():
+    rows = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path)
+        if "message" not in df.columns:
+            continue
+        devices = df["source_router"].astype(str) if "source_router" in df.columns else [""] * len(df)
+        rows.extend(zip(df["message"].astype(str).str.lower(), devices))
+    return rows
+
+
+def synthetic_rows(matcher, n=20000, seed=42):
+    rng = random.Random(seed)
+    literals = matcher.message_literals
+    filler = ["ether2", "src", "proto", "input", "link up", "x", "1", ",", " "]
+    rows = []
+    for _ in range(n):
+        parts = rng.sample(literals, rng.randint(0, 3)) + rng.sample(filler, 2)
+        rng.shuffle(parts)
+        rows.append((" ".join(parts), rng.choice(["R-Edge", "R-Core-1", "R-Dist-2"])))
+    return rows
+
+
+def main():
+    matcher = OverrideMatcher()
+    rows = load_rows()
+    check_rows = rows + synthetic_rows(matcher)
+    print(f"Pesan capture: {len(rows)} | total dicek (+ sintetis): {len(check_rows)}")
+
+    t0 = time.perf_counter()
+    legacy = [legacy_override(m, d) for m, d in rows]
+    t_legacy = time.perf_counter() - t0
+
+    print(f"{'Rantai if/elif':<30} {t_legacy * 1000:9.1f} ms  {len(rows) / t_legacy:12,.0f} pesan/s")
+
+    backends = [OverrideMatcher(use_ahocorasick=False)]
+    if HAS_AHOCORASICK:
+        backends.append(OverrideMatcher(use_ahocorasick=True))
+    for matcher in backends:
+        t0 = time.perf_counter()
+        for m, d in rows:
+            matcher.match(m, matcher.device_flags(d))
+        elapsed = time.perf_counter() - t0
+
+        mismatch = 0
+        for m, d in check_rows:
+            entry = matcher.match(m, matcher.device_flags(d))
+            if (entry["name"] if entry else None) != legacy_override(m, d):
+                mismatch += 1
+        name = f"OverrideMatcher ({matcher.backend})"
+        print(f"{name:<30} {elapsed * 1000:9.1f} ms  {len(rows) / elapsed:12,.0f} pesan/s  beda: {mismatch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark analisis file upload: agregasi berurutan di satu proses vs
+ChunkPool (chunk di-stream ke process pool, agregat parsial digabung
+berurutan dengan merge_issues). Input = gabungan semua capture Data/*.csv
+(diulang --repeat kali) yang ditulis ke file sementara, lalu dibaca per chunk
+seperti mode upload dashboard. Hasil issues kedua jalur dibandingkan.
+
+Jalankan dari root project:
+    python benchmarks/bench_parallel_upload.py [--workers 4] [--repeat 3] [--chunk 2000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.aggregation import aggregate_chunk, merge_issues  # noqa: E402
+from rca.diagnosis import Diagnoser  # noqa: E402
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.parallel import ChunkPool, default_workers  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+
+from bench_aggregation import normalize  # noqa: E402
+
+
+def build_input(path, repeat):
+    frames = []
+    for csv in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(csv)
+        if "message" in df.columns:
+            frames.append(df.reindex(columns=["fetched_at", "source_router", "log_id", "time", "topics", "message"]))
+    full = pd.concat(frames * repeat, ignore_index=True)
+    full.to_csv(path, index=False)
+    return len(full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analisis upload paralel")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk", type=int, default=2000)
+    args = parser.parse_args()
+    rules_path = os.path.join(PROJECT_ROOT, args.rules)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "upload.csv")
+        n_rows = build_input(path, args.repeat)
+        print(f"Input: {n_rows:,} baris, {os.path.getsize(path) / 1e6:.1f} MB, chunk {args.chunk}")
+
+        diagnoser = Diagnoser(CompiledRuleEngine(load_rules_df(rules_path)))
+        t0 = time.perf_counter()
+        sequential = {}
+        for chunk in pd.read_csv(path, chunksize=args.chunk):
+            aggregate_chunk(chunk, diagnoser, sequential)
+        t_seq = time.perf_counter() - t0
+        print(f"{'Berurutan (1 proses)':<28} {t_seq:7.2f}s  {n_rows / t_seq:10,.0f} baris/s")
+
+        pool = ChunkPool(rules_path, workers=args.workers)
+        try:
+            # Pemanasan: start proses worker + load rules tidak ikut diukur
+            list(pool.imap(pd.read_csv(path, chunksize=args.chunk, nrows=args.chunk * 2)))
+            t0 = time.perf_counter()
+            parallel = {}
+            for _, _, partial in pool.imap(pd.read_csv(path, chunksize=args.chunk)):
+                merge_issues(parallel, partial)
+            t_par = time.perf_counter() - t0
+        finally:
+            pool.close()
+        same = normalize(sequential) == normalize(parallel)
+        name = f"ChunkPool ({args.workers} worker)"
+        print(f"{name:<28} {t_par:7.2f}s  {n_rows / t_par:10,.0f} baris/s  speedup {t_seq / t_par:.1f}x  sama: {same}")
+
+
+if __name__ == "__main__":
+    main()
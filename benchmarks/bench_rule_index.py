@@ -0,0 +1,76 @@
+"""
+Benchmark index biner rules: cold start dari CSV (read_csv + literal_eval +
+map_diagnosis + build engine) vs load index .npz (rca.rule_index), serta
+pengecekan bahwa kedua engine memberi rule terbaik yang sama untuk semua
+pesan di Data/*.csv.
+
+Jalankan dari root project:
+    python benchmarks/bench_rule_index.py [--rules Data/rules/...csv] [--repeat 5]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.rule_index import compile_rule_index, is_index_fresh, load_rule_index  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+from rca.tokenizer import DEFAULT_TOKENIZER  # noqa: E402
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark index biner rules")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rules_path = os.path.join(PROJECT_ROOT, args.rules)
+
+    t_compile, index_path = best_of(lambda: compile_rule_index(rules_path), 1)
+    print(f"Index: {os.path.relpath(index_path, PROJECT_ROOT)} ({os.path.getsize(index_path) / 1024:.0f} KB)")
+    print(f"{'Compile (sekali)':<32} {t_compile * 1000:9.1f} ms")
+
+    t_csv, csv_engine = best_of(lambda: CompiledRuleEngine(load_rules_df(rules_path)), args.repeat)
+    t_fresh, _ = best_of(lambda: is_index_fresh(rules_path, index_path), args.repeat)
+    t_idx, idx_engine = best_of(lambda: load_rule_index(index_path), args.repeat)
+    print(f"{'Cold start dari CSV':<32} {t_csv * 1000:9.1f} ms")
+    print(f"{'Cek fingerprint index':<32} {t_fresh * 1000:9.1f} ms")
+    print(f"{'Load index biner':<32} {t_idx * 1000:9.1f} ms  ({t_csv / t_idx:.0f}x lebih cepat)")
+
+    messages = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path)
+        if "message" in df.columns:
+            messages.extend(df["message"].astype(str).tolist())
+    token_rows = DEFAULT_TOKENIZER.tokenize_batch(messages)
+
+    def key(rule):
+        return None if rule is None else (
+            frozenset(rule["antecedents"]), rule["confidence"], rule["lift"], rule["final_diagnosis"]
+        )
+
+    mismatch = sum(
+        1 for a, b in zip(csv_engine.match_many(token_rows), idx_engine.match_many(token_rows))
+        if key(a) != key(b)
+    )
+    print(f"Pesan dicek: {len(messages)} | beda hasil: {mismatch}")
+
+
+if __name__ == "__main__":
+    main()
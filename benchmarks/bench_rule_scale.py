@@ -0,0 +1,259 @@
+"""
+Harness skalabilitas rule engine untuk rule set 1k - 1M rule (persiapan
+menurunkan min support di 03_fp_growth_grid_search.py di bawah 0.01).
+
+Rule set dibuat benchmarks/synth_rules.py (distribusi token realistis dari
+Data_Siap_Mining_v3.0.csv) dan di-cache per ukuran. Pesan uji = set token
+transaksi asli dari dataset yang sama. Setiap kombinasi (ukuran, engine)
+diukur di proses anak baru (spawn) agar RSS tidak tercampur:
+- build time  : konstruksi engine dari DataFrame rule (+ index lazy best-first)
+- RSS         : selisih RSS sebelum/sesudah build + RSS puncak proses anak
+- latency     : per pesan p50/p99/mean (match satu pesan); untuk jalur
+                matriks batch dilaporkan rata-rata per pesan
+Engine: RuleEngine (lama, dibatasi --legacy-max), CompiledRuleEngine
+(best-first dan matriks), SetTrieRuleEngine. Hasil match semua engine dicek
+sama (confidence, lift, diagnosis) per ukuran.
+
+Output: JSON + CSV + plot PNG (build time, RSS, latency vs jumlah rule) di
+benchmarks/results/.
+
+Jalankan dari root project:
+    python benchmarks/bench_rule_scale.py [--sizes 1000,10000,100000,1000000] [--queries 2000]
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rca.engine import CompiledRuleEngine, RuleEngine  # noqa: E402
+from rca.subset_index import SetTrieRuleEngine  # noqa: E402
+from synth_rules import RuleSynthesizer  # noqa: E402
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+CACHE_DIR = os.path.join(RESULTS_DIR, "rule_scale_cache")
+DEFAULT_SIZES = "1000,3000,10000,30000,100000,300000,1000000"
+ENGINES = ["legacy", "compiled", "compiled-matrix", "settrie"]
+# RuleEngine lama: menit per ukuran di atas ini
+LEGACY_MAX_RULES = 30_000
+
+
+def current_rss_kb():
+    """RSS proses saat ini (Linux /proc), fallback ke RSS maksimum"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def build_engine(name, rules_df):
+    if name == "legacy":
+        return RuleEngine(rules_df)
+    if name == "settrie":
+        return SetTrieRuleEngine(rules_df)
+    engine = CompiledRuleEngine(rules_df)
+    if name == "compiled":
+        engine._best_first_index()  # index anchor lazy -> ikut dihitung sebagai build
+    return engine
+
+
+def measure(name, rules_path, queries):
+    """Dijalankan di proses anak: build + latency satu engine untuk satu rule set"""
+    rules_df = pd.read_pickle(rules_path)
+    rss_before = current_rss_kb()
+    t0 = time.perf_counter()
+    engine = build_engine(name, rules_df)
+    build_s = time.perf_counter() - t0
+    rss_after = current_rss_kb()
+
+    if name == "compiled-matrix":
+        t0 = time.perf_counter()
+        matched = engine.match_many_matrix(queries)
+        mean_us = (time.perf_counter() - t0) / len(queries) * 1e6
+        latency = {"p50": None, "p99": None, "mean": round(mean_us, 2)}
+    else:
+        clock = time.perf_counter_ns
+        samples = np.empty(len(queries), dtype=np.float64)
+        matched = []
+        for i, tokens in enumerate(queries):
+            t0 = clock()
+            matched.append(engine.match(tokens))
+            samples[i] = clock() - t0
+        samples /= 1000
+        latency = {
+            "p50": round(float(np.percentile(samples, 50)), 2),
+            "p99": round(float(np.percentile(samples, 99)), 2),
+            "mean": round(float(samples.mean()), 2),
+        }
+
+    # Rule yang berbeda dengan confidence & lift sama boleh dipilih beda antar engine
+    signature = [
+        None if rule is None else (rule["confidence"], rule["lift"], rule["final_diagnosis"])
+        for rule in matched
+    ]
+    return {
+        "build_s": round(build_s, 3),
+        "rss_delta_mb": round((rss_after - rss_before) / 1024, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "latency_us": latency,
+        "matched": sum(rule is not None for rule in matched),
+    }, signature
+
+
+def cached_rules(synth, size, seed):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"rules_{size}_seed{seed}_len{int(synth.lengths.max())}.pkl")
+    if not os.path.exists(path):
+        t0 = time.perf_counter()
+        synth.synthesize(size, seed=seed).to_pickle(path)
+        print(f"  [GEN] {size} rule ({time.perf_counter() - t0:.1f}s) -> {os.path.relpath(path, PROJECT_ROOT)}")
+    return path
+
+
+def plot(results, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("[WARN] matplotlib tidak tersedia, plot dilewati")
+        return None
+
+    panels = [
+        ("build_s", "Build time (s)"),
+        ("rss_delta_mb", "RSS engine (MB)"),
+        ("latency_p50", "Latency p50 / pesan (us)"),
+        ("latency_p99", "Latency p99 / pesan (us)"),
+    ]
+    fig, axes = plt.subplots(1, len(panels), figsize=(5 * len(panels), 4.2))
+    for ax, (key, title) in zip(axes, panels):
+        for engine in ENGINES:
+            rows = [r for r in results if r["engine"] == engine and r.get(key) is not None]
+            if not rows:
+                continue
+            # Warna tetap per engine (compiled-matrix tidak punya p50/p99)
+            ax.plot([r["n_rules"] for r in rows], [max(r[key], 1e-3) for r in rows], marker="o",
+                    color=f"C{ENGINES.index(engine)}", label=engine)
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("jumlah rule")
+        ax.set_title(title)
+        ax.grid(True, which="both", alpha=0.3)
+    axes[0].legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skalabilitas rule engine terhadap jumlah rule")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--queries", type=int, default=2000, help="jumlah pesan uji")
+    parser.add_argument("--legacy-max", type=int, default=LEGACY_MAX_RULES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-len", type=int, default=6, help="panjang antecedent maksimum rule sintetis")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "rule_scale"))
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"engine tidak dikenal: {sorted(unknown)} (pilihan: {ENGINES})")
+
+    synth = RuleSynthesizer(max_len=args.max_len)
+    queries = synth.query_sets(args.queries)
+    print(f"Vocab: {len(synth.vocab)} token | pesan uji: {len(queries)} | engine: {engines}")
+
+    header = (
+        f"{'rule':>9} {'engine':<16} {'build s':>8} {'RSS MB':>8} {'peak MB':>8} "
+        f"{'p50 us':>9} {'p99 us':>9} {'mean us':>9} {'match':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    results, mismatches = [], []
+    ctx = multiprocessing.get_context("spawn")
+    for size in sizes:
+        rules_path = cached_rules(synth, size, args.seed)
+        reference = None
+        for name in engines:
+            if name == "legacy" and size > args.legacy_max:
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                entry, signature = pool.submit(measure, name, rules_path, queries).result()
+            if reference is None:
+                reference = (name, signature)
+            elif signature != reference[1]:
+                diff = sum(a != b for a, b in zip(signature, reference[1]))
+                mismatches.append((size, name, reference[0], diff))
+
+            lat = entry.pop("latency_us")
+            entry.update({
+                "n_rules": size,
+                "engine": name,
+                "latency_p50": lat["p50"],
+                "latency_p99": lat["p99"],
+                "latency_mean": lat["mean"],
+            })
+            results.append(entry)
+            fmt = lambda v: f"{v:>9.1f}" if v is not None else f"{'-':>9}"  # noqa: E731
+            print(
+                f"{size:>9,} {name:<16} {entry['build_s']:>8.2f} {entry['rss_delta_mb']:>8.1f} "
+                f"{entry['peak_rss_mb']:>8.1f} {fmt(lat['p50'])} {fmt(lat['p99'])} {fmt(lat['mean'])} "
+                f"{entry['matched']:>6}"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    columns = ["n_rules", "engine", "build_s", "rss_delta_mb", "peak_rss_mb",
+               "latency_p50", "latency_p99", "latency_mean", "matched"]
+    with open(args.output + ".csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "queries": len(queries),
+            "seed": args.seed,
+            "max_len": args.max_len,
+        },
+        "results": results,
+        "mismatches": [
+            {"n_rules": s, "engine": e, "reference": r, "rows": d} for s, e, r, d in mismatches
+        ],
+    }
+    with open(args.output + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    png = plot(results, args.output + ".png")
+
+    print()
+    for size, name, ref, diff in mismatches:
+        print(f"  [MISMATCH] {size} rule: {name} vs {ref} berbeda di {diff} pesan")
+    print("Hasil semua engine identik:", "YA" if not mismatches else "TIDAK")
+    for path in (args.output + ".csv", args.output + ".json", png):
+        if path:
+            print(f"[OK] {path}")
+
+
+if __name__ == "__main__":
+    main()
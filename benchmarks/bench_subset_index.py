@@ -0,0 +1,153 @@
+"""
+Benchmark index subset rule matching saat jumlah rule bertambah:
+- RuleEngine (inverted index dict, referensi lama)
+- CompiledRuleEngine.match_exhaustive (postings + Counter, semua kandidat)
+- CompiledRuleEngine.match_many_matrix (matriks sparse, jalur batch)
+- CompiledRuleEngine.match_many (anchor best-first, early termination)
+- SetTrieRuleEngine.match_many  (set-trie rarest-first, rca.subset_index)
+
+Rule set dimulai dari rules asli (Rules_Sup0.01_Conf0.3_v3.0.csv, ~5k rule)
+lalu ditambah rule sintetis sampai 100k+. Antecedent sintetis diambil dari
+subset token pesan log asli (seperti itemset FP-Growth dengan support sangat
+rendah), jadi token umum (ospf, link, interface) ikut memiliki posting list
+yang sangat panjang. Hasil semua engine dicek identik.
+
+Jalankan dari root project:
+    python benchmarks/bench_subset_index.py [--sizes 5000,25000,100000] [--messages 5000]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.engine import CompiledRuleEngine, RuleEngine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+from rca.subset_index import SetTrieRuleEngine  # noqa: E402
+from rca.tokenizer import DEFAULT_TOKENIZER  # noqa: E402
+
+DIAGNOSES = ["LINK_FAILURE", "UPSTREAM_FAILURE", "BROADCAST_STORM", "DDoS"]
+# RuleEngine lama terlalu lambat untuk rule set besar
+LEGACY_MAX_RULES = 25_000
+
+
+def load_messages():
+    messages = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path, usecols=lambda c: c == "message")
+        if "message" in df.columns:
+            messages.extend(df["message"].astype(str).tolist())
+    return messages
+
+
+def synthesize_rules(token_rows, n_rules, seed=42, max_len=4):
+    """
+    Rule sintetis: antecedent = subset acak (1..max_len token) dari satu pesan
+    asli, confidence/lift acak (dibulatkan agar ada tie), diagnosis acak.
+    Pasangan (antecedent, diagnosis) unik seperti output association_rules.
+    """
+    rng = random.Random(seed)
+    pools = [sorted(r) for r in token_rows if r]
+    seen = set()
+    records = []
+    attempts = 0
+    while len(records) < n_rules and attempts < n_rules * 20:
+        attempts += 1
+        tokens = rng.choice(pools)
+        k = rng.randint(1, min(max_len, len(tokens)))
+        antecedents = frozenset(rng.sample(tokens, k))
+        diagnosis = rng.choice(DIAGNOSES)
+        if (antecedents, diagnosis) in seen:
+            continue
+        seen.add((antecedents, diagnosis))
+        records.append({
+            "antecedents": set(antecedents),
+            "confidence": round(rng.uniform(0.3, 1.0), 3),
+            "lift": round(rng.uniform(1.0, 10.0), 2),
+            "final_diagnosis": diagnosis,
+        })
+    return pd.DataFrame(records)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def rule_key(rule):
+    return None if rule is None else rule["idx"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark set-trie vs inverted index/matriks")
+    parser.add_argument("--sizes", default="5000,10000,25000,50000,100000")
+    parser.add_argument("--messages", type=int, default=5000, help="jumlah pesan uji (sampel acak)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    real_rules = load_rules_df(os.path.join(PROJECT_ROOT, ACTIVE_RULES_PATH))
+    messages = load_messages()
+    token_rows = DEFAULT_TOKENIZER.tokenize_batch(messages)
+    rng = random.Random(args.seed)
+    sample = rng.sample(token_rows, min(args.messages, len(token_rows)))
+    synthetic = synthesize_rules(token_rows, max(0, max(sizes) - len(real_rules)), seed=args.seed)
+    print(f"Rules asli: {len(real_rules)} | pesan uji: {len(sample)} dari {len(messages)}")
+    if len(real_rules) + len(synthetic) < max(sizes):
+        # Subset token unik dari log asli terbatas (~150k pasangan antecedent/diagnosis)
+        print(f"[WARN] Rule sintetis hanya {len(synthetic)}; ukuran maksimum {len(real_rules) + len(synthetic)}")
+
+    header = (
+        f"{'rules':>8} {'trie node':>10} {'build csr':>10} {'build trie':>10} "
+        f"{'legacy':>10} {'exhaustive':>10} {'matriks':>10} {'best-first':>10} {'trie':>10}  identik"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        extra = synthetic.iloc[: max(0, size - len(real_rules))]
+        rules_df = pd.concat(
+            [real_rules[["antecedents", "confidence", "lift", "final_diagnosis"]], extra], ignore_index=True
+        ).iloc[:size]
+
+        def build_csr():
+            engine = CompiledRuleEngine(rules_df)
+            engine._best_first_index()  # index anchor lazy ikut dihitung sebagai waktu build
+            return engine
+
+        t_build_csr, csr = timed(build_csr)
+        t_build_trie, trie = timed(lambda: SetTrieRuleEngine(rules_df))
+        t_single, res_single = timed(lambda: [csr.match_exhaustive(r) for r in sample])
+        t_batch, res_batch = timed(lambda: csr.match_many_matrix(sample))
+        t_best, res_best = timed(lambda: csr.match_many(sample))
+        t_trie, res_trie = timed(lambda: trie.match_many(sample))
+
+        reference = [rule_key(r) for r in res_batch]
+        same = all(
+            reference == [rule_key(r) for r in res] for res in (res_single, res_best, res_trie)
+        )
+        legacy_col = f"{'-':>10}"
+        if len(rules_df) <= LEGACY_MAX_RULES:
+            legacy = RuleEngine(rules_df)
+            t_legacy, res_legacy = timed(lambda: [legacy.match(r) for r in sample])
+            legacy_col = f"{len(sample) / t_legacy:>10,.0f}"
+            same = same and reference == [rule_key(r) for r in res_legacy]
+
+        rate = len(sample)
+        print(
+            f"{len(rules_df):>8} {trie.n_nodes:>10,} {t_build_csr:>9.2f}s {t_build_trie:>9.2f}s "
+            f"{legacy_col} {rate / t_single:>10,.0f} {rate / t_batch:>10,.0f} {rate / t_best:>10,.0f} "
+            f"{rate / t_trie:>10,.0f}  {same}"
+        )
+    print("\nKolom legacy/exhaustive/matriks/best-first/trie = pesan per detik")
+
+
+if __name__ == "__main__":
+    main()
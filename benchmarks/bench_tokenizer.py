@@ -0,0 +1,152 @@
+"""
+Benchmark tokenisasi: jalur per-baris (re.sub + iterrows / Series.apply)
+vs batch tokenizer rca.tokenizer pada seluruh capture di Data/*.csv.
+Mode "mining" membandingkan 02_data_cleaning.clean_text lama (source_router
++ topics + message, Series.apply) dengan Tokenizer.from_mode("mining") pada
+Master Dataset, termasuk pengecekan hasil identik (urutan & duplikat).
+
+Jalankan dari root project:
+    python benchmarks/bench_tokenizer.py [--repeat 5] [--mode dashboard|mining|all]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.tokenizer import MINING_STOPWORDS, STOPWORDS, Tokenizer, join_fields  # noqa: E402
+
+MASTER_DATASET = os.path.join(PROJECT_ROOT, "Data", "Master_Dataset_Gabungan_v3.0.csv")
+
+
+# Implementasi lama dashboard.clean_text (referensi per-baris)
+def clean_text_regex(text):
+    if not isinstance(text, str):
+        return set()
+    text = text.lower()
+    text = re.sub(r"([^\w\s])", r" \1 ", text)
+    text = re.sub(r"[^a-z0-9\s_]", " ", text)
+    tokens = set(text.split())
+    return {t for t in tokens if t not in STOPWORDS and len(t) > 2}
+
+
+# Implementasi lama 02_data_cleaning.clean_text (referensi per-baris)
+def clean_text_mining_regex(text):
+    if not isinstance(text, str):
+        return []
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
+    words = text.split()
+    return [w for w in words if w not in MINING_STOPWORDS and len(w) > 2]
+
+
+def load_messages():
+    frames = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "Data", "*.csv"))):
+        df = pd.read_csv(path, usecols=lambda c: c == "message")
+        if "message" in df.columns:
+            frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench_mining(repeat):
+    df = pd.read_csv(MASTER_DATASET)
+    n = len(df)
+    print(f"\n[mining] Master Dataset: {n} baris (source_router + topics + message)")
+
+    def per_row_apply():
+        full_text = df["source_router"].astype(str) + " " + df["topics"].astype(str) + " " + df["message"].astype(str)
+        return full_text.apply(clean_text_mining_regex).tolist()
+
+    def batch_mode():
+        return Tokenizer.from_mode("mining").tokenize_frame(df)
+
+    def batch_ids():
+        return Tokenizer.from_mode("mining", unique=True).encode_batch(join_fields(df))
+
+    results = {}
+    for name, fn in [
+        ("per-baris (Series.apply + re.sub)", per_row_apply),
+        ("batch mode mining (list token)", batch_mode),
+        ("batch mode mining (token ID CSR)", batch_ids),
+    ]:
+        elapsed, out = timed(fn, repeat)
+        results[name] = (elapsed, out)
+        print(f"{name:<36} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} baris/s")
+
+    reference = results["per-baris (Series.apply + re.sub)"]
+    batch = results["batch mode mining (list token)"]
+    mismatch = sum(1 for a, b in zip(reference[1], batch[1]) if a != b)
+    print(f"Hasil berbeda: {mismatch} dari {n} baris")
+    print(f"Speedup batch vs Series.apply: {reference[0] / batch[0]:.2f}x")
+
+
+def bench_dashboard(repeat):
+    df = load_messages()
+    messages = df["message"].astype(str)
+    n = len(messages)
+    print(f"[dashboard] Pesan: {n} baris dari Data/*.csv")
+
+    def per_row_iterrows():
+        return [clean_text_regex(str(row.get("message", ""))) for _, row in df.iterrows()]
+
+    def per_row_apply():
+        return messages.apply(clean_text_regex).tolist()
+
+    def batch_sets():
+        return Tokenizer().tokenize_batch(messages)
+
+    def batch_ids():
+        return Tokenizer().encode_batch(messages)
+
+    results = {}
+    for name, fn in [
+        ("per-baris (iterrows + re.sub)", per_row_iterrows),
+        ("per-baris (Series.apply + re.sub)", per_row_apply),
+        ("batch (translate, set token)", batch_sets),
+        ("batch (translate, token ID CSR)", batch_ids),
+    ]:
+        elapsed, out = timed(fn, repeat)
+        results[name] = (elapsed, out)
+        print(f"{name:<36} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} baris/s")
+
+    reference = results["per-baris (iterrows + re.sub)"][1]
+    batch = results["batch (translate, set token)"][1]
+    mismatch = sum(1 for a, b in zip(reference, batch) if a != b)
+    print(f"\nHasil berbeda: {mismatch} dari {n} baris")
+
+    base = results["per-baris (Series.apply + re.sub)"][0]
+    print(f"Speedup batch vs Series.apply: {base / results['batch (translate, set token)'][0]:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tokenizer per-baris vs batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mode", choices=["dashboard", "mining", "all"], default="all")
+    args = parser.parse_args()
+
+    if args.mode in ("dashboard", "all"):
+        bench_dashboard(args.repeat)
+    if args.mode in ("mining", "all"):
+        bench_mining(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Generator log sintetis berlabel untuk uji skala (collection, mining,
+inferensi) di atas volume capture lab (~15k baris).
+
+Model dipelajari dari capture berlabel (default Master_Dataset_Gabungan_v3.0.csv,
+label NORMAL / LINK_FAILURE / UPSTREAM_FAILURE / DDOS_ATTACK / BROADCAST_STORM):
+- template pesan: IP, MAC, angka dan hex di-mask; state = (topics, template)
+- per skenario: distribusi state awal + frekuensi transisi state -> state
+  (urutan per router berdasarkan time + log_id), jeda antar log (detik) dan
+  panjang episode (jumlah log satu router dalam skenario tsb.)
+- isi slot: IP/MAC/angka diambil bersama dari satu kemunculan asli template
+  (diutamakan router asal yang sama, sehingga router-id & interface konsisten),
+  slot hex (seq/csum LSA) di-resample per slot -> pesan baru yang realistis
+Router virtual dinamai <router asli>-NNN (R-Edge-007 tetap terdeteksi "edge"
+oleh override). Setiap router menjalankan episode skenario bergantian sesuai
+--mix; log semua router digabung berurutan waktu.
+
+Output: CSV format Master_Dataset (kolom live + Label) per chunk ke disk,
+atau stream ke live_log.csv (--live) dengan write_live_csv collector pada
+laju --rate baris/detik.
+
+Jalankan dari root project:
+    python benchmarks/synth_logs.py --rows 1000000 --routers 60 [--output Data/synthetic/Synth_Logs_1000000.csv]
+    python benchmarks/synth_logs.py --rows 100000 --routers 12 --live live_log.csv --rate 500
+"""
+
+import argparse
+import bisect
+import heapq
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import accumulate
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.live import LIVE_LOG_COLUMNS  # noqa: E402
+
+LABELED_CAPTURE = os.path.join(PROJECT_ROOT, "Data", "Master_Dataset_Gabungan_v3.0.csv")
+OUTPUT_COLUMNS = LIVE_LOG_COLUMNS + ["Label"]
+COLLECTOR_POLL = 5  # live_log_collector.POLL_INTERVAL, untuk kolom fetched_at
+
+# Urutan penting: MAC & IP sebelum angka; hex sebelum angka
+SLOT_PATTERN = re.compile(
+    r"(?P<mac>\b[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}\b)"
+    r"|(?P<ip>\b\d{1,3}(?:\.\d{1,3}){3}\b)"
+    r"|(?P<hex>\b0x[0-9A-Fa-f]+\b)"
+    r"|(?P<num>\b\d+\b)"
+)
+
+
+def split_template(message):
+    """Pesan -> (bagian literal, nilai slot, jenis slot); template = tuple literal + jenis"""
+    parts, values, kinds = [], [], []
+    pos = 0
+    for m in SLOT_PATTERN.finditer(message):
+        parts.append(message[pos:m.start()])
+        values.append(m.group())
+        kinds.append(m.lastgroup)
+        pos = m.end()
+    parts.append(message[pos:])
+    return tuple(parts), tuple(values), tuple(kinds)
+
+
+def log_id_value(log_id):
+    try:
+        return int(str(log_id).replace("*", ""), 16)
+    except ValueError:
+        return -1
+
+
+class _Template:
+    __slots__ = ("topics", "parts", "hex_slots", "instances", "any_instances", "hex_pools")
+
+    def __init__(self, topics, parts, kinds):
+        self.topics = topics
+        self.parts = parts
+        self.hex_slots = [i for i, k in enumerate(kinds) if k == "hex"]
+        self.instances = defaultdict(list)
+        self.any_instances = []
+        self.hex_pools = [[] for _ in self.hex_slots]
+
+    def add(self, router, values):
+        self.instances[router].append(values)
+        self.any_instances.append(values)
+        for pool, i in zip(self.hex_pools, self.hex_slots):
+            pool.append(values[i])
+
+    def render(self, rng, router):
+        pool = self.instances.get(router) or self.any_instances
+        values = pool[rng.randrange(len(pool))]
+        if self.hex_slots:
+            values = list(values)
+            for pool_hex, i in zip(self.hex_pools, self.hex_slots):
+                values[i] = pool_hex[rng.randrange(len(pool_hex))]
+        parts = self.parts
+        out = [parts[0]]
+        for value, literal in zip(values, parts[1:]):
+            out.append(value)
+            out.append(literal)
+        return "".join(out)
+
+
+class _Scenario:
+    """Rantai Markov template + distribusi jeda & panjang episode untuk satu label"""
+
+    def __init__(self, sequences, deltas, lengths):
+        starts = Counter(seq[0] for seq in sequences if seq)
+        pairs = defaultdict(Counter)
+        for seq in sequences:
+            for a, b in zip(seq, seq[1:]):
+                pairs[a][b] += 1
+        self.start_states, self.start_cum = self._cumulative(starts)
+        self.transitions = {a: self._cumulative(c) for a, c in pairs.items()}
+        self.deltas = deltas or [1]
+        self.lengths = lengths or [100]
+
+    @staticmethod
+    def _cumulative(counter):
+        states = list(counter)
+        return states, list(accumulate(counter[s] for s in states))
+
+    @staticmethod
+    def _draw(states, cum, rng):
+        return states[bisect.bisect_right(cum, rng.random() * cum[-1])]
+
+    def first(self, rng):
+        return self._draw(self.start_states, self.start_cum, rng)
+
+    def next(self, state, rng):
+        nxt = self.transitions.get(state)
+        if nxt is None:  # state akhir urutan asli: mulai lagi dari distribusi awal
+            return self.first(rng)
+        return self._draw(nxt[0], nxt[1], rng)
+
+
+class LogSynthesizer:
+    """Pelajari template & transisi dari capture berlabel, lalu hasilkan log sintetis"""
+
+    def __init__(self, capture=LABELED_CAPTURE):
+        df = pd.read_csv(capture, low_memory=False)
+        missing = {"message", "source_router", "Label"} - set(df.columns)
+        if missing:
+            raise ValueError(f"{capture}: kolom {sorted(missing)} tidak ada")
+        df["_ts"] = pd.to_datetime(df["time"], format="mixed", errors="coerce")
+        df["_id"] = df["log_id"].map(log_id_value)
+        df = df.sort_values(["Label", "source_router", "_ts", "_id"], kind="stable")
+
+        self.templates = []
+        template_id = {}
+        self.scenarios = {}
+        self.label_rows = df["Label"].value_counts().to_dict()
+        self.base_routers = sorted(df["source_router"].dropna().unique())
+        for label, group in df.groupby("Label", sort=True):
+            sequences, deltas, lengths = [], [], []
+            for router, rows in group.groupby("source_router", sort=True):
+                seq = []
+                for topics, message in zip(rows["topics"].fillna(""), rows["message"].astype(str)):
+                    parts, values, kinds = split_template(message)
+                    key = (topics, parts, kinds)
+                    tid = template_id.get(key)
+                    if tid is None:
+                        tid = template_id[key] = len(self.templates)
+                        self.templates.append(_Template(topics, parts, kinds))
+                    self.templates[tid].add(router, values)
+                    seq.append(tid)
+                sequences.append(seq)
+                lengths.append(len(seq))
+                gaps = rows["_ts"].diff().dt.total_seconds().dropna()
+                deltas.extend(int(g) for g in gaps if 0 <= g <= 600)
+            self.scenarios[label] = _Scenario(sequences, deltas, lengths)
+
+    @property
+    def labels(self):
+        return list(self.scenarios)
+
+    def parse_mix(self, spec=None):
+        """'NORMAL=0.7,DDOS_ATTACK=0.1' -> bobot per label (default: proporsi baris capture)"""
+        if not spec:
+            weights = {label: float(self.label_rows[label]) for label in self.labels}
+        else:
+            weights = {}
+            for item in spec.split(","):
+                label, _, value = item.partition("=")
+                label = label.strip().upper()
+                if label not in self.scenarios:
+                    raise ValueError(f"Label tidak dikenal: {label} (pilihan: {self.labels})")
+                weights[label] = float(value)
+        total = sum(weights.values())
+        return {label: w / total for label, w in weights.items() if w > 0}
+
+    def iter_chunks(self, n_rows, n_routers=6, chunk_size=100_000, mix=None, seed=42, start=None):
+        """Generator DataFrame (kolom OUTPUT_COLUMNS) berurutan waktu, total n_rows baris"""
+        rng = random.Random(seed)
+        mix = mix or self.parse_mix()
+        mix_labels = list(mix)
+        # mix = porsi baris; episode dipilih dengan bobot mix / rata-rata panjang episode
+        mix_cum = list(accumulate(
+            mix[label] * len(self.scenarios[label].lengths) / sum(self.scenarios[label].lengths)
+            for label in mix_labels
+        ))
+        start = start or datetime(2026, 4, 13, 12, 0, 0)
+        base_ts = int(start.timestamp())
+
+        routers = []
+        heap = []
+        for k in range(n_routers):
+            base = self.base_routers[k % len(self.base_routers)]
+            routers.append({
+                "name": f"{base}-{k // len(self.base_routers) + 1:03d}",
+                "base": base,
+                "next_id": rng.randrange(0x10000),
+                "label": None,
+                "left": 0,
+                "state": None,
+            })
+            heapq.heappush(heap, (base_ts + rng.randrange(60), k))
+
+        time_str = {}
+
+        def fmt(ts):
+            s = time_str.get(ts)
+            if s is None:
+                if len(time_str) > 100_000:
+                    time_str.clear()
+                s = time_str[ts] = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+            return s
+
+        templates = self.templates
+        produced = 0
+        while produced < n_rows:
+            size = min(chunk_size, n_rows - produced)
+            cols = {c: [None] * size for c in OUTPUT_COLUMNS}
+            fetched, names, ids, times = cols["fetched_at"], cols["source_router"], cols["log_id"], cols["time"]
+            topics_col, messages, labels = cols["topics"], cols["message"], cols["Label"]
+            for i in range(size):
+                ts, k = heapq.heappop(heap)
+                router = routers[k]
+                if router["left"] <= 0:
+                    label = mix_labels[bisect.bisect_right(mix_cum, rng.random() * mix_cum[-1])]
+                    scenario = self.scenarios[label]
+                    router["label"] = label
+                    router["left"] = scenario.lengths[rng.randrange(len(scenario.lengths))]
+                    router["state"] = scenario.first(rng)
+                else:
+                    scenario = self.scenarios[router["label"]]
+                    router["state"] = scenario.next(router["state"], rng)
+                router["left"] -= 1
+                tpl = templates[router["state"]]
+
+                fetched[i] = fmt(ts - ts % COLLECTOR_POLL + COLLECTOR_POLL)
+                names[i] = router["name"]
+                ids[i] = f"*{router['next_id']:X}"
+                times[i] = fmt(ts)
+                topics_col[i] = tpl.topics
+                messages[i] = tpl.render(rng, router["base"])
+                labels[i] = router["label"]
+                router["next_id"] += 1
+                heapq.heappush(heap, (ts + scenario.deltas[rng.randrange(len(scenario.deltas))], k))
+            produced += size
+            yield pd.DataFrame(cols, columns=OUTPUT_COLUMNS)
+
+
+def stream_live(chunks, live_path, rate):
+    """Tulis chunk ke live log dengan write_live_csv collector, `rate` baris/detik (batch per detik)"""
+    from live_log_collector import MAX_LIVE_LOG_ROWS, write_live_csv
+
+    pd.DataFrame(columns=LIVE_LOG_COLUMNS).to_csv(live_path, index=False, encoding="utf-8")
+    written = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        chunk = chunk[LIVE_LOG_COLUMNS]
+        for lo in range(0, len(chunk), max(int(rate), 1)):
+            batch = chunk.iloc[lo:lo + max(int(rate), 1)].copy()
+            batch["fetched_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            write_live_csv(batch, live_path, max_rows=MAX_LIVE_LOG_ROWS)
+            written += len(batch)
+            wait = start + written / rate - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator log sintetis berlabel untuk uji skala")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--routers", type=int, default=60, help="jumlah router virtual")
+    parser.add_argument("--mix", default=None, help="bobot skenario, mis. NORMAL=0.7,DDOS_ATTACK=0.1 (default: proporsi capture)")
+    parser.add_argument("--capture", default=LABELED_CAPTURE, help="capture berlabel untuk dipelajari")
+    parser.add_argument("--chunk", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="CSV tujuan (default Data/synthetic/Synth_Logs_<rows>.csv)")
+    parser.add_argument("--live", default=None, help="stream ke file live log (mis. live_log.csv) alih-alih ke disk")
+    parser.add_argument("--rate", type=float, default=500.0, help="baris/detik untuk --live")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    synth = LogSynthesizer(args.capture)
+    try:
+        mix = synth.parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Model: {len(synth.templates)} template, {len(synth.scenarios)} skenario, "
+          f"{len(synth.base_routers)} router asli ({time.perf_counter() - t0:.1f}s)")
+    print("Mix: " + ", ".join(f"{label}={w:.2f}" for label, w in mix.items()))
+
+    chunks = synth.iter_chunks(args.rows, args.routers, args.chunk, mix, args.seed)
+    t0 = time.perf_counter()
+    if args.live:
+        written = stream_live(chunks, args.live, args.rate)
+        print(f"[OK] {written} baris di-stream ke {args.live} dalam {time.perf_counter() - t0:.1f}s")
+        return
+
+    output = args.output or os.path.join(PROJECT_ROOT, "Data", "synthetic", f"Synth_Logs_{args.rows}.csv")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    labels = Counter()
+    written = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(output, mode="w" if i == 0 else "a", header=i == 0, index=False, encoding="utf-8")
+        labels.update(chunk["Label"].value_counts().to_dict())
+        written += len(chunk)
+        elapsed = time.perf_counter() - t0
+        print(f"--> {written:,}/{args.rows:,} baris ({written / elapsed:,.0f} baris/s)")
+    print(f"Label: {dict(labels)}")
+    print(f"[OK] {output}")
+
+
+if __name__ == "__main__":
+    main()
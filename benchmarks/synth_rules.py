@@ -0,0 +1,207 @@
+"""
+Generator rule set sintetis skala besar (1k - 1M rule) untuk stress test
+rule engine, dengan distribusi token yang realistis.
+
+Model (meniru output FP-Growth dengan support diturunkan):
+- vocab & frekuensi token dari Data/Data_Siap_Mining_v3.0.csv (transaksi
+  hasil 02_data_cleaning, tokenizer mode "mining"),
+- setiap rule punya transaksi "seed" (baris non-NORMAL, dipilih acak);
+  token antecedent diambil dari token seed (co-occurrence asli) dengan
+  peluang --mix, sisanya dari distribusi unigram seluruh data, sehingga
+  token umum (ospf, router-id, interface) muncul di sangat banyak rule,
+- panjang antecedent mengikuti rule asli (Rules_Sup0.01_Conf0.3_v3.0.csv:
+  1-3 token), dengan ekor geometris sampai --max-len (support lebih rendah
+  -> itemset lebih panjang); tanpa ekor ini 221 token tidak cukup untuk 1M
+  kombinasi unik,
+- diagnosis = label seed, pasangan (confidence, lift) di-resample dari rule
+  asli (termasuk tie),
+- pasangan (antecedent, diagnosis) unik seperti output association_rules.
+
+Bisa di-import (synthesize) atau dijalankan untuk menulis CSV format grid
+(antecedents/consequents list, confidence, lift) yang bisa dibaca
+rca.rules.load_rules_df maupun evaluate_rules.load_rules.
+
+Jalankan dari root project:
+    python benchmarks/synth_rules.py --size 100000 [--output Data/rules/synthetic/Rules_Synth_100000.csv]
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.rules import map_diagnosis  # noqa: E402
+
+MINING_DATASET = os.path.join(PROJECT_ROOT, "Data", "Data_Siap_Mining_v3.0.csv")
+REFERENCE_RULES = os.path.join(PROJECT_ROOT, "Data", "rules", "Rules_Sup0.01_Conf0.3_v3.0.csv")
+
+
+class RuleSynthesizer:
+    """Statistik data asli dimuat sekali, lalu synthesize() bisa dipanggil berkali-kali"""
+
+    def __init__(self, mining_path=MINING_DATASET, reference_rules=REFERENCE_RULES, max_len=6, tail=0.5):
+        df = pd.read_csv(mining_path)
+        transactions = [sorted(set(ast.literal_eval(items))) for items in df["items"]]
+        labels = df["Label"].astype(str).str.upper().tolist()
+
+        self.vocab = sorted({t for row in transactions for t in row})
+        token_id = {t: i for i, t in enumerate(self.vocab)}
+        counts = np.zeros(len(self.vocab))
+        for row in transactions:
+            for t in row:
+                counts[token_id[t]] += 1
+        self.unigram = counts / counts.sum()
+
+        # Seed = transaksi yang labelnya dipetakan ke diagnosis dashboard (bukan NORMAL),
+        # disimpan sebagai matriks token ber-padding agar sampling bisa vektorisasi
+        seeds = [
+            ([token_id[t] for t in row], map_diagnosis(label))
+            for row, label in zip(transactions, labels)
+            if row and map_diagnosis(label) is not None
+        ]
+        self.diagnoses = sorted({d for _, d in seeds})
+        self.seed_len = np.array([len(row) for row, _ in seeds])
+        self.seed_tokens = np.zeros((len(seeds), self.seed_len.max()), dtype=np.int64)
+        for i, (row, _) in enumerate(seeds):
+            self.seed_tokens[i, :len(row)] = row
+        self.seed_diag = np.array([self.diagnoses.index(d) for _, d in seeds])
+
+        ref = pd.read_csv(reference_rules)
+        ref_len = ref["antecedents"].map(lambda s: len(ast.literal_eval(s))).value_counts().sort_index()
+        weights = {int(k): float(v) for k, v in ref_len.items() if int(k) <= max_len}
+        last = max(weights)
+        for k in range(last + 1, max_len + 1):
+            weights[k] = weights[k - 1] * tail
+        self.lengths = np.array(sorted(weights))
+        self.length_p = np.array([weights[k] for k in self.lengths]) / sum(weights.values())
+        self.metrics = ref[["confidence", "lift"]].to_numpy(dtype=float)
+
+    def synthesize(self, n_rules, seed=42, mix=0.85, max_rounds=50):
+        """DataFrame n_rules rule unik: antecedents (set), confidence, lift, final_diagnosis.
+
+        Jika kombinasi jenuh (hasil unik < 25% kebutuhan), mix diturunkan bertahap
+        sampai 0.2, setelah itu distribusi token latar diratakan (unigram**temper);
+        nilai akhirnya ada di self.last_mix / self.last_temper.
+        """
+        rng = np.random.default_rng(seed)
+        n_vocab, width = len(self.vocab), int(self.lengths.max())
+        pad = n_vocab  # token sentinel untuk posisi kosong
+        temper = 1.0
+        background_p = self.unigram
+        keys = np.empty(0, dtype=np.int64)
+        rows = np.empty((0, width), dtype=np.int64)
+        diag = np.empty(0, dtype=np.int64)
+        for _ in range(max_rounds):
+            need = n_rules - len(keys)
+            if need <= 0:
+                break
+            batch = max(int(need * 1.3), 50_000)
+            seed_idx = rng.integers(0, len(self.seed_len), size=batch)
+            seed_len = self.seed_len[seed_idx][:, None]
+            pos = (rng.random((batch, width)) * seed_len).astype(np.int64)
+            tokens = np.where(
+                rng.random((batch, width)) < mix,
+                self.seed_tokens[seed_idx[:, None], pos],
+                rng.choice(n_vocab, size=(batch, width), p=background_p),
+            )
+            lengths = rng.choice(self.lengths, size=batch, p=self.length_p)
+            tokens[np.arange(width)[None, :] >= lengths[:, None]] = pad
+            # token ganda dalam satu rule -> sentinel, lalu urutkan agar antecedent kanonik
+            tokens.sort(axis=1)
+            tokens[:, 1:][tokens[:, 1:] == tokens[:, :-1]] = pad
+            tokens.sort(axis=1)
+
+            batch_diag = self.seed_diag[seed_idx]
+            batch_keys = batch_diag.copy()
+            for j in range(width):
+                batch_keys = batch_keys * (n_vocab + 1) + tokens[:, j]
+            keys = np.concatenate([keys, batch_keys])
+            rows = np.concatenate([rows, tokens])
+            diag = np.concatenate([diag, batch_diag])
+            _, first = np.unique(keys, return_index=True)
+            first = np.sort(first)[:n_rules]
+            fresh = len(first) - (n_rules - need)
+            keys, rows, diag = keys[first], rows[first], diag[first]
+            # Kombinasi mulai jenuh: perbanyak token latar, lalu ratakan distribusinya
+            # (support lebih rendah -> token jarang ikut masuk itemset)
+            if fresh < 0.25 * min(need, batch):
+                if mix > 0.2:
+                    mix *= 0.8
+                else:
+                    temper *= 0.7
+                    background_p = self.unigram ** temper
+                    background_p /= background_p.sum()
+        self.last_mix, self.last_temper = mix, temper
+
+        vocab = self.vocab
+        antecedents = [{vocab[t] for t in row if t != pad} for row in rows.tolist()]
+        metrics = self.metrics[rng.integers(0, len(self.metrics), size=len(antecedents))]
+        return pd.DataFrame({
+            "antecedents": antecedents,
+            "confidence": metrics[:, 0],
+            "lift": metrics[:, 1],
+            "final_diagnosis": [self.diagnoses[d] for d in diag.tolist()],
+        })
+
+    def query_sets(self, n, seed=0):
+        """Set token transaksi asli (semua label) sebagai pesan uji"""
+        df = pd.read_csv(MINING_DATASET)
+        rng = np.random.default_rng(seed)
+        rows = rng.choice(len(df), size=min(n, len(df)), replace=False)
+        return [set(ast.literal_eval(df["items"].iat[i])) for i in rows]
+
+
+DIAGNOSIS_LABELS = {
+    "LINK_FAILURE": "LINK_FAILURE",
+    "UPSTREAM_FAILURE": "UPSTREAM_FAILURE",
+    "BROADCAST_STORM": "BROADCAST_STORM",
+    "DDoS": "DDOS_ATTACK",
+}
+
+
+def to_grid_csv(rules_df, path):
+    """Tulis rule sintetis dalam format CSV grid FP-Growth"""
+    out = pd.DataFrame({
+        "antecedents": [str(sorted(a)) for a in rules_df["antecedents"]],
+        "consequents": [str([DIAGNOSIS_LABELS[d]]) for d in rules_df["final_diagnosis"]],
+        "confidence": rules_df["confidence"],
+        "lift": rules_df["lift"],
+    })
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    out.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator rule set sintetis realistis")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-len", type=int, default=6)
+    parser.add_argument("--mix", type=float, default=0.85, help="peluang token diambil dari transaksi seed")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    synth = RuleSynthesizer(max_len=args.max_len)
+    rules_df = synth.synthesize(args.size, seed=args.seed, mix=args.mix)
+    elapsed = time.perf_counter() - t0
+    lengths = rules_df["antecedents"].map(len).value_counts().sort_index()
+    print(f"Vocab: {len(synth.vocab)} token | seed transaksi: {len(synth.seed_len)}")
+    print(f"Rule: {len(rules_df)} ({elapsed:.1f}s) | panjang antecedent: {lengths.to_dict()}")
+    print(f"Diagnosis: {rules_df['final_diagnosis'].value_counts().to_dict()} | mix akhir: {synth.last_mix:.2f}, temper: {synth.last_temper:.2f}")
+    if len(rules_df) < args.size:
+        print(f"[WARN] Hanya {len(rules_df)} rule unik; naikkan --max-len")
+
+    output = args.output or os.path.join(PROJECT_ROOT, "Data", "rules", "synthetic", f"Rules_Synth_{args.size}.csv")
+    to_grid_csv(rules_df, output)
+    print(f"[OK] {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Verifikasi (gaya pembuktian) matching best-first vs scan exhaustive pada
+SETIAP baris Master_Dataset_Gabungan_v3.0.csv, plus throughput tiap jalur.
+
+Klaim: CompiledRuleEngine.match (best-first) selalu mengembalikan rule yang
+sama dengan scan exhaustive "ambil rule dengan (confidence, lift) tertinggi
+di antara semua rule yang antecedent-nya subset token pesan; tie -> urutan
+file".
+
+Argumen:
+1. rank = urutan rule berdasarkan (confidence desc, lift desc, idx file asc),
+   jadi rule terbaik exhaustive = rank terkecil yang antecedent-nya subset.
+2. Setiap rule dengan antecedent tidak kosong disimpan tepat di satu list
+   anchor (token paling langkanya). Jika rule cocok, anchor-nya ada di pesan,
+   sehingga rule tersebut ada di salah satu list yang ditelusuri.
+3. List anchor terurut rank naik. Penelusuran satu list berhenti di
+   (a) kandidat pertama yang penuh: kandidat lain di list itu rank-nya lebih
+   besar, atau (b) rank >= best sementara: sisa list tidak mungkin menang.
+   Tidak ada rule cocok dengan rank < best yang terlewati, jadi best akhir =
+   rank terkecil yang cocok = hasil exhaustive.
+Skrip ini mengecek klaim tersebut secara empiris: referensi dihitung dengan
+brute force ke SEMUA rule (tanpa index apa pun) untuk tiap set token unik,
+lalu dibandingkan per baris dengan jalur best-first (match, match_many),
+match_exhaustive, match_many_matrix (matriks sparse) dan SetTrieRuleEngine.
+Exit code 1 jika ada satu saja baris yang berbeda.
+
+Jalankan dari root project:
+    python benchmarks/verify_best_first.py [--rules Data/rules/...csv] [--mode dashboard|mining|all]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from rca.engine import CompiledRuleEngine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, load_rules_df  # noqa: E402
+from rca.subset_index import SetTrieRuleEngine  # noqa: E402
+from rca.tokenizer import DEFAULT_TOKENIZER, Tokenizer  # noqa: E402
+
+MASTER_DATASET = os.path.join(PROJECT_ROOT, "Data", "Master_Dataset_Gabungan_v3.0.csv")
+
+
+def brute_force_best(rules, tokens):
+    """Scan exhaustive murni: semua rule, tanpa index, ranking eksplisit"""
+    best = None
+    best_key = None
+    for rule in rules:
+        antecedents = rule["antecedents"]
+        if antecedents and antecedents <= tokens:
+            key = (-rule["confidence"], -rule["lift"], rule["idx"])
+            if best_key is None or key < best_key:
+                best, best_key = rule["idx"], key
+    return best
+
+
+def rule_key(rule):
+    return None if rule is None else rule["idx"]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def verify(name, token_rows, engine, trie):
+    n = len(token_rows)
+    print(f"\n[{name}] {n} baris")
+
+    unique = {}
+    for tokens in token_rows:
+        unique.setdefault(frozenset(tokens), None)
+    t_ref, _ = timed(lambda: unique.update({k: brute_force_best(engine.rules, k) for k in unique}))
+    reference = [unique[frozenset(tokens)] for tokens in token_rows]
+    print(f"Referensi brute force: {len(unique)} set token unik x {len(engine.rules)} rule ({t_ref:.1f}s)")
+
+    paths = [
+        ("exhaustive (match_exhaustive)", lambda: [engine.match_exhaustive(r) for r in token_rows]),
+        ("best-first (match)", lambda: [engine.match(r) for r in token_rows]),
+        ("best-first batch (match_many)", lambda: engine.match_many(token_rows)),
+        ("batch matriks (match_many_matrix)", lambda: engine.match_many_matrix(token_rows)),
+        ("set-trie (SetTrieRuleEngine)", lambda: trie.match_many(token_rows)),
+    ]
+    failed = False
+    print(f"{'jalur':<34} {'waktu':>9} {'baris/s':>12} {'beda':>6}")
+    for label, fn in paths:
+        elapsed, results = timed(fn)
+        mismatch = sum(1 for ref, got in zip(reference, results) if ref != rule_key(got))
+        failed = failed or mismatch > 0
+        print(f"{label:<34} {elapsed * 1000:7.0f}ms {n / elapsed:12,.0f} {mismatch:>6}")
+    matched = sum(1 for r in reference if r is not None)
+    print(f"Baris dengan rule cocok: {matched} | tanpa rule: {n - matched}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifikasi best-first vs exhaustive")
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--mode", choices=["dashboard", "mining", "all"], default="all")
+    args = parser.parse_args()
+
+    rules_df = load_rules_df(os.path.join(PROJECT_ROOT, args.rules))
+    engine = CompiledRuleEngine(rules_df)
+    trie = SetTrieRuleEngine(rules_df)
+    df = pd.read_csv(MASTER_DATASET)
+    print(f"Rules: {args.rules} ({len(engine.rules)}) | Dataset: {os.path.basename(MASTER_DATASET)} ({len(df)} baris)")
+
+    ok = True
+    if args.mode in ("dashboard", "all"):
+        ok &= verify("dashboard: message", DEFAULT_TOKENIZER.tokenize_frame(df), engine, trie)
+    if args.mode in ("mining", "all"):
+        mining = Tokenizer.from_mode("mining", unique=True)
+        ok &= verify("mining: source_router + topics + message", mining.tokenize_frame(df), engine, trie)
+
+    print("\nHASIL:", "IDENTIK di semua baris" if ok else "ADA BARIS BERBEDA")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
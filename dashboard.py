@@ -6,8 +6,16 @@ import time
 import os
 from functools import lru_cache
 from collections import defaultdict
+from itertools import chain
 from typing import Dict, List, DefaultDict, Any
 
+from rca.aggregation import merge_issues
+from rca.diagnosis import Diagnoser
+from rca.live import LiveAnalyzer
+from rca.parallel import ChunkPool
+from rca.profiling import Profiler, StageTimer, ordered_stages
+from rca.registry import RuleSetRegistry
+
 # KONFIGURASI HALAMAN & CSS
 st.set_page_config(
     page_title="Network RCA System (Tiered)", page_icon="shield", layout="wide"
@@ -73,53 +81,6 @@ RECOMMENDATION_MAP = {
     },
 }
 
-# STOPWORDS: keep generic noise but ensure critical network keywords remain
-# (removed: 'ospf','neighbor','state','change','down','up','link')
-STOPWORDS = {
-    "message",
-    "info",
-    "via",
-    "from",
-    "to",
-    "route",
-    "system",
-    "topics",
-    "log",
-    "time",
-    "date",
-    # network-state keywords removed from stopwords on purpose
-    # 'state', 'changed', 'ospf', 'neighbor', 'link', 'down', 'up' are kept for detection
-    "ospf-1",
-    "router-id",
-    "area",
-    "area-0",
-    "election",
-    "version",
-    "instance",
-    "created",
-    "created",
-    "broadcast",
-    "loopback",
-    "loopback",
-    "dr",
-    "bdr",
-    "me",
-    "other",
-    "loading",
-    "full",
-    "exchange",
-    "done",
-    "established",
-    "init",
-    "twoway",
-    "address",
-    "ip",
-    "admin",
-    "user",
-    "logged",
-}
-
-
 # ==== OPTIMIZATION: Cached CSV reading for live mode ====
 # @st.cache_data(ttl=5)  # Cache removed for instant live updates
 def read_live_log(file_path):
@@ -127,243 +88,287 @@ def read_live_log(file_path):
     return pd.read_csv(file_path)
 
 
-# ==== OPTIMIZATION: RuleEngine Class for O(1) matching ====
-class RuleEngine:
-    def __init__(self, rules_df):
-        self.rules: List[Dict[str, Any]] = []
-        # Mapping token -> list of rule indices
-        self.token_map: DefaultDict[str, List[int]] = defaultdict(list)
-        
-        # Pre-process rules into list of dicts and build index
-        for idx, rule in rules_df.iterrows():
-            antecedents = rule["antecedents"]
-            
-            # [FILTER WEAK RULES] Removed completely for AI-Only rules strategy
-            # Rely strictly on the FP-Growth support & confidence metrics
+# ==== OPTIMIZATION: Cached rules loading for better performance ====
+@st.cache_resource
+def get_rule_registry():
+    """Registry rule set Data/rules/ (satu per proses, rule set aktif berlaku untuk semua sesi)"""
+    return RuleSetRegistry()
 
-                
-            rule_obj = {
-                "antecedents": antecedents,
-                "confidence": float(rule.get("confidence", 0) or 0),
-                "lift": float(rule.get("lift", 0) or 0),
-                "final_diagnosis": rule["final_diagnosis"],
-                "idx": len(self.rules)
-            }
-            self.rules.append(rule_obj)
-            
-            for token in antecedents:
-                self.token_map[token].append(int(rule_obj["idx"])) # type: ignore
-
-    def match(self, tokens):
-        """Find best matching rule for a set of tokens using inverted index"""
-        candidate_counts: DefaultDict[int, int] = defaultdict(int) # type: ignore
-        relevant_rules_indices = set()
-        
-        # 1. Gather candidates
-        for token in tokens:
-            if token in self.token_map:
-                for rule_idx in self.token_map[str(token)]: # type: ignore
-                    candidate_counts[rule_idx] += 1 # type: ignore
-                    relevant_rules_indices.add(rule_idx)
-        
-        # 2. Check candidates
-        best_rule = None
-        best_conf = -1.0
-        
-        for rule_idx in relevant_rules_indices:
-            rule = self.rules[rule_idx]
-            # Optimization: Only check if ALL antecedents are present
-            if candidate_counts[rule_idx] == len(rule["antecedents"]): # type: ignore
-                 # Strict subset check passed (assuming unique tokens in antecedents)
-                 conf_val = rule["confidence"]
-                 
-                 # Prefer rule with higher confidence, tie-breaker: higher lift
-                 if conf_val > best_conf or (conf_val == best_conf and rule["lift"] > (best_rule["lift"] if best_rule else 0)): # type: ignore
-                     best_rule = rule
-                     best_conf = conf_val
-                     
-        return best_rule
 
-# ==== OPTIMIZATION: Cached rules loading for better performance ====
-@st.cache_resource(ttl=300)  # Changed to cache_resource for non-data objects
 def load_and_process_rules():
-    """Load and preprocess rules once, cache for performance"""
-    rules_path_auto = "Data/rules/Rules_Sup0.01_Conf0.3_v3.0.csv"
-
-    df_auto = pd.read_csv(rules_path_auto, low_memory=False)
-
-    # Normalize antecedents parsing
-    def parse_antecedents(x):
-        if pd.isna(x):
-            return set()
-        if isinstance(x, (list, set)):
-            return set(x)
-        s = str(x).strip()
-        try:
-            if s.startswith("["):
-                return set(ast.literal_eval(s))
-        except Exception:
-            pass
-        parts = [p.strip() for p in s.split(",") if p.strip()]
-        return set(parts)
-
-    rules_df = df_auto.copy()
-    rules_df["antecedents"] = rules_df["antecedents"].apply(parse_antecedents)
-
-    # Pre-parse rules
-    rules_df["final_diagnosis"] = rules_df["consequents"].apply(map_diagnosis)
-    rules_df["antecedents"] = rules_df["antecedents"].apply(
-        lambda x: set(x) - STOPWORDS
-    )
-    
-    rules_df = rules_df[rules_df["antecedents"].map(len) > 0].dropna(
-        subset=["final_diagnosis"]
-    )
+    """Engine rule set aktif (dibangun ulang hanya jika file rules berubah)"""
+    return get_rule_registry().engine()
 
-    # Initialize Engine
-    return RuleEngine(rules_df) # type: ignore
-
-
-def clean_text(text):
-    if not isinstance(text, str):
-        return set()
-    text = text.lower()
-    text = re.sub(r"([^\w\s])", r" \1 ", text)
-    text = re.sub(r"[^a-z0-9\s_]", " ", text)
-    tokens = set(text.split())
-    # Hapus stopwords dan kata pendek (Jangan hapus isdigit karena port spt 5678 penting)
-    return {t for t in tokens if t not in STOPWORDS and len(t) > 2}
-
-
-def map_diagnosis(val):
-    s = str(val).upper()
-    if "NORMAL" in s:
-        return None
-    if "UPSTREAM_FAILURE" in s:
-        return "UPSTREAM_FAILURE"
-    if "LINK_FAILURE" in s:
-        return "LINK_FAILURE"
-    # Perketat: BROADCAST saja tidak cukup, harus ada STORM atau LOOPED
-    if "STORM" in s or "LOOPED" in s:
-        return "BROADCAST_STORM"
-    if "DDOS" in s:
-        return "DDoS"
-    return None
-
-
-# CORE PROCESSING - Optimization: Move GENERIC_KEYWORDS outside function
-GENERIC_KEYWORDS = {
-    "interface",
-    "link",
-    "ethernet",
-    "port",
-    "0x0800",
-    "udp",
-    "admin",
-    "bridge",
-    "proto",
-    "icmp",
-    "type",
-    "code",
-    "mac",
-    "src",
-    "dst",
-    "ospf",
-    "state",
-    "neighbor",
-    "change",
-    "exstart",
-    "logged",
-    "user",
-}
 
+@st.cache_resource
+def get_diagnoser():
+    """Satu Diagnoser (LRU cache pesan -> diagnosis) untuk seluruh sesi"""
+    return Diagnoser(load_and_process_rules())
 
-def process_chunk_aggregation(chunk_df, rule_engine):
-    matched_count = 0
 
-    for idx, row in chunk_df.iterrows():
-        msg = str(row.get("message", ""))
-        tokens = clean_text(msg)
+@st.cache_resource
+def get_profiler():
+    """Riwayat profil per tahap (panel Diagnostics); RCA_PROFILE_LOG=path juga menulis JSON Lines"""
+    return Profiler(log_path=os.environ.get("RCA_PROFILE_LOG"))
 
-        diag = None
-        prio = "NORMAL"
-        evidence = set()
-        confidence = None
 
-        # SUPER FAST ENGINE MATCHING
-        best_rule = rule_engine.match(tokens)
+@st.cache_resource
+def get_live_analyzer(live_log_path):
+    """Satu worker analisis live_log.csv per proses, dipakai bersama semua sesi"""
+    return LiveAnalyzer(
+        live_log_path, get_diagnoser(), engine_source=get_rule_registry().engine, profiler=get_profiler()
+    ).start()
 
-        if best_rule is not None:
-            diag = best_rule["final_diagnosis"]
-            evidence = best_rule["antecedents"]
-            lift_val = best_rule.get("lift", 0)
-            confidence = best_rule.get("confidence", None)
-            prio = (
-                "FATAL"
-                if lift_val >= 6.0
-                else "CRITICAL" if lift_val >= 3.0 else "WARNING"
-            )
 
-        # HARDCODE OVERRIDE SESUAI PERMINTAAN SKENARIO
-        msg_lower = msg.lower()
-        dev = row.get("source_router", "")
-        
-        # 1. UPSTREAM FAILURE
-        if "internet connection lost" in msg_lower or "8.8.8.8 rto" in msg_lower or ("ether1" in msg_lower and "link down" in msg_lower and "edge" in dev.lower()):
-            diag, prio, evidence, confidence = "UPSTREAM_FAILURE", "FATAL", {"internet", "lost", "uplink_down"}, 0.99
-            
-        # 2. BROADCAST STORM & L2 LOOP -> Diubah menjadi DDoS
-        elif "looped packet" in msg_lower or "broadcast_storm" in msg_lower or "mac flapping" in msg_lower or "host moved" in msg_lower or "255.255.255.255" in msg_lower:
-            diag, prio, evidence, confidence = "DDoS", "FATAL", {"looped", "packet", "broadcast", "ping_flood"}, 0.99
-        elif "ospf" in msg_lower and "broadcast" in msg_lower and "state change to init" in msg_lower:
-            # ospf jatuh karena broadcast storm
-            diag, prio, evidence, confidence = "DDoS", "FATAL", {"ospf", "broadcast_storm", "init"}, 0.90
-
-        # 3. DDoS ATTACKS (5 Skenario: ICMP, UDP BW, UDP PPS, TCP Conn, Port Scan)
-        elif "ddos_detected" in msg_lower or "flood" in msg_lower:
-            diag, prio, evidence, confidence = "DDoS", "CRITICAL", {"ddos", "flood"}, 0.95
-        elif "bandwidth-test" in msg_lower or "bandwidth test" in msg_lower:
-            diag, prio, evidence, confidence = "DDoS", "CRITICAL", {"bandwidth_test", "exhaustion"}, 0.95
-        elif "port scan" in msg_lower or "port scan detected" in msg_lower or "scan" in msg_lower and "drop" in msg_lower:
-            diag, prio, evidence, confidence = "DDoS", "CRITICAL", {"port_scan", "aggressive"}, 0.95
-        elif "icmp flood" in msg_lower or ("icmp" in msg_lower and "limit" in msg_lower):
-            diag, prio, evidence, confidence = "DDoS", "CRITICAL", {"icmp", "ping_flood"}, 0.95
-        elif "udp flood" in msg_lower or "tcp flood" in msg_lower:
-            diag, prio, evidence, confidence = "DDoS", "CRITICAL", {"tcp_udp", "flood"}, 0.95
-
-        # AGGREGATION
-        if diag:
-            matched_count += 1
-            if diag not in st.session_state["issues"]:
-                st.session_state["issues"][diag] = {
-                    "count": 0,
-                    "priority": prio,
-                    "routers": set(),
-                    "last_seen": row.get("time", "-"),
-                    "evidence": set(),
-                    "logs": [],
-                    "lift": 0,
-                }
+def profiling_enabled():
+    """Render dashboard hanya diprofil jika panel Diagnostics dibuka atau log profil aktif"""
+    return st.session_state.get("show_diagnostics", False) or bool(get_profiler().log_path)
+
+
+@st.cache_resource
+def get_chunk_pool():
+    """Process pool analisis file upload, dipakai ulang antar rerun & sesi"""
+    return ChunkPool(get_rule_registry().active.path)
+
+
+LIVE_COLUMN_LABELS = {
+    "time": "Waktu Diterima",
+    "source_router": "Perangkat (Host)",
+    "topics": "Topik Modul",
+    "message": "Pesan Log Mentah",
+}
+
+
+def filter_issues(issues):
+    filtered_issues = {}
+    for diag, data in issues.items():
+        if diag == "DDoS" and data["count"] < DDOS_THRESHOLD_COUNT:
+            continue
+        filtered_issues[diag] = data
+    return filtered_issues
+
+
+def live_display_rows(live_df):
+    """Kolom tabel live stream dengan label tampilan, baris terbaru di atas"""
+    cols_available = [c for c in LIVE_COLUMN_LABELS if c in live_df.columns]
+    live_display = live_df[cols_available].iloc[::-1].rename(columns=LIVE_COLUMN_LABELS)
+    return live_display.reset_index(drop=True)
+
+
+def render_metrics(filtered_issues, log_count=None, new_logs_count=0):
+    # METRICS HEADER
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Jenis Anomali Ditemukan", len(filtered_issues))
+    m2.metric(
+        "Peringatan Kritis",
+        sum(
+            1
+            for d in filtered_issues.values()
+            if d["priority"] in ["FATAL", "CRITICAL"]
+        ),
+    )
+    if log_count is None:
+        m3.metric("Log Diproses", "Selesai")
+    else:
+        m3.metric(
+            "Total Log Diterima",
+            log_count,
+            delta=f"{new_logs_count} baru" if new_logs_count > 0 else None
+        )
+
+
+def render_live_stream(live_display):
+    # ======================================================
+    # SECTION 1: DATA ALIRAN LOG AKTIF (Live Log Stream)
+    # ======================================================
+    st.subheader("Data Aliran Log Aktif (Live Log Stream)")
+    st.caption("Log mentah yang diterima secara real-time dari seluruh perangkat router yang dipantau.")
+
+    if live_display is not None and not live_display.empty:
+        st.dataframe(
+            live_display,
+            hide_index=True,
+            use_container_width=True,
+            height=300,
+        )
+    else:
+        st.info("Belum ada log yang diterima.")
+
+
+def render_issue_cards(filtered_issues, log_frames=None):
+    # ======================================================
+    # SECTION 2: ANALISIS & REKOMENDASI + TABEL PERINGATAN
+    # ======================================================
+    st.subheader("Analisis Akar Masalah & Rekomendasi Tindakan")
+
+    if not filtered_issues:
+        st.info("Tidak ada anomali yang terdeteksi.")
+        return
+
+    for diag, data in sorted(filtered_issues.items(), key=lambda x: x[1]["priority"]):
+        info = RECOMMENDATION_MAP.get(diag, {"title": diag, "desc": "", "actions": []})
+        style = f"status-{data['priority'].lower()}"
+
+        st.markdown(
+            f"""
+        <div class="card {style}">
+            <div style="display:flex; justify-content:space-between;">
+                <span style="font-weight:bold; font-size:1.1em;">{info['title']}</span>
+                <span class="evidence-tag" style="background:black; color:white;">{data['priority']}</span>
+            </div>
+            <div style="font-size:0.9em; margin: 10px 0;">{info['desc']}</div>
+            <div style="font-size:0.8em; margin-top:5px;"><b>Key Symptoms:</b> {" ".join([f"<span class='evidence-tag'>{e}</span>" for e in data['evidence']])}</div>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        with st.expander(f"Lihat Detail & Data Peringatan: {info['title']}"):
+            st.write("**Tindakan yang Direkomendasikan:**")
+            for a in info["actions"]:
+                st.write(f"- {a}")
+
+            if data["logs"]:
+                st.write(f"**Root Cause Alert Data ({len(data['logs'])} entries):**")
+                logs_df = log_frames[diag] if log_frames is not None else pd.DataFrame(data["logs"])
+                st.dataframe(
+                    logs_df,
+                    hide_index=True,
+                    use_container_width=True,
+                    height=max(200, min(600, len(data["logs"]) * 38 + 40)),
+                    column_config={
+                        "Time": st.column_config.TextColumn("Time", width="medium"),
+                        "Device": st.column_config.TextColumn("Device", width="small"),
+                        "Diagnosis": st.column_config.TextColumn("Diagnosis", width="medium"),
+                        "Priority": st.column_config.TextColumn("Priority", width="small"),
+                        "Symptoms (Antecedents)": st.column_config.TextColumn("Symptoms", width="medium"),
+                        "Confidence": st.column_config.TextColumn("Confidence", width="small"),
+                        "Trigger Message": st.column_config.TextColumn("Trigger Message", width="large"),
+                    }
+                )
+        st.divider()
+
 
-            issue = st.session_state["issues"][diag]
-            issue["count"] += 1
-            issue["routers"].add(row.get("source_router", "Unknown"))
-            issue["last_seen"] = row.get("time", "-")
-            issue["evidence"].update(evidence)
-            # Hardcode overrides: confidence defaults to 100.0%; ML-matched logs show actual confidence
-            conf_display = f"{confidence * 100:.1f}%" if confidence is not None else "100.0%"
-            if len(issue["logs"]) < 200:
-                issue["logs"].append({
-                    "Time": row.get("time", "-"),
-                    "Device": row.get("source_router", "Unknown"),
-                    "Diagnosis": diag,
-                    "Priority": prio,
-                    "Symptoms (Antecedents)": ", ".join(sorted(str(e) for e in evidence)),
-                    "Confidence": conf_display,
-                    "Trigger Message": msg[:120] + "..." if len(msg) > 120 else msg,
-                })
-
-    return matched_count
+def update_live_view(snapshot):
+    """
+    Sinkronkan tabel live milik sesi dengan snapshot worker. Jika generation
+    sama, hanya baris baru (selisih total_rows, di ekor live_df) yang diubah
+    ke format tampilan dan ditambahkan di atas tabel; tabel tidak dibangun ulang.
+    """
+    state = st.session_state["live_log_state"]
+    if state.get("version") == snapshot.version:
+        state["new_logs"] = 0
+        return state
+
+    live_df = snapshot.live_df
+    display = state.get("display")
+    delta = snapshot.total_rows - state.get("total_rows", 0)
+    if live_df is None or live_df.empty:
+        display = None
+        new_logs = 0
+    elif display is not None and state.get("generation") == snapshot.generation and 0 <= delta < len(live_df):
+        if delta:
+            display = pd.concat(
+                [live_display_rows(live_df.tail(delta)), display], ignore_index=True
+            ).head(len(live_df))
+        new_logs = delta
+    else:
+        display = live_display_rows(live_df)
+        new_logs = len(live_df)
+
+    state.update(
+        version=snapshot.version,
+        generation=snapshot.generation,
+        total_rows=snapshot.total_rows,
+        display=display,
+        new_logs=new_logs,
+    )
+    return state
+
+
+def live_stream_fragment(analyzer):
+    """Fragment: metrik + tabel live stream (dijalankan ulang sesuai interval refresh)"""
+    timer = StageTimer()
+    snapshot = analyzer.snapshot()
+    if snapshot.error:
+        st.warning(f"⚠️ Live analyzer: {snapshot.error}")
+    with timer.stage("render"):
+        state = update_live_view(snapshot)
+        log_count = len(snapshot.live_df) if snapshot.live_df is not None else 0
+        render_metrics(filter_issues(snapshot.issues), log_count, state["new_logs"])
+        st.divider()
+        render_live_stream(state["display"])
+    if profiling_enabled():
+        timer.count("rows", state["new_logs"])
+        get_profiler().record("live:stream", timer, snapshot_version=snapshot.version)
+
+
+def live_issues_fragment(analyzer):
+    """Fragment: kartu analisis & tabel peringatan; DataFrame log dibangun ulang hanya jika snapshot berubah"""
+    timer = StageTimer()
+    snapshot = analyzer.snapshot()
+    state = st.session_state["live_log_state"]
+    with timer.stage("render"):
+        if state.get("cards_version") != snapshot.version:
+            state["cards_version"] = snapshot.version
+            state["log_frames"] = {
+                diag: pd.DataFrame(data["logs"]) for diag, data in snapshot.issues.items() if data["logs"]
+            }
+        st.session_state["issues"] = snapshot.issues
+        render_issue_cards(filter_issues(snapshot.issues), state["log_frames"])
+    if profiling_enabled():
+        get_profiler().record("live:issues", timer, snapshot_version=snapshot.version)
+
+
+def render_diagnostics_panel():
+    """
+    Panel Diagnostics: waktu per tahap (read, cache, tokenize, match, override,
+    aggregate, merge, render), baris diproses dan cache hit rate dari riwayat
+    Profiler bergulir. Sumber: live:analysis (worker live), live:stream /
+    live:issues (render fragment), upload (analisis file upload).
+    """
+    profiler = get_profiler()
+    records = profiler.history()
+    st.subheader("Diagnostics: Profil Pipeline per Tahap")
+    cache = get_diagnoser().cache
+    lookups = cache.hits + cache.misses
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Record Profil", len(records))
+    c2.metric("Cache Hit Rate (total)", f"{cache.hits / lookups * 100:.1f}%" if lookups else "-")
+    c3.metric("Entri Cache Diagnosis", len(cache))
+    if profiler.log_path:
+        st.caption(f"Record juga ditulis ke {profiler.log_path}")
+    if not records:
+        st.info("Belum ada record profil.")
+        return
+
+    summary = profiler.summary()
+    sources = list(summary)
+    source = st.selectbox("Sumber", sources, key="diagnostics_source")
+    source_records = [r for r in records if r["source"] == source]
+    stages = ordered_stages(source_records)
+    history_df = pd.DataFrame(
+        [{stage: r["stages_ms"].get(stage, 0.0) for stage in stages} for r in source_records],
+        index=pd.to_datetime([r["ts"] for r in source_records], unit="s"),
+    )
+    st.caption("Waktu per tahap (ms) per rerun/siklus")
+    st.bar_chart(history_df, height=250)
+    st.dataframe(pd.DataFrame(summary[source]).T, use_container_width=True)
+
+    recent = pd.DataFrame([
+        {
+            "Waktu": time.strftime("%H:%M:%S", time.localtime(r["ts"])),
+            "Sumber": r["source"],
+            "Total (ms)": r["total_ms"],
+            "Baris": r["rows"],
+            "Cache Hit": f"{r['cache_hit_rate'] * 100:.1f}%" if r["cache_hit_rate"] is not None else "-",
+            **{f"{stage} (ms)": r["stages_ms"].get(stage) for stage in ordered_stages(records)},
+        }
+        for r in reversed(records[-50:])
+    ])
+    st.dataframe(recent, hide_index=True, use_container_width=True, height=250)
+    if st.button("Reset Riwayat Profil"):
+        profiler.clear()
 
 
 # STREAMLIT UI (Dashboard)
@@ -377,6 +382,26 @@ if "issues" not in st.session_state:
 if "alerts" not in st.session_state:
     st.session_state["alerts"] = []
 
+# Rule set aktif (dipilih operator, berlaku untuk semua sesi)
+def switch_rule_set():
+    get_rule_registry().switch(st.session_state["rule_set_select"])
+
+
+rule_registry = get_rule_registry()
+rule_set_options = rule_registry.available()
+if rule_registry.active.name not in rule_set_options:
+    rule_set_options.insert(0, rule_registry.active.name)
+st.session_state["rule_set_select"] = rule_registry.active.name
+with st.sidebar:
+    st.subheader("Rule Set")
+    st.selectbox("Rule set aktif", rule_set_options, key="rule_set_select", on_change=switch_rule_set)
+    st.caption(
+        f"{len(rule_registry.active.engine)} rules aktif, dimuat "
+        f"{time.strftime('%H:%M:%S', time.localtime(rule_registry.active.loaded_at))}"
+    )
+    st.subheader("Diagnostics")
+    st.checkbox("Tampilkan panel profil per tahap", value=False, key="show_diagnostics")
+
 # Live Log Checking Toggle
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -393,20 +418,6 @@ uploaded_file = (
     else None
 )
 
-# Helper for Safe File Operations
-def safe_read_csv(path, retries=5):
-    """Attempt to read CSV with retries for Windows file locking"""
-    for i in range(retries):
-        try:
-            return pd.read_csv(path, on_bad_lines='skip') # Skip bad lines if partial write
-        except (PermissionError, pd.errors.ParserError):
-            time.sleep(0.1)
-        except pd.errors.EmptyDataError:
-             return None
-        except Exception:
-            return None
-    return None # Return None to indicate read failure
-
 if uploaded_file or enable_live_log:
     # Determine the data source
     if enable_live_log:
@@ -438,6 +449,7 @@ if uploaded_file or enable_live_log:
                 
                 if success:
                     st.session_state["issues"] = {}
+                    get_live_analyzer(live_log_path).poll(force=True)
                     st.toast("Live data cleared!", icon="🗑️")
                     time.sleep(0.5)
                     st.rerun()
@@ -473,7 +485,7 @@ if uploaded_file or enable_live_log:
                 )
 
             if st.session_state.get("analysis_active", False):
-                st.info(f"Live monitoring active - script will re-check every {auto_refresh_interval}s")
+                st.info(f"Live monitoring active - live sections refresh every {auto_refresh_interval}s")
 
             data_source = live_log_path
             is_live_mode = True
@@ -484,6 +496,10 @@ if uploaded_file or enable_live_log:
 
     # OPTIMIZATION: Use cached rules loading instead of reloading every time
     rules_df = load_and_process_rules()
+    diagnoser = get_diagnoser()
+    if diagnoser.engine is not rules_df:
+        # Rule set diganti / file rules berubah: ganti engine & invalidasi cache diagnosis
+        diagnoser.reload(rules_df)
 
     # --- START/STOP ANALYSIS TOGGLE ---
     col_start, col_status = st.columns([1, 4])
@@ -500,8 +516,19 @@ if uploaded_file or enable_live_log:
         if st.session_state["analysis_active"]:
             st.success("Analysis Running")
     
-    if st.session_state["analysis_active"] and data_source:
-        # Create containers for live streaming results
+    if st.session_state["analysis_active"] and data_source and is_live_mode:
+        # OPTIMIZATION: Bagian live berjalan sebagai fragment dengan timer sendiri,
+        # sehingga refresh tidak menjalankan ulang seluruh script (CSS, uploader, kontrol)
+        analyzer = get_live_analyzer(data_source)
+        st.fragment(live_stream_fragment, run_every=auto_refresh_interval)(analyzer)
+        st.divider()
+        st.fragment(live_issues_fragment, run_every=auto_refresh_interval)(analyzer)
+        if st.session_state["show_diagnostics"]:
+            st.divider()
+            st.fragment(render_diagnostics_panel, run_every=auto_refresh_interval)()
+
+    elif st.session_state["analysis_active"] and data_source:
+        # Create containers for streaming results
         progress_container = st.container()
         results_container = st.container()
 
@@ -510,169 +537,63 @@ if uploaded_file or enable_live_log:
 
         # OPTIMIZATION: Larger chunks for faster initial results + streaming
         CHUNK_SIZE = 2000
-        
-        # Read Data
-        if is_live_mode:
-            try:
-                # Use safe read for live file
-                full_df = safe_read_csv(data_source)
-                
-                if full_df is None:
-                    # Read failed, try to use last known good state or just skip this run
-                    st.warning("⚠️ Live log file is locked. Retrying next refresh...")
-                    chunks = []
-                    total_chunks = 0
-                else:
-                    # FORCE VIEW LIMIT: User wants to see more context
-                    full_df = full_df.tail(2000).reset_index(drop=True)
-                    
-                    chunks = [full_df]
-                    total_chunks = 1
-            except Exception as e:
-                st.error(f"Error reading live log: {e}")
-                chunks = []
-                total_chunks = 0
-        else:
-             # Standard CSV read for uploaded file
-             try:
-                chunks = list(pd.read_csv(data_source, chunksize=CHUNK_SIZE))
-                total_chunks = len(chunks)
-             except Exception:
-                 chunks = []
-                 total_chunks = 0
 
+        # OPTIMIZATION: File dibaca per chunk secara streaming (tidak di-list-kan),
+        # chunk dianalisis paralel di process pool lalu agregat parsialnya
+        # digabung berurutan sambil memperbarui progress bar
+        total_bytes = getattr(data_source, "size", 0)
+        first_chunk = None
+        total_rows = 0
+        # Tahap dari worker pool = jumlah waktu CPU semua worker (lihat ChunkPool.imap)
+        timer = StageTimer()
+        started = time.perf_counter()
+
+        def timed_chunks(reader):
+            while True:
+                with timer.stage("read"):
+                    chunk = next(reader, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        progress_bar = progress_container.progress(0.0, text="Membaca log...")
+        try:
+            reader = pd.read_csv(data_source, chunksize=CHUNK_SIZE)
+            with timer.stage("read"):
+                first_chunk = next(reader, None)
+            chunks = chain([first_chunk], timed_chunks(reader)) if first_chunk is not None else []
+            chunk_pool = get_chunk_pool()
+            chunk_pool.set_rules_path(get_rule_registry().active.path)
+            for rows, matched, partial in chunk_pool.imap(chunks, local_diagnoser=diagnoser, timer=timer):
+                with timer.stage("merge"):
+                    merge_issues(st.session_state["issues"], partial)
+                total_rows += rows
+                done = min(1.0, data_source.tell() / total_bytes) if total_bytes else 0.0
+                progress_bar.progress(done, text=f"{total_rows:,} log dianalisis...")
+        except Exception as e:
+            st.error(f"Error reading uploaded file: {e}")
+        progress_bar.empty()
 
-        # Process chunks
         with progress_container:
-             if total_chunks > 0:
-                pass # Silent processing for live mode to avoid flickering progress bars
-             else:
+            if total_rows == 0:
                 st.warning("No data to process")
 
-        for current_chunk, chunk in enumerate(chunks, 1):
-            if chunk.empty:
-                continue
-                
-            # Process this chunk
-            count = process_chunk_aggregation(chunk, rules_df)
-
-        # LIVE UPDATE: Show results
-        with results_container:
-            # Filter issues
-            filtered_issues = {}
-            for diag, data in st.session_state.get("issues", {}).items():
-                if diag == "DDoS" and data["count"] < DDOS_THRESHOLD_COUNT:
-                    continue
-                filtered_issues[diag] = data
-
-            # METRICS HEADER
-            m1, m2, m3 = st.columns(3)
-            m1.metric("Jenis Anomali Ditemukan", len(filtered_issues))
-            m2.metric(
-                "Peringatan Kritis",
-                sum(
-                    1
-                    for d in filtered_issues.values()
-                    if d["priority"] in ["FATAL", "CRITICAL"]
-                ),
+        # Show results
+        with results_container, timer.stage("render"):
+            filtered_issues = filter_issues(st.session_state.get("issues", {}))
+            render_metrics(filtered_issues)
+            st.divider()
+            render_live_stream(
+                live_display_rows(first_chunk) if first_chunk is not None and not first_chunk.empty else None
             )
-
-            if is_live_mode:
-                current_log_count = len(chunks[0]) if chunks else 0
-                last_count = st.session_state["live_log_state"].get("last_count", 0)
-                new_logs_count = current_log_count - last_count
-                if new_logs_count < 0:
-                    new_logs_count = current_log_count
-                st.session_state["live_log_state"]["last_count"] = current_log_count
-                m3.metric(
-                    "Total Log Diterima",
-                    current_log_count,
-                    delta=f"{new_logs_count} baru" if new_logs_count > 0 else None
-                )
-            else:
-                m3.metric("Log Diproses", "Selesai")
-
             st.divider()
+            render_issue_cards(filtered_issues)
 
-            # ======================================================
-            # SECTION 1: DATA ALIRAN LOG AKTIF (Live Log Stream)
-            # ======================================================
-            st.subheader("Data Aliran Log Aktif (Live Log Stream)")
-            st.caption("Log mentah yang diterima secara real-time dari seluruh perangkat router yang dipantau.")
-
-            if chunks and not chunks[0].empty:
-                live_df = chunks[0].copy()
-                cols_available = [c for c in ["time", "source_router", "topics", "message"] if c in live_df.columns]
-                live_display = live_df[cols_available].copy()
-                live_display.columns = [
-                    {"time": "Waktu Diterima", "source_router": "Perangkat (Host)",
-                     "topics": "Topik Modul", "message": "Pesan Log Mentah"}.get(c, c)
-                    for c in cols_available
-                ]
-                live_display = live_display.iloc[::-1].reset_index(drop=True)
-                st.dataframe(
-                    live_display,
-                    hide_index=True,
-                    use_container_width=True,
-                    height=300,
-                )
-            else:
-                st.info("Belum ada log yang diterima.")
-
+        if total_rows and profiling_enabled():
+            get_profiler().record(
+                "upload", timer, wall_ms=round((time.perf_counter() - started) * 1000, 3),
+                workers=chunk_pool.workers,
+            )
+        if st.session_state["show_diagnostics"]:
             st.divider()
-
-            # ======================================================
-            # SECTION 2: ANALISIS & REKOMENDASI + TABEL PERINGATAN
-            # ======================================================
-            st.subheader("Analisis Akar Masalah & Rekomendasi Tindakan")
-
-            if filtered_issues:
-                for diag, data in sorted(filtered_issues.items(), key=lambda x: x[1]["priority"]):
-                    info = RECOMMENDATION_MAP.get(diag, {"title": diag, "desc": "", "actions": []})
-                    style = f"status-{data['priority'].lower()}"
-
-                    st.markdown(
-                        f"""
-                    <div class="card {style}">
-                        <div style="display:flex; justify-content:space-between;">
-                            <span style="font-weight:bold; font-size:1.1em;">{info['title']}</span>
-                            <span class="evidence-tag" style="background:black; color:white;">{data['priority']}</span>
-                        </div>
-                        <div style="font-size:0.9em; margin: 10px 0;">{info['desc']}</div>
-                        <div style="font-size:0.8em; margin-top:5px;"><b>Key Symptoms:</b> {" ".join([f"<span class='evidence-tag'>{e}</span>" for e in data['evidence']])}</div>
-                    </div>
-                    """,
-                        unsafe_allow_html=True,
-                    )
-
-                    with st.expander(f"Lihat Detail & Data Peringatan: {info['title']}"):
-                        st.write("**Tindakan yang Direkomendasikan:**")
-                        for a in info["actions"]:
-                            st.write(f"- {a}")
-
-                        if data["logs"]:
-                            st.write(f"**Root Cause Alert Data ({len(data['logs'])} entries):**")
-                            logs_df = pd.DataFrame(data["logs"])
-                            st.dataframe(
-                                logs_df,
-                                hide_index=True,
-                                use_container_width=True,
-                                height=max(200, min(600, len(data["logs"]) * 38 + 40)),
-                                column_config={
-                                    "Time": st.column_config.TextColumn("Time", width="medium"),
-                                    "Device": st.column_config.TextColumn("Device", width="small"),
-                                    "Diagnosis": st.column_config.TextColumn("Diagnosis", width="medium"),
-                                    "Priority": st.column_config.TextColumn("Priority", width="small"),
-                                    "Symptoms (Antecedents)": st.column_config.TextColumn("Symptoms", width="medium"),
-                                    "Confidence": st.column_config.TextColumn("Confidence", width="small"),
-                                    "Trigger Message": st.column_config.TextColumn("Trigger Message", width="large"),
-                                }
-                            )
-                    st.divider()
-            else:
-                st.info("Tidak ada anomali yang terdeteksi.")
-
-if 'is_live_mode' in locals() and is_live_mode and st.session_state.get("analysis_active", False): # type: ignore
-    import time
-    time.sleep(auto_refresh_interval) # type: ignore
-    st.rerun()
+            render_diagnostics_panel()
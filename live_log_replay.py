@@ -0,0 +1,261 @@
+"""
+Replay capture arsip ke jalur live (pengganti live_log_collector.py saat
+mereproduksi insiden di lab).
+
+Baris dari satu atau beberapa capture (dataset_log_*.csv / Data/*.csv)
+diurutkan berdasarkan kolom `time` asli (stabil: urutan file dipertahankan
+untuk timestamp sama), lalu ditulis ke live_log.csv dengan write_live_csv
+milik collector (jendela MAX_LIVE_LOG_ROWS yang sama), sehingga dashboard
+mode live menganalisisnya persis seperti log dari router.
+
+Kecepatan:
+- --speed 1   : jeda asli antar baris (real-time)
+- --speed 10  : 10x lebih cepat
+- --speed max : secepat mungkin, per --batch baris
+Jeda idle yang sangat panjang di capture dipotong ke --max-gap detik
+(timeline asli) agar replay tidak menunggu berjam-jam.
+
+--measure menjalankan LiveAnalyzer (rule set aktif) pada file yang sama dan
+melaporkan laju ingest, waktu siklus analisis, baris yang tidak sempat
+dianalisis (jendela tergeser sebelum dipoll) dan estimasi laju ingest
+maksimum yang masih bisa diikuti analisis live.
+
+Jalankan dari root project:
+    python live_log_replay.py Data/dataset_log_20260130_103204_link_failure.csv --speed 10
+    python live_log_replay.py "Data/ddos_*.csv" --speed max --measure
+"""
+
+import argparse
+import glob
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from live_log_collector import LIVE_LOG_FILE, MAX_LIVE_LOG_ROWS, POLL_INTERVAL, write_live_csv
+from rca.live import LIVE_LOG_COLUMNS
+
+# ================= KONFIGURASI =================
+DEFAULT_FLUSH_INTERVAL = 1.0  # Detik antar penulisan file (mode --speed angka)
+DEFAULT_BATCH = 500  # Baris per penulisan (mode --speed max)
+DEFAULT_MAX_GAP = 60.0  # Detik (timeline asli) jeda idle maksimum
+# ===============================================
+
+
+def load_capture(patterns):
+    """Gabungkan capture (glob diperbolehkan) -> DataFrame kolom live + offset detik (_offset)"""
+    paths = []
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern))
+        if not matched:
+            raise FileNotFoundError(f"Capture tidak ditemukan: {pattern}")
+        paths.extend(matched)
+
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path, low_memory=False)
+        if "message" not in df.columns:
+            print(f"[WARN] {path} dilewati (tanpa kolom message)")
+            continue
+        frames.append(df)
+    if not frames:
+        raise ValueError("Tidak ada capture dengan kolom message")
+
+    df = pd.concat(frames, ignore_index=True)
+    ts = pd.to_datetime(df["time"], format="mixed", errors="coerce") if "time" in df.columns else None
+    if ts is None or ts.isna().all():
+        # Tanpa timestamp: satu baris per detik sesuai urutan file
+        seconds = np.arange(len(df), dtype=np.float64)
+    else:
+        ts = ts.ffill().bfill()
+        seconds = (ts - ts.min()).dt.total_seconds().to_numpy()
+    order = np.argsort(seconds, kind="stable")
+    df = df.iloc[order].reset_index(drop=True)
+    seconds = seconds[order]
+
+    out = df.reindex(columns=LIVE_LOG_COLUMNS)
+    out["source_router"] = out["source_router"].fillna("Unknown")
+    out["topics"] = out["topics"].fillna("")
+    out["_offset"] = seconds
+    return out, paths
+
+
+def schedule(offsets, speed, max_gap):
+    """Waktu tulis (detik wall-clock sejak mulai) per baris; None = secepat mungkin"""
+    if speed is None:
+        return None
+    gaps = np.diff(offsets, prepend=offsets[0] if len(offsets) else 0.0)
+    if max_gap is not None:
+        gaps = np.minimum(gaps, max_gap)
+    return np.cumsum(gaps) / speed
+
+
+def replay(df, live_path=LIVE_LOG_FILE, speed=1.0, flush_interval=DEFAULT_FLUSH_INTERVAL,
+           batch=DEFAULT_BATCH, max_gap=DEFAULT_MAX_GAP, max_rows=MAX_LIVE_LOG_ROWS, stop=None, on_flush=None):
+    """
+    Tulis baris df ke live_path sesuai jadwal. speed=None -> secepat mungkin.
+    on_flush(rows_written_total, elapsed) dipanggil setiap selesai menulis.
+    Return (baris tertulis, baris gagal ditulis, detik).
+    """
+    due = schedule(df["_offset"].to_numpy(), speed, max_gap)
+    rows = df[LIVE_LOG_COLUMNS]
+    written = failed = 0
+    i, n = 0, len(rows)
+    start = time.perf_counter()
+    last_flush = -math.inf
+    while i < n:
+        if stop is not None and stop.is_set():
+            break
+        now = time.perf_counter() - start
+        if due is None:
+            j = min(i + batch, n)
+        else:
+            wake = max(due[i], last_flush + flush_interval)
+            if wake > now:
+                time.sleep(wake - now)
+                now = time.perf_counter() - start
+            j = int(np.searchsorted(due, now, side="right"))
+            j = max(j, i + 1)
+
+        chunk = rows.iloc[i:j].copy()
+        chunk["fetched_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        success, _ = write_live_csv(chunk, live_path, max_rows=max_rows)
+        if success:
+            written += j - i
+        else:
+            failed += j - i
+        last_flush = time.perf_counter() - start
+        i = j
+        if on_flush is not None:
+            on_flush(written, last_flush)
+    return written, failed, time.perf_counter() - start
+
+
+class AnalyzerProbe:
+    """
+    Jalankan LiveAnalyzer.poll dengan loop yang sama seperti worker-nya, sambil
+    mencatat waktu setiap siklus analisis dan cakupan baris (total_rows per
+    generation; generation naik = jendela tergeser sebelum sempat dipoll).
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.cycles = []
+        self.covered = {}
+        self.resets = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="replay-probe", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._poll()  # siklus terakhir setelah replay selesai
+
+    def _poll(self):
+        t0 = time.perf_counter()
+        if self.analyzer.poll():
+            self.cycles.append(time.perf_counter() - t0)
+            snap = self.analyzer.snapshot()
+            if snap.generation not in self.covered and any(self.covered.values()):
+                self.resets += 1
+            self.covered[snap.generation] = snap.total_rows
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._poll()
+            self._stop.wait(self.analyzer.poll_interval)
+
+    def rows_covered(self):
+        return sum(self.covered.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay capture arsip ke live_log.csv")
+    parser.add_argument("captures", nargs="+", help="file capture CSV (glob diperbolehkan)")
+    parser.add_argument("--speed", default="1", help="faktor kecepatan (1, 10, ...) atau 'max'")
+    parser.add_argument("--output", default=LIVE_LOG_FILE, help="file live log tujuan")
+    parser.add_argument("--flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="baris per tulis untuk --speed max")
+    parser.add_argument("--max-gap", type=float, default=DEFAULT_MAX_GAP, help="jeda idle maksimum (detik asli)")
+    parser.add_argument("--max-rows", type=int, default=MAX_LIVE_LOG_ROWS)
+    parser.add_argument("--measure", action="store_true", help="ukur LiveAnalyzer pada file yang sama")
+    parser.add_argument("--analyzer-poll", type=float, default=1.0, help="poll_interval LiveAnalyzer (--measure)")
+    args = parser.parse_args()
+
+    speed = None if args.speed.lower() == "max" else float(args.speed)
+    if speed is not None and speed <= 0:
+        parser.error("--speed harus > 0 atau 'max'")
+
+    try:
+        df, paths = load_capture(args.captures)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    span = df["_offset"].iloc[-1] if len(df) else 0.0
+    print("=== LIVE LOG REPLAY STARTED ===")
+    print(f"[INFO] Capture: {len(paths)} file, {len(df)} baris, rentang waktu asli {span:,.0f} detik")
+    print(f"[INFO] Menulis ke file lokal: {args.output} (max {args.max_rows} baris)")
+    print(f"[INFO] Kecepatan: {'max' if speed is None else f'{speed:g}x'}")
+
+    # === WIPE ON STARTUP (sama dengan collector) ===
+    pd.DataFrame(columns=LIVE_LOG_COLUMNS).to_csv(args.output, index=False, encoding="utf-8")
+
+    probe = None
+    if args.measure:
+        from rca.diagnosis import Diagnoser
+        from rca.live import LiveAnalyzer
+        from rca.registry import RuleSetRegistry
+
+        registry = RuleSetRegistry()
+        analyzer = LiveAnalyzer(args.output, Diagnoser(registry.engine()), window=args.max_rows,
+                                poll_interval=args.analyzer_poll)
+        probe = AnalyzerProbe(analyzer).start()
+        print(f"[INFO] Measure: LiveAnalyzer rule set {registry.active.name}, poll {args.analyzer_poll:g}s")
+
+    progress = {"next": time.perf_counter() + POLL_INTERVAL}
+
+    def report_progress(written, elapsed):
+        if time.perf_counter() >= progress["next"]:
+            progress["next"] = time.perf_counter() + POLL_INTERVAL
+            print(f"--> {written}/{len(df)} baris ({written / max(elapsed, 1e-9):,.0f} baris/s)")
+
+    try:
+        written, failed, elapsed = replay(
+            df, args.output, speed, args.flush_interval, args.batch, args.max_gap, args.max_rows,
+            on_flush=report_progress,
+        )
+    except KeyboardInterrupt:
+        print("\n[INFO] Replay dihentikan (Ctrl+C).")
+        if probe is not None:
+            probe.stop()
+        return
+
+    print(f"[OK] Replay selesai: {written} baris ({failed} gagal) dalam {elapsed:.1f}s "
+          f"= {written / max(elapsed, 1e-9):,.0f} baris/s")
+
+    if probe is not None:
+        probe.stop()
+        covered = probe.rows_covered()
+        cycles = np.array(probe.cycles) if probe.cycles else np.zeros(1)
+        cycle = float(np.percentile(cycles, 95))
+        # Setiap siklus worker = analisis + jeda poll; jendela max_rows harus cukup menampung baris baru
+        sustainable = args.max_rows / (cycle + args.analyzer_poll)
+        print(f"[MEASURE] Siklus analisis: {len(probe.cycles)}x, mean {cycles.mean() * 1000:.0f} ms, "
+              f"p95 {cycle * 1000:.0f} ms")
+        print(f"[MEASURE] Baris teranalisis: {min(covered, written)}/{written} "
+              f"(jendela tergeser {probe.resets}x)")
+        print(f"[MEASURE] Estimasi ingest maksimum berkelanjutan: {sustainable:,.0f} baris/s "
+              f"(jendela {args.max_rows} / (p95 siklus + poll {args.analyzer_poll:g}s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ import re
 import os
 
 import glob
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from rca.tokenizer import MINING_STOPWORDS, MINING_TOKENIZER  # noqa: E402
 
 # ==========================================
 # KONFIGURASI VERSI OTOMATIS
@@ -29,127 +33,17 @@ INPUT_FILE = os.path.join(data_dir, f"Master_Dataset_Gabungan_v{MAJOR_VERSION}.{
 OUTPUT_FILE = os.path.join(data_dir, f"Data_Siap_Mining_v{MAJOR_VERSION}.{latest_minor}.csv")
 print(f"Versi terdeteksi: v{MAJOR_VERSION}.{latest_minor}")
 
-# 1. STOPWORDS (KATA SAMPAH)
-STOPWORDS = {
-    # --- STOPWORDS UMUM ---
-    "ether1",
-    "ether2",
-    "ether3",
-    "ether4",
-    "ether5",
-    "ether6",
-    "ether7",
-    "loading",
-    "info",
-    "input",
-    "in",
-    "out",
-    "message",
-    "log",
-    "by",
-    "from",
-    "to",
-    "via",
-    "changed",
-    "set",
-    "connection-state",
-    "new",
-    "time",
-    "date",
-    "identity",
-    "forward",
-    "zone",
-    "firewall",
-    "router",
-    "system",
-    "script",
-    "debug",
-    "topics",
-    "active",
-    "inactive",
-    "assigned",
-    "deassigned",
-    "address",
-    "status",
-    "state",
-    "detected",
-    "using",
-    "packet",
-    "rule",
-    "up",
-    "running",
-    "full",
-    "established",
-    "connected",
-    "reachable",
-    "designated",
-    "backup",
-    "installed",
-    "added",
-    "exchange",
-    "route",
-    "version",
-    "change",
-    "created",
-    "init",
-    "twoway",
-    "2-way",
-    "exstart",
-    "waiting",
-    "negotiation",
-    "lsdb",
-    "bdr",
-    "dr",
-    "instance",
-    "account",
-    "user",
-    "logged",
-    "rebooted",
-    "shutdown",
-    "console",
-    "ttys0",
-    "api",
-    "rest-api",
-    "dhcp",
-    "dhcp-client",
-    "monitor",
-    "event",
-    "size",
-    "simple",
-    "got",
-    "other",
-    "monitor",
-    "host",
-    "rto",
-    "153",
-    "130",
-    "132",
-    "133",
-    "168",
-    "192",
-    "255",  # IP fragments umum
-}
+# 1. STOPWORDS (KATA SAMPAH) & 2. FUNGSI PEMBERSIH (CLEANING)
+# Didefinisikan sekali di rca.tokenizer (mode "mining"), dipakai juga oleh
+# evaluasi & inferensi: lowercase, sisakan huruf/angka/dash, buang stopwords
+# dan kata dengan panjang <= 2.
+STOPWORDS = MINING_STOPWORDS
 
 
-# ==========================================
-# FUNGSI PEMBERSIH (CLEANING)
-# ==========================================
 def clean_text(text):
     if not isinstance(text, str):
         return []
-
-    # 1. Ubah ke huruf kecil
-    text = text.lower()
-
-    # 2. Hapus karakter aneh (Regex)
-    # Hanya sisakan huruf, angka, spasi, dan dash
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-
-    # 3. Filter Stopwords & Panjang Kata
-    words = text.split()
-    filtered_words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-
-    return filtered_words
+    return MINING_TOKENIZER.tokenize(text)
 
 
 # ==========================================
@@ -171,18 +65,9 @@ def main():
 
     print("Sedang membersihkan Stopwords...")
 
-    # Gabungkan kolom jadi satu kalimat utuh (Router + Topik + Pesan)
-    # Pastikan di-convert ke string dulu untuk menghindari error jika ada data kosong
-    df["full_text"] = (
-        df["source_router"].astype(str)
-        + " "
-        + df["topics"].astype(str)
-        + " "
-        + df["message"].astype(str)
-    )
-
-    # Terapkan cleaning
-    df["items"] = df["full_text"].apply(clean_text)
+    # Gabungkan kolom jadi satu kalimat utuh (Router + Topik + Pesan) lalu
+    # cleaning satu batch (kolom di-convert ke string dulu, aman untuk data kosong)
+    df["items"] = MINING_TOKENIZER.tokenize_frame(df)
 
     # Hapus baris yang kosong setelah dibersihkan
     # (Baris yang tadinya berisi 'link up' sekarang jadi kosong, dan akan terhapus di sini)
@@ -0,0 +1,27 @@
+from .aggregation import aggregate_chunk, aggregate_frame, classify_chunk, merge_issues
+from .batch import TransactionMatrix
+from .cache import LRUCache, MessageMasker
+from .diagnosis import Diagnoser, Diagnosis, apply_overrides, rule_diagnosis
+from .engine import CompiledRuleEngine, RuleEngine
+from .inference import Matcher, load_matcher
+from .live import LiveAnalyzer, LiveSnapshot
+from .overrides import OVERRIDE_TABLE, OverrideMatcher
+from .profiling import Profiler, StageTimer
+from .registry import RuleSetRegistry
+from .rules import (
+    GENERIC_KEYWORDS,
+    drop_generic_rules,
+    is_generic_rule,
+    load_rules_df,
+    map_diagnosis,
+    parse_antecedents,
+)
+from .subset_index import SetTrieRuleEngine
+from .tokenizer import (
+    MINING_STOPWORDS,
+    STOPWORDS,
+    Tokenizer,
+    Vocabulary,
+    clean_text,
+    clean_text_batch,
+)
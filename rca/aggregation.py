@@ -0,0 +1,147 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+MAX_LOGS_PER_ISSUE = 200
+
+
+def new_issue(priority, last_seen):
+    return {
+        "count": 0,
+        "priority": priority,
+        "routers": set(),
+        "last_seen": last_seen,
+        "evidence": set(),
+        "logs": [],
+        "lift": 0,
+    }
+
+
+def _column(chunk_df, name, default):
+    if name in chunk_df.columns:
+        return chunk_df[name].to_numpy(dtype=object)
+    return np.full(len(chunk_df), default, dtype=object)
+
+
+def classify_chunk(chunk_df, diagnoser, timer=None):
+    """
+    Klasifikasi satu chunk secara kolom.
+    Return (frame, evidence_sets): frame berisi kolom diagnosis, priority,
+    confidence, evidence_id (indeks ke evidence_sets), time, router, message
+    dengan urutan baris yang sama dengan chunk_df.
+    timer (opsional) diteruskan ke diagnoser; sisa waktunya masuk tahap "aggregate".
+    """
+    t0 = time.perf_counter()
+    messages = _column(chunk_df, "message", "").astype(str)
+    devices = _column(chunk_df, "source_router", "")
+    t1 = time.perf_counter()
+    results = diagnoser.diagnose_batch(messages.tolist(), devices.tolist(), timer=timer)
+    t2 = time.perf_counter()
+    if not results:
+        return pd.DataFrame(
+            columns=["diagnosis", "priority", "confidence", "evidence_id", "time", "router", "message"]
+        ), []
+
+    diags, prios, evidence, confs = zip(*results)
+    evidence_ids, evidence_sets = pd.factorize(pd.Series(evidence, dtype=object))
+    frame = pd.DataFrame({
+        "diagnosis": np.array(diags, dtype=object),
+        "priority": np.array(prios, dtype=object),
+        "confidence": np.array(confs, dtype=object),
+        "evidence_id": evidence_ids,
+        "time": _column(chunk_df, "time", "-"),
+        "router": _column(chunk_df, "source_router", "Unknown"),
+        "message": messages,
+    })
+    if timer is not None:
+        timer.add("aggregate", (t1 - t0) + (time.perf_counter() - t2))
+    return frame, list(evidence_sets)
+
+
+def _conf_display(confidence):
+    # Hardcode overrides: confidence defaults to 100.0%; ML-matched logs show actual confidence
+    if confidence is None or pd.isna(confidence):
+        return "100.0%"
+    return f"{confidence * 100:.1f}%"
+
+
+def _trigger_message(msg):
+    return msg[:120] + "..." if len(msg) > 120 else msg
+
+
+def aggregate_frame(issues, frame, evidence_sets, max_logs=MAX_LOGS_PER_ISSUE):
+    """
+    Gabungkan hasil classify_chunk ke dict issues (per diagnosis) dengan
+    operasi group-by: count, set router, last_seen, evidence dan sample log
+    (maksimal max_logs per diagnosis, urut kemunculan).
+    Return jumlah baris yang terdiagnosis.
+    """
+    diagnosed = frame[frame["diagnosis"].notna()]
+    if diagnosed.empty:
+        return 0
+
+    symptoms = {}
+    for diag, group in diagnosed.groupby("diagnosis", sort=False):
+        if diag not in issues:
+            issues[diag] = new_issue(group["priority"].iat[0], group["time"].iat[0])
+        issue = issues[diag]
+        issue["count"] += len(group)
+        issue["routers"].update(group["router"].unique())
+        issue["last_seen"] = group["time"].iat[-1]
+        evidence_ids = group["evidence_id"].unique()
+        for eid in evidence_ids:
+            issue["evidence"].update(evidence_sets[eid])
+
+        room = max_logs - len(issue["logs"])
+        if room <= 0:
+            continue
+        head = group.iloc[:room]
+        for eid in head["evidence_id"].unique():
+            if eid not in symptoms:
+                symptoms[eid] = ", ".join(sorted(str(e) for e in evidence_sets[eid]))
+        issue["logs"].extend(
+            {
+                "Time": t,
+                "Device": dev,
+                "Diagnosis": diag,
+                "Priority": prio,
+                "Symptoms (Antecedents)": symptoms[eid],
+                "Confidence": _conf_display(conf),
+                "Trigger Message": _trigger_message(msg),
+            }
+            for t, dev, prio, eid, conf, msg in zip(
+                head["time"], head["router"], head["priority"],
+                head["evidence_id"], head["confidence"], head["message"],
+            )
+        )
+    return len(diagnosed)
+
+
+def aggregate_chunk(chunk_df, diagnoser, issues, max_logs=MAX_LOGS_PER_ISSUE, timer=None):
+    """Klasifikasi + agregasi satu chunk tanpa loop per baris (iterrows)"""
+    frame, evidence_sets = classify_chunk(chunk_df, diagnoser, timer)
+    if timer is None:
+        return aggregate_frame(issues, frame, evidence_sets, max_logs)
+    with timer.stage("aggregate"):
+        return aggregate_frame(issues, frame, evidence_sets, max_logs)
+
+
+def merge_issues(issues, partial, max_logs=MAX_LOGS_PER_ISSUE):
+    """
+    Gabungkan agregat parsial satu chunk ke issues. Partial harus digabung
+    sesuai urutan chunk agar hasilnya sama dengan agregasi berurutan
+    (priority dari kemunculan pertama, last_seen dari chunk terakhir).
+    """
+    for diag, part in partial.items():
+        if diag not in issues:
+            issues[diag] = new_issue(part["priority"], part["last_seen"])
+        issue = issues[diag]
+        issue["count"] += part["count"]
+        issue["routers"].update(part["routers"])
+        issue["last_seen"] = part["last_seen"]
+        issue["evidence"].update(part["evidence"])
+        room = max_logs - len(issue["logs"])
+        if room > 0:
+            issue["logs"].extend(part["logs"][:room])
+    return issues
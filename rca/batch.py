@@ -0,0 +1,90 @@
+"""
+Batch matcher offline untuk evaluasi rule (evaluate_rules.py, grid search).
+
+Transaksi uji di-encode SEKALI menjadi matriks CSR token ID (baris x token).
+Setiap rule set kemudian hanya perlu diubah menjadi matriks token x rule;
+rule terbaik per baris = rank terkecil dengan jumlah token cocok == ukuran
+antecedent (kernel yang sama dengan CompiledRuleEngine.match_encoded).
+
+Token antecedent yang tidak pernah muncul di transaksi tidak perlu masuk
+vocab: kolomnya dibuang dari matriks tetapi ukuran antecedent tetap dihitung
+penuh, sehingga rule tersebut tidak pernah cocok.
+"""
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .engine import best_ranks_csr
+
+
+def rank_rules(confidence, lift) -> np.ndarray:
+    """Urutan rule (rank -> idx): confidence desc, lift desc, tie -> urutan asli"""
+    confidence = np.asarray(confidence, dtype=np.float64)
+    lift = np.asarray(lift, dtype=np.float64)
+    return np.lexsort((np.arange(len(confidence)), -lift, -confidence))
+
+
+class TransactionMatrix:
+    """
+    Transaksi (list/set token per baris) dalam format CSR token unik per baris.
+    Transaksi identik (umum di log: pesan yang sama berulang) hanya di-encode
+    dan dicocokkan sekali; inverse memetakan baris asli -> baris unik.
+    Vocab dibangun dari transaksi saja (pd.factorize, tanpa loop per token).
+    """
+
+    max_partial_counts = 4_000_000
+
+    def __init__(self, transactions):
+        row_sets = pd.Series([frozenset(t) for t in transactions], dtype=object)
+        inverse, unique_sets = pd.factorize(row_sets, sort=False)
+        self.inverse = inverse.astype(np.int64)
+
+        lengths = np.fromiter((len(t) for t in unique_sets), dtype=np.int64, count=len(unique_sets))
+        flat = pd.Series(list(chain.from_iterable(unique_sets)), dtype=object)
+        codes, uniques = pd.factorize(flat, sort=False)
+        self.tokens = pd.Index(uniques)
+        self.indices = codes.astype(np.int32)
+        self.indptr = np.zeros(len(unique_sets) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+
+    def __len__(self):
+        return len(self.inverse)
+
+    @property
+    def n_unique(self):
+        return len(self.indptr) - 1
+
+    def rule_matrix(self, antecedents, order):
+        """
+        Antecedent (iterable set token, urutan idx) -> (matriks token x rank,
+        ukuran antecedent per rank). Antecedent kosong tidak punya entri di
+        matriks sehingga tidak pernah cocok (sama dengan CompiledRuleEngine).
+        """
+        antecedents = [list(a) for a in antecedents]
+        sizes = np.fromiter((len(a) for a in antecedents), dtype=np.int64, count=len(antecedents))
+        token_ids = self.tokens.get_indexer(list(chain.from_iterable(antecedents)))
+        rank_of = np.empty(len(order), dtype=np.int64)
+        rank_of[order] = np.arange(len(order))
+        ranks = np.repeat(rank_of, sizes)
+        known = token_ids >= 0
+        matrix = sparse.csr_matrix(
+            (np.ones(int(known.sum()), dtype=np.int32), (token_ids[known], ranks[known])),
+            shape=(len(self.tokens), len(order)),
+        )
+        return matrix, sizes[order]
+
+    def best_rules(self, antecedents, confidence, lift) -> np.ndarray:
+        """
+        Rule terbaik per baris (idx posisi rule di input), -1 jika tidak ada
+        rule yang antecedent-nya subset dari transaksi baris tersebut.
+        """
+        order = rank_rules(confidence, lift)
+        matrix, lengths = self.rule_matrix(antecedents, order)
+        best_rank = best_ranks_csr(self.indptr, self.indices, matrix, lengths, self.max_partial_counts)
+        best = np.full(self.n_unique, -1, dtype=np.int64)
+        matched = best_rank < len(order)
+        best[matched] = order[best_rank[matched]]
+        return best[self.inverse]
@@ -0,0 +1,106 @@
+import re
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+_DIGIT_RUN = re.compile(r"[0-9]+")
+# Penanda angka yang di-mask (tidak pernah muncul di log CSV)
+MASK = "\x00"
+
+
+class LRUCache:
+    """LRU cache berukuran tetap dengan counter hit/miss/eviction."""
+
+    def __init__(self, maxsize=50_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        """Kosongkan cache (dipanggil saat rule set di-reload)"""
+        self._data.clear()
+        self.invalidations += 1
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class MessageMasker:
+    """
+    Membuat cache key dari pesan log dengan me-mask angka yang volatil
+    (oktet IP, byte MAC, port, counter, ID) menjadi satu penanda.
+
+    Mask dibuat aman: angka yang bisa mempengaruhi diagnosis tidak di-mask,
+    yaitu angka yang ada di token antecedent rules (mis. '3600', '172') dan
+    angka di literal override (mis. '8.8.8.8 rto', 'ether1'). Untuk literal
+    yang diawali/diakhiri angka, angka hanya dipertahankan jika konteks
+    literalnya ikut cocok, sehingga dua pesan dengan key sama pasti
+    menghasilkan token rules & hasil override yang sama.
+    """
+
+    def __init__(self, tokens: Iterable[str] = (), literals: Iterable[str] = ()):
+        protected = set()
+        guards = []  # negative lookahead di awal deretan angka
+        for token in tokens:
+            protected.update(_DIGIT_RUN.findall(token))
+        for literal in literals:
+            for m in _DIGIT_RUN.finditer(literal):
+                digits = m.group()
+                protected.add(digits)
+                if m.start() == 0 and m.end() == len(literal):
+                    # Literal seluruhnya angka: boleh muncul di mana saja dalam deretan
+                    guards.append(f"[0-9]*{digits}")
+                elif m.start() == 0:
+                    # Angka di awal literal: deretan berakhir dengan angka tsb + sisa literal
+                    guards.append(f"[0-9]*{digits}(?={re.escape(literal[m.end():])})")
+                elif m.end() == len(literal):
+                    # Angka di akhir literal: awalan literal + deretan diawali angka tsb
+                    guards.append(f"(?<={re.escape(literal[:m.start()])}){digits}")
+        if protected:
+            values = "|".join(sorted(protected, key=len, reverse=True))
+            guards.append(f"(?:{values})(?![0-9])")
+        self.protected = protected
+        guard = "".join(f"(?!{g})" for g in guards)
+        # Satu regex: deretan angka maksimal yang tidak dilindungi -> MASK
+        self.pattern = re.compile(f"(?<![0-9])(?=[0-9]){guard}[0-9]+")
+
+    def mask(self, text: str) -> Optional[str]:
+        """Return key pesan (lowercase, angka volatil di-mask) atau None jika tidak bisa di-cache."""
+        if not isinstance(text, str) or MASK in text:
+            return None
+        return self.pattern.sub(MASK, text.lower())
@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import FrozenSet, List, NamedTuple, Optional
+
+from .cache import LRUCache, MessageMasker
+from .overrides import OVERRIDE_TABLE, OverrideMatcher
+from .tokenizer import DEFAULT_TOKENIZER
+
+# Ambang prioritas berdasarkan lift rule
+FATAL_LIFT = 6.0
+CRITICAL_LIFT = 3.0
+
+
+class Diagnosis(NamedTuple):
+    diagnosis: Optional[str]
+    priority: str
+    evidence: FrozenSet[str]
+    confidence: Optional[float]
+
+
+NO_DIAGNOSIS = Diagnosis(None, "NORMAL", frozenset(), None)
+
+def rule_diagnosis(best_rule) -> Diagnosis:
+    """Diagnosis dari rule FP-Growth terbaik (prioritas dari lift)"""
+    if best_rule is None:
+        return NO_DIAGNOSIS
+    lift_val = best_rule.get("lift", 0)
+    prio = (
+        "FATAL"
+        if lift_val >= FATAL_LIFT
+        else "CRITICAL" if lift_val >= CRITICAL_LIFT else "WARNING"
+    )
+    return Diagnosis(
+        best_rule["final_diagnosis"],
+        prio,
+        frozenset(best_rule["antecedents"]),
+        best_rule.get("confidence", None),
+    )
+
+
+_DEFAULT_OVERRIDES = OverrideMatcher()
+
+
+def override_diagnosis(entry) -> Diagnosis:
+    return Diagnosis(
+        entry["diagnosis"], entry["priority"], frozenset(entry["evidence"]), entry["confidence"]
+    )
+
+
+def apply_overrides(msg_lower, device_flags, current: Diagnosis, overrides=_DEFAULT_OVERRIDES) -> Diagnosis:
+    """HARDCODE OVERRIDE SESUAI PERMINTAAN SKENARIO (lihat rca.overrides.OVERRIDE_TABLE)"""
+    entry = overrides.match(msg_lower, device_flags)
+    if entry is None:
+        return current
+    return override_diagnosis(entry)
+
+
+class Diagnoser:
+    """
+    Pipeline pesan -> diagnosis (tokenizer + rule engine + override) dengan
+    LRU cache di depannya. Key cache = pesan setelah angka volatil di-mask
+    (lihat MessageMasker) + flag literal device (mis. router edge), sehingga pesan berulang
+    (OSPF state change, firewall drop, link down) cukup satu lookup hash.
+    Cache otomatis dikosongkan saat rule engine diganti (reload).
+    """
+
+    def __init__(self, engine, tokenizer=DEFAULT_TOKENIZER, cache_size=50_000,
+                 override_table=OVERRIDE_TABLE):
+        self.tokenizer = tokenizer
+        self.overrides = OverrideMatcher(override_table)
+        self.cache = LRUCache(cache_size)
+        self.engine = None
+        self.masker = None
+        # Dipakai bersama oleh banyak sesi Streamlit (thread berbeda)
+        self._lock = threading.Lock()
+        self.reload(engine)
+
+    def reload(self, engine):
+        """Ganti rule engine dan invalidasi cache"""
+        with self._lock:
+            self.engine = engine
+            self.masker = MessageMasker(engine.vocab.tokens, self.overrides.message_literals)
+            self.cache.invalidate()
+
+    def _compute(self, messages, device_flags, timer=None) -> List[Diagnosis]:
+        clock = time.perf_counter
+        t0 = clock()
+        token_rows = self.tokenizer.tokenize_batch(messages)
+        t1 = clock()
+        best_rules = self.engine.match_many(token_rows)
+        t2 = clock()
+        overrides = self.overrides
+        results = [
+            apply_overrides(msg.lower(), dev, rule_diagnosis(rule), overrides)
+            for msg, dev, rule in zip(messages, device_flags, best_rules)
+        ]
+        if timer is not None:
+            timer.add("tokenize", t1 - t0)
+            timer.add("match", t2 - t1)
+            timer.add("override", clock() - t2)
+        return results
+
+    def diagnose_batch(self, messages, devices=None, timer=None) -> List[Diagnosis]:
+        """
+        Diagnosis untuk satu batch pesan (devices = source_router per pesan).
+        timer (rca.profiling.StageTimer, opsional) menerima waktu tahap cache,
+        tokenize, match, override dan counter rows / cache_hits / cache_misses.
+        """
+        with self._lock:
+            return self._diagnose_batch(messages, devices, timer)
+
+    def _diagnose_batch(self, messages, devices, timer=None):
+        t0 = time.perf_counter()
+        messages = [m if isinstance(m, str) else str(m) for m in messages]
+        if devices is None:
+            devices = [""] * len(messages)
+        device_flags = [self.overrides.device_flags(d) for d in devices]
+        if timer is not None:
+            timer.count("rows", len(messages))
+        if self.cache.maxsize <= 0:
+            return self._compute(messages, device_flags, timer)  # cache dimatikan
+
+        results: List[Optional[Diagnosis]] = [None] * len(messages)
+        pending = {}  # key -> posisi pesan dengan key yang sama di batch ini
+        miss_pos = []
+        cache = self.cache
+        for i, (msg, dev) in enumerate(zip(messages, device_flags)):
+            masked = self.masker.mask(msg)
+            if masked is None:
+                miss_pos.append(i)
+                continue
+            key = (masked, dev)
+            hit = cache.get(key)
+            if hit is not None:
+                results[i] = hit
+            elif key in pending:
+                pending[key].append(i)
+                cache.hits += 1  # dilayani oleh hasil pesan pertama di batch
+                cache.misses -= 1
+            else:
+                pending[key] = [i]
+                miss_pos.append(i)
+
+        if timer is not None:
+            timer.add("cache", time.perf_counter() - t0)
+            timer.count("cache_hits", len(messages) - len(miss_pos))
+            timer.count("cache_misses", len(miss_pos))
+        if miss_pos:
+            computed = self._compute(
+                [messages[i] for i in miss_pos], [device_flags[i] for i in miss_pos], timer
+            )
+            t0 = time.perf_counter()
+            for i, diag in zip(miss_pos, computed):
+                results[i] = diag
+            for key, positions in pending.items():
+                diag = results[positions[0]]
+                cache.put(key, diag)
+                for i in positions[1:]:
+                    results[i] = diag
+            if timer is not None:
+                timer.add("cache", time.perf_counter() - t0)
+        return results  # type: ignore
+
+    def diagnose(self, message, device="") -> Diagnosis:
+        return self.diagnose_batch([message], [device])[0]
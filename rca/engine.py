@@ -0,0 +1,316 @@
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Any, DefaultDict, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from .tokenizer import Vocabulary
+
+
+# ==== OPTIMIZATION: RuleEngine Class for O(1) matching ====
+class RuleEngine:
+    def __init__(self, rules_df):
+        self.rules: List[Dict[str, Any]] = []
+        # Mapping token -> list of rule indices
+        self.token_map: DefaultDict[str, List[int]] = defaultdict(list)
+
+        # Pre-process rules into list of dicts and build index
+        for idx, rule in rules_df.iterrows():
+            antecedents = rule["antecedents"]
+
+            # [FILTER WEAK RULES] Removed completely for AI-Only rules strategy
+            # Rely strictly on the FP-Growth support & confidence metrics
+
+
+            rule_obj = {
+                "antecedents": antecedents,
+                "confidence": float(rule.get("confidence", 0) or 0),
+                "lift": float(rule.get("lift", 0) or 0),
+                "final_diagnosis": rule["final_diagnosis"],
+                "idx": len(self.rules)
+            }
+            self.rules.append(rule_obj)
+
+            for token in antecedents:
+                self.token_map[token].append(int(rule_obj["idx"])) # type: ignore
+
+    def match(self, tokens):
+        """Find best matching rule for a set of tokens using inverted index"""
+        candidate_counts: DefaultDict[int, int] = defaultdict(int) # type: ignore
+        relevant_rules_indices = set()
+
+        # 1. Gather candidates
+        for token in tokens:
+            if token in self.token_map:
+                for rule_idx in self.token_map[str(token)]: # type: ignore
+                    candidate_counts[rule_idx] += 1 # type: ignore
+                    relevant_rules_indices.add(rule_idx)
+
+        # 2. Check candidates
+        best_rule = None
+        best_conf = -1.0
+
+        for rule_idx in relevant_rules_indices:
+            rule = self.rules[rule_idx]
+            # Optimization: Only check if ALL antecedents are present
+            if candidate_counts[rule_idx] == len(rule["antecedents"]): # type: ignore
+                 # Strict subset check passed (assuming unique tokens in antecedents)
+                 conf_val = rule["confidence"]
+
+                 # Prefer rule with higher confidence, tie-breaker: higher lift
+                 if conf_val > best_conf or (conf_val == best_conf and rule["lift"] > (best_rule["lift"] if best_rule else 0)): # type: ignore
+                     best_rule = rule
+                     best_conf = conf_val
+
+        return best_rule
+
+    def match_many(self, token_sets):
+        """Batch API (loop match) agar bisa ditukar dengan CompiledRuleEngine"""
+        return [self.match(tokens) for tokens in token_sets]
+
+
+# ==== OPTIMIZATION: Compiled engine (token ID + sparse matrix matching) ====
+def best_ranks_csr(indptr, indices, antecedent_matrix, rule_lengths, max_partial_counts=4_000_000):
+    """
+    Kernel batch matching (dipakai CompiledRuleEngine.match_encoded dan
+    rca.batch). Baris = transaksi CSR token ID (token unik per baris),
+    antecedent_matrix = matriks token x rank, rule_lengths = ukuran antecedent
+    per rank. counts = transaksi @ antecedent; rule terpenuhi jika counts ==
+    rule_lengths, lalu diambil rank terkecil per baris.
+    Return array rank terbaik per baris (n_rules jika tidak ada yang cocok).
+
+    Batch dipecah per blok baris agar jumlah hitungan parsial (baris x rule
+    yang berbagi token) tidak melebihi max_partial_counts; pada rule set
+    100k+ satu pesan bisa menyentuh puluhan ribu rule.
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int32)
+    n_rows = len(indptr) - 1
+    n_tokens, n_rules = antecedent_matrix.shape
+    best_rank = np.full(n_rows, n_rules, dtype=np.int64)
+    if n_rows == 0 or n_rules == 0 or len(indices) == 0:
+        return best_rank
+
+    # Perkiraan hitungan parsial per baris = total panjang postings token-tokennya
+    postings_len = np.diff(antecedent_matrix.indptr)
+    token_work = np.concatenate(([0], np.cumsum(postings_len[indices])))
+    row_work = token_work[indptr]
+    start = 0
+    while start < n_rows:
+        end = int(np.searchsorted(row_work, row_work[start] + max_partial_counts, side="right")) - 1
+        end = min(max(end, start + 1), n_rows)
+        lo, hi = indptr[start], indptr[end]
+        block = sparse.csr_matrix(
+            (np.ones(hi - lo, dtype=np.int32), indices[lo:hi], indptr[start:end + 1] - lo),
+            shape=(end - start, n_tokens),
+        )
+        # counts[i, rank] = jumlah token antecedent rule yang ada di baris i
+        counts = (block @ antecedent_matrix).tocsr()
+        # Rank rule yang tidak penuh diganti n_rules, lalu minimum per baris
+        ranks = np.where(counts.data == rule_lengths[counts.indices], counts.indices, n_rules)
+        nonempty = np.diff(counts.indptr) > 0
+        if len(ranks):
+            best_rank[start:end][nonempty] = np.minimum.reduceat(ranks, counts.indptr[:-1][nonempty])
+        start = end
+    return best_rank
+
+
+class CompiledRuleEngine:
+    """
+    Varian RuleEngine yang dikompilasi saat rules dimuat:
+    - semua token antecedent di-intern ke ID integer (Vocabulary),
+    - rules diurutkan sekali berdasarkan ranking (confidence desc, lift desc,
+      lalu urutan file) sehingga rule terbaik = rank terkecil yang terpenuhi,
+    - antecedent disimpan sebagai matriks sparse token x rule, sehingga satu
+      batch pesan dicocokkan dengan satu perkalian matriks lalu dibandingkan
+      dengan panjang antecedent yang sudah dihitung (match_many_matrix),
+    - match / match_many memakai postings anchor terurut rank (best-first)
+      dan berhenti begitu rule terbaik pasti, tanpa menghitung semua kandidat.
+    Hasil sama dengan RuleEngine.match; jika ada rule dengan confidence & lift
+    persis sama, rule yang muncul lebih dulu di file yang dipilih.
+    """
+
+    # Metadata index biner jika engine dimuat lewat rca.rule_index
+    index_meta = None
+    # Batas hitungan parsial per blok match_encoded (~12 byte/entri -> ~50 MB)
+    max_partial_counts = 4_000_000
+    # Index anchor untuk match best-first (lazy, lihat _best_first_index)
+    _anchor_index = None
+
+    def __init__(self, rules_df):
+        self.rules: List[Dict[str, Any]] = []
+        records = rules_df.to_dict("records") if hasattr(rules_df, "to_dict") else list(rules_df)
+        for rule in records:
+            self.rules.append({
+                "antecedents": rule["antecedents"],
+                "confidence": float(rule.get("confidence", 0) or 0),
+                "lift": float(rule.get("lift", 0) or 0),
+                "final_diagnosis": rule["final_diagnosis"],
+                "consequents": rule.get("consequents"),
+                "idx": len(self.rules),
+            })
+
+        all_tokens = set()
+        for rule in self.rules:
+            all_tokens.update(rule["antecedents"])
+        self.vocab = Vocabulary(sorted(all_tokens))
+
+        ids = self.vocab.ids
+        rule_indptr = np.zeros(len(self.rules) + 1, dtype=np.int64)
+        rule_token_ids: List[int] = []
+        for i, rule in enumerate(self.rules):
+            rule_token_ids.extend(ids[token] for token in rule["antecedents"])
+            rule_indptr[i + 1] = len(rule_token_ids)
+        self._build_index(rule_indptr, np.asarray(rule_token_ids, dtype=np.int32))
+
+    @classmethod
+    def from_arrays(cls, tokens, rule_indptr, rule_token_ids, confidence, lift, diagnoses):
+        """
+        Bangun engine langsung dari array hasil kompilasi (lihat rca.rule_index):
+        tokens = vocabulary terurut, antecedent rule i = tokens[rule_token_ids[
+        rule_indptr[i]:rule_indptr[i + 1]]], diagnoses = final_diagnosis per rule.
+        """
+        engine = cls.__new__(cls)
+        tokens = [str(t) for t in tokens]
+        engine.vocab = Vocabulary(tokens)
+        rule_indptr = np.asarray(rule_indptr, dtype=np.int64)
+        rule_token_ids = np.asarray(rule_token_ids, dtype=np.int32)
+        bounds = rule_indptr.tolist()
+        flat = [tokens[t] for t in rule_token_ids.tolist()]
+        engine.rules = [
+            {
+                "antecedents": set(flat[start:end]),
+                "confidence": conf,
+                "lift": lift_val,
+                "final_diagnosis": diag,
+                "consequents": None,
+                "idx": i,
+            }
+            for i, (start, end, conf, lift_val, diag) in enumerate(
+                zip(bounds[:-1], bounds[1:], np.asarray(confidence, dtype=np.float64).tolist(),
+                    np.asarray(lift, dtype=np.float64).tolist(), list(diagnoses))
+            )
+        ]
+        engine._build_index(rule_indptr, rule_token_ids)
+        return engine
+
+    def _build_index(self, rule_indptr, rule_token_ids):
+        """Ranking rule, matriks antecedent dan postings dari antecedent format CSR (urutan file)"""
+        n_rules = len(self.rules)
+        conf = np.array([r["confidence"] for r in self.rules], dtype=np.float64)
+        lift = np.array([r["lift"] for r in self.rules], dtype=np.float64)
+        # rank -> rule idx (lexsort: kunci terakhir = kunci utama)
+        self.order = np.lexsort((np.arange(n_rules), -lift, -conf)).astype(np.int64)
+        self.rank_of = np.empty(n_rules, dtype=np.int64)
+        self.rank_of[self.order] = np.arange(n_rules)
+
+        self.rule_lengths = np.diff(rule_indptr)[self.order].astype(np.int32)
+        rows = rule_token_ids
+        cols = self.rank_of[np.repeat(np.arange(n_rules), np.diff(rule_indptr))]
+        # Matriks antecedent: token x rule (kolom = rank)
+        self.antecedent_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.vocab), n_rules),
+        )
+        self.antecedent_matrix.sort_indices()
+        # Postings per token (rank terurut) untuk jalur satu pesan
+        indptr, indices = self.antecedent_matrix.indptr, self.antecedent_matrix.indices.tolist()
+        self.postings: List[List[int]] = [
+            indices[indptr[t]:indptr[t + 1]] for t in range(len(self.vocab))
+        ]
+        self._lengths_list = self.rule_lengths.tolist()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def encode(self, token_sets):
+        """Ubah list set token menjadi (indptr, indices) token ID (token asing dibuang)."""
+        ids = self.vocab.ids
+        indptr = np.zeros(len(token_sets) + 1, dtype=np.int64)
+        flat: List[int] = []
+        for i, tokens in enumerate(token_sets):
+            flat.extend(ids[t] for t in set(tokens) if t in ids)
+            indptr[i + 1] = len(flat)
+        return indptr, np.asarray(flat, dtype=np.int32)
+
+    def match_encoded(self, indptr, indices) -> np.ndarray:
+        """
+        Cocokkan batch pesan dalam format CSR token ID (token unik per pesan).
+        Return array idx rule terbaik per pesan, -1 jika tidak ada yang cocok.
+        """
+        best_rank = best_ranks_csr(
+            indptr, indices, self.antecedent_matrix, self.rule_lengths, self.max_partial_counts
+        )
+        best = np.full(len(best_rank), -1, dtype=np.int64)
+        matched = best_rank < len(self.rules)
+        best[matched] = self.order[best_rank[matched]]
+        return best
+
+    def match_many(self, token_sets) -> List[Optional[Dict[str, Any]]]:
+        """Cocokkan banyak set token (best-first per pesan); return rule dict atau None per pesan."""
+        match = self.match
+        return [match(tokens) for tokens in token_sets]
+
+    def match_many_matrix(self, token_sets) -> List[Optional[Dict[str, Any]]]:
+        """Jalur batch exhaustive lewat perkalian matriks sparse (lihat match_encoded)."""
+        best = self.match_encoded(*self.encode(token_sets))
+        rules = self.rules
+        return [rules[i] if i >= 0 else None for i in best.tolist()]
+
+    def match_exhaustive(self, tokens):
+        """Referensi: hitung semua postings token pesan lalu ambil rank terkecil yang penuh"""
+        ids = self.vocab.ids
+        postings = self.postings
+        counts = Counter(chain.from_iterable(postings[ids[t]] for t in set(tokens) if t in ids))
+        lengths = self._lengths_list
+        best_rank = min((r for r, c in counts.items() if c == lengths[r]), default=None)
+        if best_rank is None:
+            return None
+        return self.rules[int(self.order[best_rank])]
+
+    def _best_first_index(self):
+        """
+        Index best-first (dibangun saat match pertama kali dipakai):
+        - anchor[token] = rank rule (terurut naik) yang token paling langkanya
+          = token tsb; setiap rule hanya ada di satu list,
+        - rank_tokens[rank] = frozenset token ID antecedent rule.
+        Rule yang cocok pasti memiliki anchor di pesan, jadi kandidat cukup
+        diambil dari list anchor token pesan.
+        """
+        index = self._anchor_index
+        if index is None:
+            matrix = self.antecedent_matrix.tocsc()
+            postings_len = np.diff(self.antecedent_matrix.indptr).tolist()
+            indptr, indices = matrix.indptr.tolist(), matrix.indices.tolist()
+            anchor: List[List[int]] = [[] for _ in range(len(self.vocab))]
+            rank_tokens: List[frozenset] = []
+            for rank in range(len(self.rules)):
+                tokens = indices[indptr[rank]:indptr[rank + 1]]
+                rank_tokens.append(frozenset(tokens))
+                if tokens:
+                    anchor[min(tokens, key=lambda t: (postings_len[t], t))].append(rank)
+            index = self._anchor_index = (anchor, rank_tokens)
+        return index
+
+    def match(self, tokens):
+        """
+        Find best matching rule for a set of tokens (jalur satu pesan, best-first).
+        List anchor terurut rank, jadi tiap list berhenti di kandidat pertama
+        yang penuh atau begitu rank-nya tidak mungkin mengalahkan rank terbaik
+        sementara; hasil = match_exhaustive.
+        """
+        anchor, rank_tokens = self._best_first_index()
+        ids = self.vocab.ids
+        message = {ids[t] for t in tokens if t in ids}
+        best = len(rank_tokens)
+        for token in message:
+            for rank in anchor[token]:
+                if rank >= best:
+                    break
+                if rank_tokens[rank] <= message:
+                    best = rank
+                    break
+        if best == len(rank_tokens):
+            return None
+        return self.rules[int(self.order[best])]
@@ -0,0 +1,79 @@
+"""
+API inferensi bersama: satu tokenizer + satu compiled matcher.
+Dipakai dashboard, skrip analisis/debug, evaluasi dan benchmark, sehingga
+optimasi di rca.tokenizer / rca.engine langsung berlaku di semua entry point.
+"""
+
+from typing import Callable, Iterable, Optional, Union
+
+import pandas as pd
+
+from .engine import CompiledRuleEngine
+from .rule_index import load_engine
+from .rules import ACTIVE_RULES_PATH, load_rules_df
+from .tokenizer import DEFAULT_TOKENIZER, STOPWORDS, Tokenizer
+
+
+class Matcher:
+    """
+    Tokenizer + CompiledRuleEngine di balik satu API:
+    - match_one(message)   -> rule dict terbaik atau None
+    - match_many(messages) -> list rule dict / None (batch, best-first per pesan)
+    - match_tokens(token_sets) untuk input yang sudah ditokenisasi (mis. items dataset mining)
+    """
+
+    def __init__(self, engine, tokenizer: Tokenizer = DEFAULT_TOKENIZER):
+        self.engine = engine
+        self.tokenizer = tokenizer
+
+    def __len__(self):
+        return len(self.engine)
+
+    @property
+    def rules(self):
+        return self.engine.rules
+
+    def tokens(self, message):
+        return self.tokenizer.tokenize(message)
+
+    def match_one(self, message):
+        return self.engine.match(self.tokenizer.tokenize(message))
+
+    def match_many(self, messages):
+        return self.engine.match_many(self.tokenizer.tokenize_batch(messages))
+
+    def match_tokens(self, token_sets):
+        return self.engine.match_many(token_sets)
+
+
+def load_rule_sets(rules_paths, stopwords=STOPWORDS):
+    """Gabungkan beberapa file rules berurutan (mis. AUTO + CURATED)"""
+    frames = [load_rules_df(p, stopwords) for p in rules_paths]
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def load_matcher(
+    rules_paths: Union[str, Iterable[str]] = ACTIVE_RULES_PATH,
+    stopwords=STOPWORDS,
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    tokenizer: Optional[Tokenizer] = None,
+) -> Matcher:
+    """
+    Buat Matcher dari satu atau beberapa file rules.
+    prepare (opsional) menerima rules_df hasil load (antecedents sudah di-parse,
+    final_diagnosis sudah di-map) dan mengembalikan rules_df yang difilter /
+    dikoreksi, mis. membuang rule generik dengan rca.rules.is_generic_rule.
+    Tanpa prepare, satu file dengan stopwords default dimuat lewat index biner.
+    tokenizer (opsional) mengganti tokenizer pesan, mis.
+    Tokenizer.from_mode("mining", unique=True) agar token sama persis dengan
+    token saat rules di-mining (02_data_cleaning).
+    """
+    paths = [rules_paths] if isinstance(rules_paths, str) else list(rules_paths)
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER if stopwords == STOPWORDS else Tokenizer(stopwords)
+    if prepare is None and len(paths) == 1:
+        return Matcher(load_engine(paths[0], stopwords), tokenizer)
+    rules_df = load_rule_sets(paths, stopwords)
+    if prepare is not None:
+        rules_df = prepare(rules_df)
+    return Matcher(CompiledRuleEngine(rules_df), tokenizer)
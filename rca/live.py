@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .aggregation import aggregate_chunk
+from .profiling import StageTimer
+
+LIVE_LOG_COLUMNS = ["fetched_at", "source_router", "log_id", "time", "topics", "message"]
+# Sama dengan MAX_LIVE_LOG_ROWS collector & "FORCE VIEW LIMIT" dashboard
+LIVE_WINDOW = 2000
+
+
+def safe_read_csv(path, retries=5):
+    """Attempt to read CSV with retries for Windows file locking"""
+    for i in range(retries):
+        try:
+            return pd.read_csv(path, on_bad_lines='skip')  # Skip bad lines if partial write
+        except (PermissionError, pd.errors.ParserError):
+            time.sleep(0.1)
+        except pd.errors.EmptyDataError:
+            return None
+        except Exception:
+            return None
+    return None  # Return None to indicate read failure
+
+
+class LiveSnapshot(NamedTuple):
+    """
+    State analisis live yang sudah jadi; jangan diubah oleh pembaca (dipakai bersama).
+    total_rows = jumlah baris yang pernah masuk sejak generation dimulai; selama
+    generation sama, baris baru sejak snapshot sebelumnya = selisih total_rows
+    (selalu berada di ekor live_df). Generation naik jika file di-reset/diganti.
+    timings = StageTimer.as_dict() dari siklus analisis yang menghasilkan snapshot ini.
+    """
+    version: int
+    issues: Dict[str, Dict[str, Any]]
+    live_df: Optional[pd.DataFrame]
+    matched: int
+    total_rows: int
+    generation: int
+    updated_at: float
+    error: Optional[str]
+    timings: Optional[Dict[str, Any]] = None
+
+
+EMPTY_SNAPSHOT = LiveSnapshot(0, {}, None, 0, 0, 0, 0.0, None)
+
+
+class LiveAnalyzer:
+    """
+    Satu worker background per proses untuk live_log.csv.
+    File hanya dibaca & dianalisis ulang saat berubah (mtime/ukuran) atau rule
+    engine diganti, lalu hasilnya dipublikasikan sebagai LiveSnapshot baru.
+    Sesi dashboard cukup membaca snapshot(), sehingga biaya CPU tidak ikut
+    naik dengan jumlah viewer. Worker berhenti polling jika tidak ada sesi
+    yang membaca snapshot selama idle_timeout detik.
+    engine_source (opsional, mis. RuleSetRegistry.engine) dicek setiap poll;
+    jika engine berganti, Diagnoser di-reload dan window dianalisis ulang.
+    profiler (opsional, rca.profiling.Profiler) menerima satu record
+    "live:analysis" per siklus analisis.
+    """
+
+    def __init__(self, path, diagnoser, window=LIVE_WINDOW, poll_interval=1.0, idle_timeout=60.0,
+                 engine_source=None, profiler=None):
+        self.path = path
+        self.diagnoser = diagnoser
+        self.engine_source = engine_source
+        self.profiler = profiler
+        self.window = window
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self._snapshot = EMPTY_SNAPSHOT
+        self._signature = None
+        self._engine = None
+        self._last_row_hash = None
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._last_access = time.monotonic()
+        self._thread = None
+
+    # ---- worker ----
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rca-live-analyzer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_access <= self.idle_timeout:
+                try:
+                    self.poll()
+                except Exception as e:  # worker tidak boleh mati karena satu file rusak
+                    self._publish(self._snapshot.issues, self._snapshot.live_df, self._snapshot.matched, str(e))
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _publish(self, issues, live_df, matched, error=None, total_rows=None, generation=None, timings=None):
+        prev = self._snapshot
+        self._snapshot = LiveSnapshot(
+            prev.version + 1, issues, live_df, matched,
+            prev.total_rows if total_rows is None else total_rows,
+            prev.generation if generation is None else generation,
+            time.time(), error, timings if timings is not None else prev.timings,
+        )
+
+    def _appended_rows(self, live_df):
+        """
+        Jumlah baris baru di ekor live_df dibanding snapshot sebelumnya
+        (collector menulis ulang file sebagai jendela geser), atau None jika
+        baris terakhir sebelumnya tidak ditemukan (file di-reset).
+        """
+        if live_df.empty:
+            self._last_row_hash = None
+            return None
+        hashes = pd.util.hash_pandas_object(live_df, index=False).to_numpy()
+        last, self._last_row_hash = self._last_row_hash, hashes[-1]
+        if last is None:
+            return None
+        pos = np.flatnonzero(hashes == last)
+        return int(len(hashes) - pos[-1] - 1) if pos.size else None
+
+    def poll(self, force=False) -> bool:
+        """Analisis ulang jika file/rule berubah. Return True jika snapshot baru dipublikasikan."""
+        with self._poll_lock:
+            signature = self._file_signature()
+            if self.engine_source is not None:
+                engine = self.engine_source()
+                if self.diagnoser.engine is not engine:
+                    self.diagnoser.reload(engine)
+            engine = self.diagnoser.engine
+            if not force and signature == self._signature and engine is self._engine:
+                return False
+            if signature is None:
+                self._signature, self._engine, self._last_row_hash = None, engine, None
+                self._publish({}, None, 0, f"{self.path} not found", 0, self._snapshot.generation + 1)
+                return True
+
+            timer = StageTimer()
+            with timer.stage("read"):
+                full_df = safe_read_csv(self.path)
+            if full_df is None:
+                # File terkunci collector: pertahankan snapshot lama, coba lagi di poll berikutnya
+                return False
+            live_df = full_df.tail(self.window).reset_index(drop=True)
+            issues = {}
+            matched = aggregate_chunk(live_df, self.diagnoser, issues, timer=timer) if not live_df.empty else 0
+            self._signature, self._engine = signature, engine
+            appended = self._appended_rows(live_df)
+            timings = timer.as_dict()
+            if appended is None:
+                self._publish(issues, live_df, matched, None, len(live_df), self._snapshot.generation + 1, timings)
+            else:
+                self._publish(issues, live_df, matched, None, self._snapshot.total_rows + appended, timings=timings)
+            if self.profiler is not None:
+                self.profiler.record("live:analysis", timer, matched=matched)
+            return True
+
+    # ---- pembaca (sesi dashboard) ----
+    def refresh(self):
+        """Minta worker memeriksa file sekarang (mis. setelah Clear Live Data)"""
+        self._wake.set()
+
+    def snapshot(self) -> LiveSnapshot:
+        self._last_access = time.monotonic()
+        if self._snapshot.version == 0:
+            self.poll()  # sesi pertama: jangan tunggu siklus worker
+        return self._snapshot
@@ -0,0 +1,205 @@
+import re
+from typing import List, Optional
+
+try:
+    import ahocorasick  # type: ignore  # opsional: pip install pyahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# ==========================================
+# HARDCODE OVERRIDE SESUAI PERMINTAAN SKENARIO (tabel deklaratif)
+# ==========================================
+# Dievaluasi berurutan: entri pertama yang cocok menang (sama dengan rantai
+# if/elif lama). Setiap entri cocok jika SALAH SATU klausa di "any_of"
+# terpenuhi, dan klausa terpenuhi jika SEMUA literalnya ada di pesan
+# (lowercase). Literal berawalan "device:" dicek ke nama source_router.
+# Skenario baru cukup ditambahkan sebagai entri baru di tabel ini.
+OVERRIDE_TABLE = [
+    # 1. UPSTREAM FAILURE
+    {
+        "name": "upstream_failure",
+        "diagnosis": "UPSTREAM_FAILURE",
+        "priority": "FATAL",
+        "evidence": {"internet", "lost", "uplink_down"},
+        "confidence": 0.99,
+        "any_of": [
+            ["internet connection lost"],
+            ["8.8.8.8 rto"],
+            ["ether1", "link down", "device:edge"],
+        ],
+    },
+    # 2. BROADCAST STORM & L2 LOOP -> Diubah menjadi DDoS
+    {
+        "name": "l2_loop",
+        "diagnosis": "DDoS",
+        "priority": "FATAL",
+        "evidence": {"looped", "packet", "broadcast", "ping_flood"},
+        "confidence": 0.99,
+        "any_of": [
+            ["looped packet"],
+            ["broadcast_storm"],
+            ["mac flapping"],
+            ["host moved"],
+            ["255.255.255.255"],
+        ],
+    },
+    # ospf jatuh karena broadcast storm
+    {
+        "name": "ospf_broadcast_init",
+        "diagnosis": "DDoS",
+        "priority": "FATAL",
+        "evidence": {"ospf", "broadcast_storm", "init"},
+        "confidence": 0.90,
+        "any_of": [["ospf", "broadcast", "state change to init"]],
+    },
+    # 3. DDoS ATTACKS (5 Skenario: ICMP, UDP BW, UDP PPS, TCP Conn, Port Scan)
+    {
+        "name": "ddos_flood",
+        "diagnosis": "DDoS",
+        "priority": "CRITICAL",
+        "evidence": {"ddos", "flood"},
+        "confidence": 0.95,
+        "any_of": [["ddos_detected"], ["flood"]],
+    },
+    {
+        "name": "bandwidth_test",
+        "diagnosis": "DDoS",
+        "priority": "CRITICAL",
+        "evidence": {"bandwidth_test", "exhaustion"},
+        "confidence": 0.95,
+        "any_of": [["bandwidth-test"], ["bandwidth test"]],
+    },
+    {
+        "name": "port_scan",
+        "diagnosis": "DDoS",
+        "priority": "CRITICAL",
+        "evidence": {"port_scan", "aggressive"},
+        "confidence": 0.95,
+        "any_of": [["port scan"], ["port scan detected"], ["scan", "drop"]],
+    },
+    {
+        "name": "icmp_flood",
+        "diagnosis": "DDoS",
+        "priority": "CRITICAL",
+        "evidence": {"icmp", "ping_flood"},
+        "confidence": 0.95,
+        "any_of": [["icmp flood"], ["icmp", "limit"]],
+    },
+    {
+        "name": "tcp_udp_flood",
+        "diagnosis": "DDoS",
+        "priority": "CRITICAL",
+        "evidence": {"tcp_udp", "flood"},
+        "confidence": 0.95,
+        "any_of": [["udp flood"], ["tcp flood"]],
+    },
+]
+
+DEVICE_PREFIX = "device:"
+
+
+class OverrideMatcher:
+    """
+    Kompilasi OVERRIDE_TABLE menjadi satu automaton multi-pattern
+    (Aho-Corasick jika pyahocorasick terpasang, selain itu satu regex gabungan).
+    Setiap pesan di-scan sekali: semua literal yang muncul dikumpulkan sebagai
+    bitmask, lalu klausa (bitmask literal yang wajib ada) dicek berurutan
+    sesuai prioritas tabel.
+    """
+
+    def __init__(self, table=OVERRIDE_TABLE, use_ahocorasick=HAS_AHOCORASICK):
+        self.entries = []
+        message_literals: List[str] = []
+        device_literals: List[str] = []
+        for entry in table:
+            for clause in entry["any_of"]:
+                for literal in clause:
+                    if literal.startswith(DEVICE_PREFIX):
+                        literal = literal[len(DEVICE_PREFIX):]
+                        if literal not in device_literals:
+                            device_literals.append(literal)
+                    elif literal not in message_literals:
+                        message_literals.append(literal)
+        self.message_literals = message_literals
+        self.device_literals = device_literals
+        msg_bit = {lit: 1 << i for i, lit in enumerate(message_literals)}
+        dev_bit = {lit: 1 << i for i, lit in enumerate(device_literals)}
+
+        # Literal yang merupakan substring literal lain ikut ditandai saat
+        # literal yang lebih panjang ditemukan (mis. "port scan" -> "scan")
+        self._closure = {}
+        for lit in message_literals:
+            mask = 0
+            for other in message_literals:
+                if other in lit:
+                    mask |= msg_bit[other]
+            self._closure[lit] = mask
+
+        for entry in table:
+            clauses = []
+            for clause in entry["any_of"]:
+                msg_mask = dev_mask = 0
+                for literal in clause:
+                    if literal.startswith(DEVICE_PREFIX):
+                        dev_mask |= dev_bit[literal[len(DEVICE_PREFIX):]]
+                    else:
+                        msg_mask |= msg_bit[literal]
+                clauses.append((msg_mask, dev_mask))
+            self.entries.append((entry, clauses))
+        # Jika semua klausa butuh literal pesan, pesan tanpa literal langsung lolos
+        self._needs_message = all(m for _, clauses in self.entries for m, _ in clauses)
+
+        # Lookahead agar literal yang saling overlap tetap terdeteksi; literal
+        # terpanjang dicoba lebih dulu di setiap posisi (literal di dalamnya
+        # ditangani closure di atas). Charset huruf awal di depan membuat
+        # posisi yang tidak mungkin cocok langsung dilewati.
+        alternation = "|".join(
+            re.escape(lit) for lit in sorted(message_literals, key=len, reverse=True)
+        )
+        first_chars = "".join(sorted({re.escape(lit[0]) for lit in message_literals}))
+        self.pattern = re.compile(f"(?=[{first_chars}])(?=({alternation}))")
+
+        self.automaton = None
+        if use_ahocorasick:
+            self.automaton = ahocorasick.Automaton()
+            for lit in message_literals:
+                self.automaton.add_word(lit, msg_bit[lit])
+            self.automaton.make_automaton()
+
+    @property
+    def backend(self):
+        return "aho-corasick" if self.automaton is not None else "regex"
+
+    def message_flags(self, msg_lower) -> int:
+        """Bitmask semua literal yang muncul di pesan (satu kali scan)"""
+        flags = 0
+        if self.automaton is not None:
+            for _, bit in self.automaton.iter(msg_lower):
+                flags |= bit
+            return flags
+        closure = self._closure
+        for lit in self.pattern.findall(msg_lower):
+            flags |= closure[lit]
+        return flags
+
+    def device_flags(self, dev) -> int:
+        if not isinstance(dev, str):
+            return 0
+        dev_lower = dev.lower()
+        flags = 0
+        for i, lit in enumerate(self.device_literals):
+            if lit in dev_lower:
+                flags |= 1 << i
+        return flags
+
+    def match(self, msg_lower, device_flags=0) -> Optional[dict]:
+        """Entri override pertama yang cocok, atau None"""
+        flags = self.message_flags(msg_lower)
+        if not flags and self._needs_message:
+            return None
+        for entry, clauses in self.entries:
+            for msg_mask, dev_mask in clauses:
+                if flags & msg_mask == msg_mask and device_flags & dev_mask == dev_mask:
+                    return entry
+        return None
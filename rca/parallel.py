@@ -0,0 +1,104 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from .aggregation import aggregate_chunk
+from .diagnosis import Diagnoser
+from .profiling import StageTimer
+from .rule_index import load_engine
+from .rules import ACTIVE_RULES_PATH
+
+# Diagnoser milik masing-masing proses worker (dibuat sekali oleh initializer)
+_WORKER_DIAGNOSER = None
+
+
+def _init_worker(rules_path):
+    global _WORKER_DIAGNOSER
+    _WORKER_DIAGNOSER = Diagnoser(load_engine(rules_path))
+
+
+def _analyze_chunk(chunk_df, diagnoser=None):
+    """Agregat parsial satu chunk: (jumlah baris, baris terdiagnosis, issues, timings)"""
+    issues = {}
+    timer = StageTimer()
+    matched = aggregate_chunk(chunk_df, diagnoser or _WORKER_DIAGNOSER, issues, timer=timer)
+    return len(chunk_df), matched, issues, timer.as_dict()
+
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+class ChunkPool:
+    """
+    Process pool untuk analisis file log besar per chunk. Chunk diambil dari
+    iterator secara lazy (maksimal max_pending chunk sedang diproses), jadi
+    file tidak pernah dimuat utuh ke memori, dan hasil parsial dikembalikan
+    sesuai urutan chunk untuk digabung dengan merge_issues().
+    Pool dibuat saat pertama dipakai dan bisa dipakai ulang antar analisis.
+    """
+
+    def __init__(self, rules_path=ACTIVE_RULES_PATH, workers=None, max_pending=None):
+        self.rules_path = rules_path
+        self.workers = workers or default_workers()
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.rules_path,)
+            )
+        return self._executor
+
+    def imap(self, chunks, local_diagnoser=None, timer=None):
+        """
+        Yield (rows, matched, partial_issues) per chunk sesuai urutan input.
+        Jika hanya ada satu chunk (atau workers=1) dan local_diagnoser
+        diberikan, chunk diproses langsung di proses ini tanpa overhead IPC.
+        timer (opsional) menerima waktu tahap dari setiap chunk; di mode
+        pool ini jumlah waktu CPU semua worker, bukan waktu dinding.
+        """
+        def unpack(result):
+            rows, matched, issues, timings = result
+            if timer is not None:
+                timer.merge(timings)
+            return rows, matched, issues
+
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        if local_diagnoser is not None and (second is None or self.workers <= 1):
+            for chunk in chain([first], [] if second is None else [second], chunks):
+                yield unpack(_analyze_chunk(chunk, local_diagnoser))
+            return
+
+        pool = self._pool()
+        pending = deque()
+        for chunk in chain([first, second], chunks):
+            pending.append(pool.submit(_analyze_chunk, chunk))
+            if len(pending) >= self.max_pending:
+                yield unpack(pending.popleft().result())
+        while pending:
+            yield unpack(pending.popleft().result())
+
+    def set_rules_path(self, rules_path):
+        """
+        Ganti rule set worker. Pool lama dimatikan tanpa menunggu (chunk yang
+        sedang diproses tetap selesai dengan rules lama), pool baru dibuat
+        saat imap berikutnya.
+        """
+        if rules_path == self.rules_path:
+            return
+        old, self._executor = self._executor, None
+        self.rules_path = rules_path
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Urutan tahap untuk tampilan (tahap lain tetap dicatat, ditaruh di belakang)
+STAGES = ("read", "cache", "tokenize", "match", "override", "aggregate", "merge", "render")
+
+
+class StageTimer:
+    """
+    Akumulator waktu per tahap (detik) + counter (rows, cache_hits, ...) untuk
+    satu unit kerja (satu poll live, satu analisis upload, satu render).
+    Diteruskan lewat argumen `timer=` ke Diagnoser / aggregate_chunk / ChunkPool;
+    timer=None berarti tidak ada pengukuran.
+    """
+
+    __slots__ = ("seconds", "counters")
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def add(self, stage, seconds):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def merge(self, other):
+        """Gabungkan StageTimer lain atau hasil as_dict() (mis. dari proses worker)"""
+        if isinstance(other, StageTimer):
+            other = other.as_dict()
+        for stage, seconds in other.get("seconds", {}).items():
+            self.add(stage, seconds)
+        for name, n in other.get("counters", {}).items():
+            self.count(name, n)
+        return self
+
+    def as_dict(self):
+        return {"seconds": dict(self.seconds), "counters": dict(self.counters)}
+
+
+class Profiler:
+    """
+    Riwayat bergulir record profil (maksimal `history` record terakhir),
+    dipakai bersama oleh worker live & sesi dashboard (thread-safe).
+    Jika log_path diisi, setiap record juga ditambahkan ke file JSON Lines.
+    """
+
+    def __init__(self, history=200, log_path=None):
+        self.log_path = log_path
+        self._records = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record(self, source, timer: StageTimer, **extra) -> Dict[str, Any]:
+        counters = timer.counters
+        lookups = counters.get("cache_hits", 0) + counters.get("cache_misses", 0)
+        entry = {
+            "ts": time.time(),
+            "source": source,
+            "stages_ms": {stage: round(s * 1000, 3) for stage, s in timer.seconds.items()},
+            "total_ms": round(sum(timer.seconds.values()) * 1000, 3),
+            "rows": counters.get("rows", 0),
+            "cache_hit_rate": round(counters.get("cache_hits", 0) / lookups, 4) if lookups else None,
+            **extra,
+        }
+        with self._lock:
+            self._records.append(entry)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def history(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._records)
+        return [r for r in records if source is None or r["source"] == source]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per source: mean / p95 / max (ms) per tahap dan total, dari riwayat saat ini"""
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for r in self.history():
+            by_source.setdefault(r["source"], []).append(r)
+        out = {}
+        for source, records in by_source.items():
+            stages = ordered_stages(records)
+            stats = {}
+            for stage in stages + ["total"]:
+                values = np.array([
+                    r["total_ms"] if stage == "total" else r["stages_ms"].get(stage, 0.0) for r in records
+                ])
+                stats[stage] = {
+                    "mean": round(float(values.mean()), 2),
+                    "p95": round(float(np.percentile(values, 95)), 2),
+                    "max": round(float(values.max()), 2),
+                }
+            out[source] = stats
+        return out
+
+
+def ordered_stages(records):
+    """Tahap yang muncul di records, urut STAGES lalu tahap lain sesuai kemunculan"""
+    seen = dict.fromkeys(stage for r in records for stage in r["stages_ms"])
+    return [s for s in STAGES if s in seen] + [s for s in seen if s not in STAGES]
@@ -0,0 +1,127 @@
+import glob
+import os
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .rule_index import load_engine
+from .rules import ACTIVE_RULES_PATH
+from .tokenizer import STOPWORDS
+
+RULES_DIR = os.path.dirname(ACTIVE_RULES_PATH)
+# Output grid search (03_fp_growth_grid_search.py) + file rules kurasi dashboard
+RULE_SET_PATTERNS = ("Rules_Sup*_Conf*_*.csv", "ACTIVE_DASHBOARD_RULES_*.csv")
+_GRID_NAME = re.compile(r"Rules_Sup(?P<support>[\d.]+)_Conf(?P<confidence>[\d.]+)_[vV](?P<version>[\d.]+)\.csv$")
+
+
+class ActiveRuleSet(NamedTuple):
+    name: str
+    path: str
+    signature: Optional[Tuple[int, int]]
+    engine: object
+    loaded_at: float
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def rule_set_sort_key(name):
+    """Kurasi dulu, lalu grid search urut versi, support, confidence"""
+    m = _GRID_NAME.match(name)
+    if m is None:
+        return (0, name, 0.0, 0.0)
+    return (1, m.group("version"), float(m.group("support")), float(m.group("confidence")))
+
+
+class RuleSetRegistry:
+    """
+    Registry semua rule set di Data/rules/ (hasil grid search + ACTIVE_DASHBOARD_RULES_*).
+    - Engine per file di-cache bersama signature (mtime, ukuran); dibangun ulang
+      hanya jika file benar-benar berubah (lewat index biner rca.rule_index).
+    - Rule set aktif bisa diganti saat runtime dengan switch(). Engine baru
+      dibangun dulu di luar jalur pembaca, lalu dipasang dengan satu assignment
+      (atomic), sehingga analisis yang sedang berjalan tetap memakai engine
+      lama dan tidak pernah menunggu rebuild.
+    """
+
+    def __init__(self, rules_dir=RULES_DIR, active=ACTIVE_RULES_PATH, stopwords=STOPWORDS,
+                 check_interval=2.0):
+        self.rules_dir = rules_dir
+        self.stopwords = stopwords
+        self.check_interval = check_interval
+        self._engines: Dict[str, Tuple[Optional[Tuple[int, int]], object]] = {}
+        self._build_lock = threading.Lock()
+        self._listing: Tuple[Optional[Tuple[int, int]], List[str]] = (None, [])
+        self._checked_at = time.monotonic()
+        self._active = self._load(os.path.basename(active))
+
+    # ---- daftar rule set ----
+    def available(self) -> List[str]:
+        """Nama file rule set yang tersedia (listing di-scan ulang jika folder berubah)"""
+        sig = _signature(self.rules_dir)
+        cached_sig, names = self._listing
+        if sig != cached_sig or sig is None:
+            found = set()
+            for pattern in RULE_SET_PATTERNS:
+                found.update(os.path.basename(p) for p in glob.glob(os.path.join(self.rules_dir, pattern)))
+            names = sorted(found, key=rule_set_sort_key)
+            self._listing = (sig, names)
+        return list(names)
+
+    def path_of(self, name):
+        return os.path.join(self.rules_dir, os.path.basename(name))
+
+    # ---- build ----
+    def _load(self, name) -> ActiveRuleSet:
+        path = self.path_of(name)
+        with self._build_lock:
+            sig = _signature(path)
+            if sig is None:
+                raise FileNotFoundError(path)
+            cached = self._engines.get(path)
+            if cached is not None and cached[0] == sig:
+                engine = cached[1]
+            else:
+                engine = load_engine(path, self.stopwords)
+                self._engines[path] = (sig, engine)
+        return ActiveRuleSet(os.path.basename(path), path, sig, engine, time.time())
+
+    def get(self, name):
+        """Engine untuk rule set tertentu (tanpa mengubah rule set aktif)"""
+        return self._load(name).engine
+
+    # ---- rule set aktif ----
+    @property
+    def active(self) -> ActiveRuleSet:
+        return self._active
+
+    def engine(self):
+        """
+        Engine rule set aktif. Paling sering sekali per check_interval, file
+        aktif dicek (mtime/ukuran); jika berubah, pemanggil yang mendeteksi
+        membangun ulang sementara pemanggil lain tetap memakai engine lama.
+        """
+        current = self._active
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            sig = _signature(current.path)
+            if sig is not None and sig != current.signature:
+                try:
+                    self._active = self._load(current.name)
+                except (OSError, ValueError):
+                    pass  # file sedang ditulis ulang: coba lagi di cek berikutnya
+        return self._active.engine
+
+    def switch(self, name) -> ActiveRuleSet:
+        """Ganti rule set aktif (build dulu, lalu swap atomic)"""
+        if name == self._active.name and _signature(self._active.path) == self._active.signature:
+            return self._active
+        self._active = self._load(name)
+        return self._active
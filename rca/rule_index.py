@@ -0,0 +1,176 @@
+"""
+Kompilasi rules FP-Growth (CSV) menjadi index biner berversi (.npz):
+token yang sudah di-intern, antecedent per rule (format CSR token ID),
+confidence, lift dan diagnosis, ditambah fingerprint CSV sumber + stopwords.
+Index dimuat dalam hitungan milidetik dan hanya di-compile ulang jika
+sumbernya berubah.
+
+Compile manual (mis. setelah grid search):
+    python -m rca.rule_index Data/rules/Rules_Sup0.01_Conf0.3_v3.0.csv
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .engine import CompiledRuleEngine
+from .rules import ACTIVE_RULES_PATH, load_rules_df
+from .tokenizer import STOPWORDS
+
+# Naikkan jika format array/aturan preprocessing berubah (index lama otomatis di-compile ulang)
+INDEX_VERSION = 1
+INDEX_DIRNAME = ".index"
+
+
+def index_path_for(rules_path):
+    """Data/rules/X.csv -> Data/rules/.index/X.v<INDEX_VERSION>.npz"""
+    folder, name = os.path.split(rules_path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(folder, INDEX_DIRNAME, f"{stem}.v{INDEX_VERSION}.npz")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stopwords_sha256(stopwords=STOPWORDS):
+    return hashlib.sha256("\n".join(sorted(stopwords)).encode("utf-8")).hexdigest()
+
+
+def compile_rule_index(rules_path=ACTIVE_RULES_PATH, index_path=None, stopwords=STOPWORDS):
+    """Parse CSV rules sekali dan tulis index biner (atomic replace). Return path index."""
+    index_path = index_path or index_path_for(rules_path)
+    stat = os.stat(rules_path)
+    rules_df = load_rules_df(rules_path, stopwords)
+    engine = CompiledRuleEngine(rules_df)
+
+    tokens = engine.vocab.tokens
+    ids = engine.vocab.ids
+    rule_indptr = np.zeros(len(engine.rules) + 1, dtype=np.int64)
+    rule_token_ids = []
+    for i, rule in enumerate(engine.rules):
+        rule_token_ids.extend(sorted(ids[t] for t in rule["antecedents"]))
+        rule_indptr[i + 1] = len(rule_token_ids)
+    labels = sorted({r["final_diagnosis"] for r in engine.rules})
+    label_code = {label: i for i, label in enumerate(labels)}
+
+    meta = {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(rules_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": file_sha256(rules_path),
+        "stopwords_sha256": stopwords_sha256(stopwords),
+        "n_rules": len(engine.rules),
+        "n_tokens": len(tokens),
+        "compiled_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    arrays = {
+        "tokens": np.array(tokens, dtype=str),
+        "rule_indptr": rule_indptr,
+        "rule_token_ids": np.asarray(rule_token_ids, dtype=np.int32),
+        "confidence": np.array([r["confidence"] for r in engine.rules], dtype=np.float64),
+        "lift": np.array([r["lift"] for r in engine.rules], dtype=np.float64),
+        "diagnosis_labels": np.array(labels, dtype=str),
+        "diagnosis_codes": np.array([label_code[r["final_diagnosis"]] for r in engine.rules], dtype=np.int16),
+        "meta": np.array(json.dumps(meta)),
+    }
+
+    folder = os.path.dirname(index_path) or "."
+    os.makedirs(folder, exist_ok=True)
+    # Tulis ke file sementara lalu os.replace: pembaca tidak pernah melihat index setengah jadi
+    fd, tmp_path = tempfile.mkstemp(suffix=".npz", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return index_path
+
+
+def read_index_meta(index_path):
+    with np.load(index_path, allow_pickle=False) as data:
+        return json.loads(str(data["meta"]))
+
+
+def is_index_fresh(rules_path, index_path=None, stopwords=STOPWORDS):
+    """
+    Index masih valid jika versi & hash stopwords sama dan CSV sumber tidak
+    berubah. Ukuran+mtime yang sama dianggap tidak berubah; jika berbeda
+    (mis. file di-copy ulang), isi CSV di-hash untuk memastikan.
+    """
+    index_path = index_path or index_path_for(rules_path)
+    try:
+        meta = read_index_meta(index_path)
+        stat = os.stat(rules_path)
+    except (OSError, ValueError, KeyError):
+        return False
+    if meta.get("version") != INDEX_VERSION or meta.get("stopwords_sha256") != stopwords_sha256(stopwords):
+        return False
+    if meta.get("source_size") == stat.st_size and meta.get("source_mtime_ns") == stat.st_mtime_ns:
+        return True
+    return meta.get("source_sha256") == file_sha256(rules_path)
+
+
+def load_rule_index(index_path, engine_cls=CompiledRuleEngine):
+    """Bangun engine (default CompiledRuleEngine) dari file index (tanpa parse CSV / literal_eval)"""
+    with np.load(index_path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Index {index_path} versi {meta.get('version')}, butuh {INDEX_VERSION}")
+        labels = data["diagnosis_labels"].tolist()
+        engine = engine_cls.from_arrays(
+            data["tokens"].tolist(),
+            data["rule_indptr"],
+            data["rule_token_ids"],
+            data["confidence"],
+            data["lift"],
+            [labels[c] for c in data["diagnosis_codes"].tolist()],
+        )
+    engine.index_meta = meta
+    return engine
+
+
+def load_engine(rules_path=ACTIVE_RULES_PATH, stopwords=STOPWORDS, index_path=None,
+                engine_cls=CompiledRuleEngine):
+    """
+    Entry point dashboard/worker: muat engine dari index biner, compile ulang
+    dulu jika index belum ada atau sumbernya berubah. Jika folder index tidak
+    bisa ditulis, engine dibangun langsung dari CSV. engine_cls bisa diganti
+    mis. rca.subset_index.SetTrieRuleEngine untuk rule set sangat besar.
+    """
+    index_path = index_path or index_path_for(rules_path)
+    if not is_index_fresh(rules_path, index_path, stopwords):
+        try:
+            compile_rule_index(rules_path, index_path, stopwords)
+        except OSError:
+            return engine_cls(load_rules_df(rules_path, stopwords))
+    return load_rule_index(index_path, engine_cls)
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or [ACTIVE_RULES_PATH]
+    for rules_path in paths:
+        t0 = time.perf_counter()
+        index_path = compile_rule_index(rules_path)
+        meta = read_index_meta(index_path)
+        print(
+            f"[OK] {rules_path} -> {index_path} ({meta['n_rules']} rules, "
+            f"{meta['n_tokens']} token, {(time.perf_counter() - t0) * 1000:.0f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
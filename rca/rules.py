@@ -0,0 +1,115 @@
+import ast
+import re
+
+import pandas as pd
+
+from .tokenizer import STOPWORDS
+
+ACTIVE_RULES_PATH = "Data/rules/Rules_Sup0.01_Conf0.3_v3.0.csv"
+# Rule set kurasi dashboard lama (dipakai skrip analisis/debug)
+DASHBOARD_RULES_PATHS = [
+    "Data/rules/ACTIVE_DASHBOARD_RULES_AUTO.csv",
+    "Data/rules/ACTIVE_DASHBOARD_RULES_CURATED.csv",
+]
+
+# Kolom file curated (ACTIVE_DASHBOARD_RULES_CURATED.csv) -> kolom mlxtend
+CURATED_COLUMNS = {
+    "Root Cause (Gejala)": "antecedents",
+    "Impact (Akibat)": "consequents",
+    "Confidence (%)": "confidence",
+    "Lift Ratio": "lift",
+}
+
+
+# Kata generik: rule yang antecedent-nya hanya kata ini / nama interface dianggap lemah
+GENERIC_KEYWORDS = {
+    "interface",
+    "link",
+    "ethernet",
+    "port",
+    "0x0800",
+    "udp",
+    "admin",
+    "bridge",
+    "proto",
+    "icmp",
+    "type",
+    "code",
+    "mac",
+    "src",
+    "dst",
+    "ospf",
+    "state",
+    "neighbor",
+    "change",
+    "exstart",
+    "logged",
+    "user",
+}
+_INTERFACE_NAME = re.compile(r"^ether\d+$")
+
+
+def is_generic_rule(antecedents, generic=GENERIC_KEYWORDS):
+    """True jika semua token antecedent generik atau nama interface (etherX)"""
+    return all(t in generic or _INTERFACE_NAME.match(t) for t in antecedents)
+
+
+def drop_generic_rules(rules_df, generic=GENERIC_KEYWORDS):
+    """
+    [FILTER WEAK RULES] Buang rule yang semua katanya generic ATAU nama interface
+    Contoh: {'interface'}, {'interface', 'change'}, {'neighbor', 'interface'}, {'interface', 'ether2'}
+    """
+    return rules_df[~rules_df["antecedents"].map(lambda a: is_generic_rule(a, generic))]
+
+
+# Normalize antecedents parsing
+def parse_antecedents(x):
+    if pd.isna(x):
+        return set()
+    if isinstance(x, (list, set)):
+        return set(x)
+    s = str(x).strip()
+    try:
+        if s.startswith("["):
+            return set(ast.literal_eval(s))
+    except Exception:
+        pass
+    parts = [p.strip() for p in s.split(",") if p.strip()]
+    return set(parts)
+
+
+def map_diagnosis(val):
+    s = str(val).upper()
+    if "NORMAL" in s:
+        return None
+    if "UPSTREAM_FAILURE" in s:
+        return "UPSTREAM_FAILURE"
+    if "LINK_FAILURE" in s:
+        return "LINK_FAILURE"
+    # Perketat: BROADCAST saja tidak cukup, harus ada STORM atau LOOPED
+    if "STORM" in s or "LOOPED" in s:
+        return "BROADCAST_STORM"
+    if "DDOS" in s:
+        return "DDoS"
+    return None
+
+
+def load_rules_df(rules_path=ACTIVE_RULES_PATH, stopwords=STOPWORDS):
+    """Baca CSV rules FP-Growth dan siapkan kolom antecedents & final_diagnosis"""
+    df_auto = pd.read_csv(rules_path, low_memory=False)
+    if "antecedents" not in df_auto.columns:
+        df_auto = df_auto.rename(columns=CURATED_COLUMNS)
+
+    rules_df = df_auto.copy()
+    rules_df["antecedents"] = rules_df["antecedents"].apply(parse_antecedents)
+
+    # Pre-parse rules
+    rules_df["final_diagnosis"] = rules_df["consequents"].apply(map_diagnosis)
+    rules_df["antecedents"] = rules_df["antecedents"].apply(
+        lambda x: set(x) - stopwords
+    )
+
+    rules_df = rules_df[rules_df["antecedents"].map(len) > 0].dropna(
+        subset=["final_diagnosis"]
+    )
+    return rules_df
@@ -0,0 +1,199 @@
+"""
+Index subset untuk rule matching skala besar (100k+ rules).
+
+Inverted index / matriks antecedent (CompiledRuleEngine) menyentuh setiap
+posting dari setiap token pesan. Saat support diturunkan, token umum seperti
+`ospf`, `link`, `interface` muncul di puluhan ribu rule sehingga biaya per
+pesan tumbuh linear dengan jumlah rule.
+
+SetTrieRuleEngine menyimpan antecedent di set-trie: token setiap rule
+diurutkan dari yang paling jarang muncul di antecedent (rarest-first), lalu
+disisipkan sebagai path dari root. Query "semua rule yang antecedent-nya
+subset dari token pesan" hanya menelusuri prefix yang seluruh tokennya ada
+di pesan; rule dengan token langka yang tidak ada di pesan langsung terpotong
+di level pertama tanpa pernah menyentuh token umumnya.
+
+Setiap node juga menyimpan rank terbaik di subtree-nya. Untuk mencari rule
+terbaik (bukan semua rule), anak dengan subtree terbaik ditelusuri dulu dan
+subtree yang rank terbaiknya tidak mungkin mengalahkan hasil sementara
+dilewati, sehingga pesan dengan banyak token umum tidak perlu menghitung
+ribuan subset yang cocok.
+
+Catatan: untuk mencari satu rule terbaik, CompiledRuleEngine.match (anchor
+best-first) biasanya lebih cepat lagi (lihat benchmarks/bench_subset_index.py);
+trie ini terutama berguna untuk match_all (semua rule yang cocok).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from .engine import CompiledRuleEngine
+
+
+class SetTrieRuleEngine(CompiledRuleEngine):
+    """
+    CompiledRuleEngine dengan set-trie untuk jalur match / match_many.
+    Ranking rule, rules, vocab, index biner (from_arrays) dan match_encoded
+    (perkalian matriks) sama persis dengan CompiledRuleEngine, sehingga hasil
+    identik dan engine ini bisa langsung dipakai Diagnoser / Matcher.
+
+    Struktur trie dibuat flat agar hemat memori untuk jutaan node:
+    - pos_of[token_id]  = posisi token dalam urutan rarest-first
+    - edges[node * stride + pos] = node anak
+    - node_best[node]   = rank terbaik rule yang antecedent-nya berakhir di node
+    - subtree_best[node] = rank terbaik di node tersebut + semua turunannya
+    """
+
+    _terminal = None
+
+    def _build_index(self, rule_indptr, rule_token_ids):
+        super()._build_index(rule_indptr, rule_token_ids)
+        n_tokens = len(self.vocab)
+        rule_indptr = np.asarray(rule_indptr, dtype=np.int64)
+        rule_token_ids = np.asarray(rule_token_ids, dtype=np.int64)
+
+        # Urutan global token: frekuensi di antecedent naik (rarest-first), tie -> token ID
+        freq = np.bincount(rule_token_ids, minlength=n_tokens)
+        by_rarity = np.lexsort((np.arange(n_tokens), freq))
+        pos_of = np.empty(n_tokens, dtype=np.int64)
+        pos_of[by_rarity] = np.arange(n_tokens)
+        self.pos_of: List[int] = pos_of.tolist()
+
+        stride = max(n_tokens, 1)
+        no_rule = len(self.rules)
+        edges: Dict[int, int] = {}
+        node_best: List[int] = [no_rule]
+        parent: List[int] = [-1]
+        positions = pos_of[rule_token_ids].tolist() if len(rule_token_ids) else []
+        bounds = rule_indptr.tolist()
+        rank_of = self.rank_of.tolist()
+        for rule_idx in range(no_rule):
+            start, end = bounds[rule_idx], bounds[rule_idx + 1]
+            if start == end:
+                continue  # antecedent kosong tidak pernah cocok (sama dgn CompiledRuleEngine)
+            node = 0
+            for pos in sorted(set(positions[start:end])):
+                key = node * stride + pos
+                child = edges.get(key)
+                if child is None:
+                    child = len(node_best)
+                    edges[key] = child
+                    node_best.append(no_rule)
+                    parent.append(node)
+                node = child
+            rank = rank_of[rule_idx]
+            if rank < node_best[node]:
+                node_best[node] = rank
+
+        # ID anak selalu > ID induk: propagasi dari node terakhir ke root
+        subtree_best = list(node_best)
+        for node in range(len(subtree_best) - 1, 0, -1):
+            up = parent[node]
+            if subtree_best[node] < subtree_best[up]:
+                subtree_best[up] = subtree_best[node]
+
+        self._stride = stride
+        self._edges = edges
+        self._node_best = node_best
+        self._subtree_best = subtree_best
+        self._order_list: List[int] = self.order.tolist()
+
+    @property
+    def n_nodes(self):
+        return len(self._node_best)
+
+    def query_positions(self, tokens) -> List[int]:
+        """Token pesan -> posisi rarest-first terurut (token di luar vocab dibuang)"""
+        ids = self.vocab.ids
+        pos_of = self.pos_of
+        return sorted({pos_of[ids[t]] for t in tokens if t in ids})
+
+    def best_rank(self, query) -> int:
+        """
+        Rank terbaik di antara rule yang antecedent-nya subset dari query
+        (posisi terurut); len(self.rules) jika tidak ada. Best-first dengan
+        pruning subtree_best, jadi tidak semua subset yang cocok dikunjungi.
+        """
+        edges = self._edges
+        node_best = self._node_best
+        subtree_best = self._subtree_best
+        stride = self._stride
+        n_query = len(query)
+        best = len(self.rules)
+        stack = [(0, 0)]
+        while stack:
+            node, start = stack.pop()
+            if subtree_best[node] >= best:
+                continue
+            rank = node_best[node]
+            if rank < best:
+                best = rank
+            base = node * stride
+            children = []
+            for j in range(start, n_query):
+                child = edges.get(base + query[j])
+                if child is not None and subtree_best[child] < best:
+                    children.append((subtree_best[child], child, j + 1))
+            if children:
+                # Anak paling menjanjikan di-pop lebih dulu
+                children.sort(reverse=True)
+                stack.extend((child, nxt) for _, child, nxt in children)
+        return best
+
+    def subset_ranks(self, query) -> List[int]:
+        """Semua rank rule yang antecedent-nya subset dari query (tanpa pruning), terurut"""
+        edges = self._edges
+        terminal = self._terminal_ranks()
+        stride = self._stride
+        n_query = len(query)
+        ranks: List[int] = []
+        stack = [(0, 0)]
+        while stack:
+            node, start = stack.pop()
+            ranks.extend(terminal.get(node, ()))
+            base = node * stride
+            for j in range(start, n_query):
+                child = edges.get(base + query[j])
+                if child is not None:
+                    stack.append((child, j + 1))
+        return sorted(ranks)
+
+    def _terminal_ranks(self) -> Dict[int, List[int]]:
+        # node -> semua rank yang berakhir di node (node_best hanya menyimpan
+        # yang terbaik); dibangun saat match_all pertama kali dipakai
+        if self._terminal is None:
+            terminal: Dict[int, List[int]] = {}
+            for rank, rule_idx in enumerate(self._order_list):
+                antecedents = self.rules[rule_idx]["antecedents"]
+                if not antecedents:
+                    continue
+                node = 0
+                for pos in self.query_positions(antecedents):
+                    node = self._edges[node * self._stride + pos]
+                terminal.setdefault(node, []).append(rank)
+            self._terminal = terminal
+        return self._terminal
+
+    def match_all(self, tokens):
+        """Semua rule yang cocok dengan token pesan, urut ranking (terbaik dulu)"""
+        order = self._order_list
+        return [self.rules[order[rank]] for rank in self.subset_ranks(self.query_positions(tokens))]
+
+    def match(self, tokens):
+        """Find best matching rule lewat set-trie (jalur satu pesan)"""
+        best = self.best_rank(self.query_positions(tokens))
+        if best >= len(self.rules):
+            return None
+        return self.rules[int(self.order[best])]
+
+    def match_many(self, token_sets):
+        """Cocokkan banyak set token; return rule dict atau None per pesan."""
+        rules = self.rules
+        n_rules = len(rules)
+        order = self._order_list
+        out = []
+        for tokens in token_sets:
+            best = self.best_rank(self.query_positions(tokens))
+            out.append(rules[order[best]] if best < n_rules else None)
+        return out
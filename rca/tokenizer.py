@@ -0,0 +1,264 @@
+import string
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# STOPWORDS: keep generic noise but ensure critical network keywords remain
+# (removed: 'ospf','neighbor','state','change','down','up','link')
+STOPWORDS = {
+    "message",
+    "info",
+    "via",
+    "from",
+    "to",
+    "route",
+    "system",
+    "topics",
+    "log",
+    "time",
+    "date",
+    # network-state keywords removed from stopwords on purpose
+    # 'state', 'changed', 'ospf', 'neighbor', 'link', 'down', 'up' are kept for detection
+    "ospf-1",
+    "router-id",
+    "area",
+    "area-0",
+    "election",
+    "version",
+    "instance",
+    "created",
+    "broadcast",
+    "loopback",
+    "dr",
+    "bdr",
+    "me",
+    "other",
+    "loading",
+    "full",
+    "exchange",
+    "done",
+    "established",
+    "init",
+    "twoway",
+    "address",
+    "ip",
+    "admin",
+    "user",
+    "logged",
+}
+
+# Stopwords pipeline mining (02_data_cleaning.py). Dipindah ke sini agar
+# mining, evaluasi dan inferensi memakai satu definisi yang sama.
+MINING_STOPWORDS = {
+    # --- STOPWORDS UMUM ---
+    "ether1", "ether2", "ether3", "ether4", "ether5", "ether6", "ether7",
+    "loading", "info", "input", "in", "out", "message", "log", "by",
+    "from", "to", "via", "changed", "set", "connection-state", "new",
+    "time", "date", "identity", "forward", "zone", "firewall", "router",
+    "system", "script", "debug", "topics", "active", "inactive",
+    "assigned", "deassigned", "address", "status", "state", "detected",
+    "using", "packet", "rule", "up", "running", "full", "established",
+    "connected", "reachable", "designated", "backup", "installed",
+    "added", "exchange", "route", "version", "change", "created",
+    "init", "twoway", "2-way", "exstart", "waiting", "negotiation",
+    "lsdb", "bdr", "dr", "instance", "account", "user", "logged",
+    "rebooted", "shutdown", "console", "ttys0", "api", "rest-api",
+    "dhcp", "dhcp-client", "monitor", "event", "size", "simple",
+    "got", "other", "host", "rto",
+    "153", "130", "132", "133", "168", "192", "255",  # IP fragments umum
+}
+
+# Kolom yang digabung jadi satu kalimat saat mining (Router + Topik + Pesan)
+MINING_FIELDS = ("source_router", "topics", "message")
+
+# Mode tokenisasi (satu implementasi, beda konfigurasi):
+# - "dashboard": mode kompatibel inferensi live, identik dashboard.clean_text lama
+#   (hanya [a-z0-9_], set token unik, hanya kolom message)
+# - "mining": identik 02_data_cleaning.clean_text (tanda '-' dipertahankan,
+#   list berurutan dengan duplikat, kolom MINING_FIELDS)
+TOKENIZER_MODES = {
+    "dashboard": {"stopwords": STOPWORDS, "keep": "_", "unique": True, "fields": ("message",)},
+    "mining": {"stopwords": MINING_STOPWORDS, "keep": "-", "unique": False, "fields": MINING_FIELDS},
+}
+
+
+def join_fields(df, fields=MINING_FIELDS):
+    """Gabungkan beberapa kolom teks per baris dengan spasi (vektor, tanpa apply)"""
+    text = df[fields[0]].astype(str)
+    for field in fields[1:]:
+        text = text + " " + df[field].astype(str)
+    return text
+
+
+class _TranslateTable(dict):
+    """
+    Tabel str.translate yang dibangun secara lazy.
+    Setiap karakter dipetakan sekali ke hasil lower() lalu karakter di luar
+    `keep` (dan bukan whitespace) diganti spasi, sehingga satu panggilan
+    translate menggantikan lower() + dua kali re.sub.
+    """
+
+    def __init__(self, keep):
+        super().__init__()
+        self.keep = frozenset(keep)
+
+    def __missing__(self, code):
+        out = "".join(
+            c if c in self.keep or c.isspace() else " " for c in chr(code).lower()
+        )
+        self[code] = out
+        return out
+
+
+class Vocabulary:
+    """Interning token -> ID integer (dipakai bersama oleh tokenizer & rule engine)."""
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        for t in tokens:
+            self.intern(t)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self.ids
+
+    def intern(self, token: str) -> int:
+        idx = self.ids.get(token)
+        if idx is None:
+            idx = len(self.tokens)
+            self.ids[token] = idx
+            self.tokens.append(token)
+        return idx
+
+
+class Tokenizer:
+    """
+    Tokenizer batch untuk pesan log (satu pass str.translate per pesan).
+    Default (mode "dashboard") hasil per pesan identik dengan clean_text()
+    lama di dashboard.py: lowercase, karakter selain [a-z0-9_] jadi pemisah,
+    lalu buang stopwords dan token dengan panjang < min_len (angka tidak
+    dibuang karena port spt 5678 penting).
+    Mode "mining" (Tokenizer.from_mode("mining")) identik dengan
+    02_data_cleaning.clean_text, sehingga mining & inferensi memakai
+    implementasi yang sama.
+    """
+
+    def __init__(self, stopwords=STOPWORDS, min_len=3, keep="_", unique=True, fields=("message",)):
+        self.stopwords = frozenset(stopwords)
+        self.min_len = min_len
+        self.unique = unique
+        self.fields = tuple(fields)
+        self.table = _TranslateTable(string.ascii_lowercase + string.digits + keep)
+        # Cache hasil filter stopword/panjang per token unik
+        self._keep_cache: Dict[str, bool] = {}
+        self.max_cache_size = 200_000
+
+    @classmethod
+    def from_mode(cls, mode="dashboard", **overrides):
+        """Tokenizer dengan konfigurasi TOKENIZER_MODES[mode] (bisa di-override per argumen)"""
+        try:
+            config = dict(TOKENIZER_MODES[mode])
+        except KeyError:
+            raise ValueError(f"Mode tokenizer tidak dikenal: {mode!r} (pilihan: {sorted(TOKENIZER_MODES)})")
+        config.update(overrides)
+        return cls(**config)
+
+    def _split_batch(self, messages) -> List[List[str]]:
+        table = self.table
+        return [m.translate(table).split() if isinstance(m, str) else [] for m in messages]
+
+    def _tokenize_rows(self, messages) -> list:
+        raw_rows = self._split_batch(messages)
+        kept = self._kept(raw_rows)
+        if self.unique:
+            return [kept.intersection(r) for r in raw_rows]
+        return [[t for t in r if t in kept] for r in raw_rows]
+
+    def _kept(self, raw_rows) -> set:
+        """Filter stopword & panjang sekali untuk seluruh kosakata batch."""
+        cache = self._keep_cache
+        if len(cache) > self.max_cache_size:
+            cache.clear()  # Token volatil (IP, port, counter) tidak menumpuk
+        vocab = set().union(*raw_rows) if raw_rows else set()
+        for t in vocab.difference(cache):
+            cache[t] = t not in self.stopwords and len(t) >= self.min_len
+        return {t for t in vocab if cache[t]}
+
+    def tokenize(self, text):
+        """Tokenisasi satu pesan (set jika unique=True, list jika tidak)."""
+        return self.tokenize_batch([text])[0]
+
+    def tokenize_batch(self, messages) -> list:
+        """
+        Tokenisasi satu kolom pesan (list / pandas Series) sekaligus.
+        Pesan identik (flood, state change berulang) hanya ditokenisasi sekali;
+        tiap baris tetap mendapat objek set/list sendiri.
+        """
+        if hasattr(messages, "tolist"):
+            messages = messages.tolist()
+        first_pos: Dict[object, int] = {}
+        codes = [first_pos.setdefault(m, len(first_pos)) for m in messages]
+        if len(first_pos) == len(codes):
+            return self._tokenize_rows(messages)
+        rows = self._tokenize_rows(list(first_pos))
+        copy = set.copy if self.unique else list.copy
+        return [copy(rows[c]) for c in codes]
+
+    def tokenize_frame(self, df) -> list:
+        """Tokenisasi DataFrame log: kolom self.fields digabung per baris lalu di-batch"""
+        if len(self.fields) == 1:
+            return self.tokenize_batch(df[self.fields[0]])
+        return self.tokenize_batch(join_fields(df, self.fields))
+
+    def encode_batch(
+        self, messages, vocab: Optional[Vocabulary] = None, grow: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray, Vocabulary]:
+        """
+        Tokenisasi + interning ke ID integer dalam format CSR:
+        token ID pesan ke-i = indices[indptr[i]:indptr[i + 1]].
+        Jika grow=False, token di luar vocab dibuang (mis. vocab dari rules).
+        """
+        if vocab is None:
+            vocab = Vocabulary()
+        rows = self.tokenize_batch(messages)
+        ids = vocab.ids
+        if grow:
+            for t in self._first_seen(rows):
+                vocab.intern(t)
+        lengths = np.empty(len(rows), dtype=np.int64)
+        flat: List[int] = []
+        for i, r in enumerate(rows):
+            row_ids = [ids[t] for t in r if t in ids]
+            lengths[i] = len(row_ids)
+            flat.extend(row_ids)
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        return indptr, np.asarray(flat, dtype=np.int32), vocab
+
+    @staticmethod
+    def _first_seen(rows):
+        # Interning mengikuti urutan kemunculan pertama di batch
+        seen = {}
+        for r in rows:
+            for t in r:
+                seen.setdefault(t, None)
+        return seen.keys()
+
+
+DEFAULT_TOKENIZER = Tokenizer.from_mode("dashboard")
+MINING_TOKENIZER = Tokenizer.from_mode("mining")
+
+
+def clean_text(text):
+    """Tokenisasi satu pesan ke set token (kompatibel dengan dashboard.clean_text)."""
+    if not isinstance(text, str):
+        return set()
+    return DEFAULT_TOKENIZER.tokenize(text)
+
+
+def clean_text_batch(messages):
+    """Versi batch dari clean_text untuk satu kolom pesan."""
+    return DEFAULT_TOKENIZER.tokenize_batch(messages)
@@ -0,0 +1,326 @@
+# ==========================================
+# SKRIPSI BAB 4.6: K-FOLD CROSS VALIDATION MINING + EVALUASI RULES
+# ==========================================
+"""
+Stratified k-fold cross validation untuk mining rules FP-Growth + evaluasi.
+
+Berbeda dengan evaluate_rules.py (satu split 80/20, rules diambil dari file
+grid), di sini rules benar-benar di-mining ulang dari fold training:
+- dataset di-preprocess sekali (tokenizer mode "mining", sama dengan
+  evaluate_rules.py) lalu di-encode sekali menjadi matriks one-hot
+  transaksi + label yang dibagikan ke semua worker,
+- setiap fold training di-balance TARGET_COUNT per kelas lalu di-mining
+  dengan setting yang sama dengan preprocessing/03_fp_growth_grid_search.py
+  (fpgrowth max_len=4, association_rules metric confidence, hanya rule
+  dengan consequent label target),
+- rules hasil fold dievaluasi ke fold held-out apa adanya (tanpa balancing)
+  lewat predict_with_rules (rca.batch).
+
+Satu task worker = satu fold x satu support (itemset di-mining sekali,
+semua confidence dipakai ulang). Task baru tidak dijalankan jika perkiraan
+waktunya melewati --budget; fold yang sudah selesai tetap dilaporkan.
+Output: metrik per fold + mean/variance per (support, confidence).
+
+Jalankan dari root project:
+    python rules_evaluation/cross_validate.py [--folds 5] [--support 0.01] [--confidence 0.3] [--budget 900]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import association_rules, fpgrowth
+from mlxtend.preprocessing import TransactionEncoder
+from sklearn.model_selection import StratifiedKFold
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "cv_run")
+
+sys.path.insert(0, SCRIPT_DIR)
+from evaluate_matrix import compute_metrics, er, quiet  # noqa: E402
+from rca.batch import TransactionMatrix  # noqa: E402
+from rca.parallel import default_workers  # noqa: E402
+
+# Setting mining = preprocessing/03_fp_growth_grid_search.py
+MAX_LEN_LIMIT = 4
+TARGET_COUNT = 2500
+MINING_RANDOM_STATE = 42
+
+METRIC_COLUMNS = [
+    "accuracy", "precision_macro", "recall_macro", "f1_macro",
+    "precision_weighted", "recall_weighted", "f1_weighted", "match_rate", "n_rules",
+]
+
+
+# ==========================================
+# 1. DATA BERSAMA (tokenize + one-hot sekali)
+# ==========================================
+def load_shared_data(dataset_path):
+    """
+    Return dict data bersama: labels, items (list token per baris) dan
+    matriks one-hot bool (baris x item, termasuk item label seperti
+    transaksi di grid search).
+    """
+    df = quiet(er.preprocess_master_dataset, dataset_path).reset_index(drop=True)
+    labels = df["Label"].to_numpy(dtype=object)
+    items = df["items"].tolist()
+    transactions = [list(row) + [label] for row, label in zip(items, labels)]
+    te = TransactionEncoder()
+    onehot = te.fit(transactions).transform(transactions)
+    return {"labels": labels, "items": items, "onehot": onehot, "columns": list(te.columns_)}
+
+
+def balance_indices(train_idx, labels):
+    """Balancing fold training persis seperti grid search (TARGET_COUNT per kelas)"""
+    df_train = pd.DataFrame({"row": train_idx, "Label": labels[train_idx]})
+    parts = []
+    for label in df_train["Label"].unique():
+        subset = df_train[df_train["Label"] == label]
+        parts.append(subset.sample(
+            n=TARGET_COUNT, replace=len(subset) < TARGET_COUNT, random_state=MINING_RANDOM_STATE
+        ))
+    balanced = pd.concat(parts).sample(frac=1, random_state=MINING_RANDOM_STATE)
+    return balanced["row"].to_numpy()
+
+
+def mine_rules(frequent_itemsets, min_conf):
+    """association_rules + filter consequent label target (format file grid)"""
+    if frequent_itemsets.empty:
+        return pd.DataFrame(columns=["antecedents", "consequents", "confidence", "lift"])
+    rules = association_rules(frequent_itemsets, metric="confidence", min_threshold=min_conf)
+    final_rules = rules[rules["consequents"].apply(lambda x: any(label in x for label in er.TARGET_LABELS))].copy()
+    final_rules["antecedents"] = final_rules["antecedents"].apply(lambda x: list(x))
+    final_rules["consequents"] = final_rules["consequents"].apply(lambda x: list(x))
+    return final_rules.sort_values(["lift", "confidence"], ascending=[False, False])
+
+
+# ==========================================
+# 2. WORKER: satu task = satu fold x satu support
+# ==========================================
+_WORKER_DATA = None
+
+
+def _init_worker(data):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def run_fold(fold, train_idx, test_idx, min_sup, confidences):
+    data = _WORKER_DATA
+    t_start = time.perf_counter()
+    rows_idx = balance_indices(train_idx, data["labels"])
+    df_encoded = pd.DataFrame(data["onehot"][rows_idx], columns=data["columns"])
+    frequent_itemsets = fpgrowth(df_encoded, min_support=min_sup, use_colnames=True, max_len=MAX_LEN_LIMIT)
+    mine_s = time.perf_counter() - t_start
+
+    df_test = pd.DataFrame({
+        "Label": data["labels"][test_idx],
+        "items": [data["items"][i] for i in test_idx],
+    })
+    transactions = TransactionMatrix(df_test["items"])
+    results = []
+    for min_conf in confidences:
+        t0 = time.perf_counter()
+        df_rules = quiet(er.prepare_rules, mine_rules(frequent_itemsets, min_conf))
+        rules_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        df_result, match_details = quiet(er.predict_with_rules, df_test, df_rules, transactions)
+        match_s = time.perf_counter() - t0
+        matched = sum(1 for d in match_details if d["matched"])
+        row = {
+            "fold": fold,
+            "support": min_sup,
+            "confidence": min_conf,
+            "train_samples": len(rows_idx),
+            "test_samples": len(df_result),
+            "itemsets": len(frequent_itemsets),
+            "n_rules": len(df_rules),
+            "match_rate": round(matched / max(len(df_result), 1), 4),
+        }
+        row.update(compute_metrics(df_result["Label"].values, df_result["Prediksi"].values))
+        row.update({
+            "mine_s": round(mine_s, 3),
+            "rules_s": round(rules_s, 3),
+            "match_s": round(match_s, 3),
+        })
+        results.append(row)
+    return results
+
+
+class _LocalExecutor:
+    """Executor sinkron untuk workers=1 (tanpa overhead proses/IPC)"""
+
+    def __init__(self, data):
+        _init_worker(data)
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def run_cv(data, n_folds, supports, confidences, workers, budget_s):
+    """
+    Jalankan semua task (fold x support) dengan maksimal `workers` task
+    berjalan. Return (baris hasil, jumlah task dilewati karena budget).
+    """
+    skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=er.RANDOM_STATE)
+    splits = list(skf.split(np.zeros(len(data["labels"])), data["labels"]))
+    tasks = [(fold, train_idx, test_idx, sup, confidences)
+             for sup in supports for fold, (train_idx, test_idx) in enumerate(splits, 1)]
+
+    if workers <= 1:
+        executor = _LocalExecutor(data)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,))
+    t_start = time.perf_counter()
+    task_times = []
+    rows = []
+    pending = {}
+    skipped = 0
+    try:
+        queue = list(tasks)
+        while queue or pending:
+            while queue and len(pending) < workers:
+                elapsed = time.perf_counter() - t_start
+                # Perkiraan: task berikutnya selesai setelah rata-rata durasi task
+                expected = np.mean(task_times) if task_times else 0.0
+                if elapsed + expected > budget_s:
+                    skipped += len(queue)
+                    queue = []
+                    break
+                task = queue.pop(0)
+                pending[executor.submit(run_fold, *task)] = (task, time.perf_counter())
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                (fold, _, _, sup, _), submitted = pending.pop(future)
+                task_times.append(time.perf_counter() - submitted)
+                rows.extend(future.result())
+                print(f"[FOLD {fold}] support={sup} selesai ({task_times[-1]:.1f}s)")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return rows, skipped
+
+
+# ==========================================
+# 3. RINGKASAN MEAN / VARIANCE
+# ==========================================
+def summarize(df_folds):
+    grouped = df_folds.groupby(["support", "confidence"], sort=True)
+    summary = grouped.size().rename("folds").to_frame()
+    for col in METRIC_COLUMNS:
+        summary[f"{col}_mean"] = grouped[col].mean().round(4)
+        summary[f"{col}_var"] = grouped[col].var(ddof=1).round(6)
+        summary[f"{col}_std"] = grouped[col].std(ddof=1).round(4)
+    return summary.reset_index()
+
+
+def to_markdown(summary, n_folds, dataset_name):
+    md = f"## Tabel 4.X — {n_folds}-Fold Cross Validation Rules FP-Growth\n\n"
+    md += (
+        f"**Dataset:** {dataset_name} | mining per fold: balancing {TARGET_COUNT}/kelas, "
+        f"max_len={MAX_LEN_LIMIT} | nilai = mean ± std (variance)\n\n"
+    )
+    md += "| **Support** | **Confidence** | **Fold** | **Rules** | **Accuracy** | **Precision (M)** | **Recall (M)** | **F1 (M)** |\n"
+    md += "|---|---|---|---|---|---|---|---|\n"
+    for _, r in summary.iterrows():
+        cells = [
+            f"{r[f'{m}_mean']:.4f} ± {r[f'{m}_std']:.4f} ({r[f'{m}_var']:.6f})"
+            for m in ("accuracy", "precision_macro", "recall_macro", "f1_macro")
+        ]
+        md += (
+            f"| {r['support']} | {r['confidence']} | {r['folds']} | {r['n_rules_mean']:.0f} | "
+            + " | ".join(cells) + " |\n"
+        )
+    return md
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K-fold CV mining FP-Growth + evaluasi rules")
+    parser.add_argument("--dataset", default=er.MASTER_DATASET)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--support", default="0.01", help="daftar min_support, pisahkan koma")
+    parser.add_argument("--confidence", default="0.3", help="daftar min_confidence, pisahkan koma")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--budget", type=float, default=900.0, help="batas wall-clock (detik)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    supports = [float(s) for s in args.support.split(",")]
+    confidences = [float(c) for c in args.confidence.split(",")]
+    n_tasks = args.folds * len(supports)
+    workers = max(1, min(args.workers or default_workers(), n_tasks))
+    dataset_name = os.path.basename(args.dataset)
+
+    print("=" * 70)
+    print(f"  {args.folds}-FOLD CROSS VALIDATION — FP-GROWTH (max_len={MAX_LEN_LIMIT})")
+    print(f"  Dataset: {dataset_name} | support: {supports} | confidence: {confidences}")
+    print(f"  Task: {n_tasks} | workers: {workers} | budget: {args.budget:.0f}s")
+    print("=" * 70)
+
+    t0 = time.perf_counter()
+    data = load_shared_data(args.dataset)
+    t_prepare = time.perf_counter() - t0
+    print(f"[DATA] {len(data['labels'])} transaksi, {len(data['columns'])} item ({t_prepare:.2f}s)")
+
+    t0 = time.perf_counter()
+    rows, skipped = run_cv(data, args.folds, supports, confidences, workers, args.budget - t_prepare)
+    t_cv = time.perf_counter() - t0
+    if skipped:
+        print(f"[WARN] Budget {args.budget:.0f}s: {skipped} task tidak dijalankan")
+
+    df_folds = pd.DataFrame(rows)
+    os.makedirs(args.output_dir, exist_ok=True)
+    folds_path = os.path.join(args.output_dir, "cv_folds.csv")
+    summary_path = os.path.join(args.output_dir, "cv_summary.csv")
+    md_path = os.path.join(args.output_dir, "cv_summary.md")
+    json_path = os.path.join(args.output_dir, "cv_summary.json")
+    summary = summarize(df_folds) if not df_folds.empty else pd.DataFrame()
+
+    if not df_folds.empty:
+        df_folds = df_folds.sort_values(["support", "confidence", "fold"]).reset_index(drop=True)
+        df_folds.to_csv(folds_path, index=False)
+        summary.to_csv(summary_path, index=False)
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(to_markdown(summary, args.folds, dataset_name))
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "dataset": dataset_name,
+            "folds": args.folds,
+            "random_state": er.RANDOM_STATE,
+            "max_len": MAX_LEN_LIMIT,
+            "target_count": TARGET_COUNT,
+            "supports": supports,
+            "confidences": confidences,
+            "workers": workers,
+            "budget_s": args.budget,
+            "skipped_tasks": skipped,
+            "prepare_s": round(t_prepare, 2),
+            "cv_s": round(t_cv, 2),
+            "summary": summary.to_dict("records"),
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"\nPreprocess: {t_prepare:.2f}s | CV: {t_cv:.2f}s")
+    if not summary.empty:
+        cols = ["support", "confidence", "folds", "n_rules_mean", "accuracy_mean", "accuracy_var",
+                "f1_macro_mean", "f1_macro_var"]
+        print(summary[cols].to_string(index=False))
+        print(f"\n[OK] {folds_path}\n[OK] {summary_path}\n[OK] {md_path}")
+    print(f"[OK] {json_path}")
+
+
+if __name__ == "__main__":
+    main()
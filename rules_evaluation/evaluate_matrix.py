@@ -0,0 +1,277 @@
+# ==========================================
+# SKRIPSI BAB 4.6: MATRIKS EVALUASI RULES FP-GROWTH
+# Semua rule grid (Rules_Sup*_Conf*_v*.csv) x semua versi Master Dataset
+# ==========================================
+"""
+Evaluasi semua rule grid terhadap semua versi dataset dalam satu job.
+
+- Setiap dataset di-preprocess (tokenizer mode "mining") dan di-split/balance
+  SEKALI memakai fungsi yang sama dengan test_run_20260415/evaluate_rules.py,
+  lalu data uji disimpan di cache (rules_evaluation/.cache/). Cache otomatis
+  tidak valid jika file dataset, evaluate_rules.py atau rca/tokenizer.py
+  berubah.
+- Rule file dibagi ke proses worker; setiap worker meng-encode data uji
+  menjadi TransactionMatrix sekali, lalu satu task = satu rule file yang
+  dicocokkan ke semua dataset (rca.batch).
+- Output: satu tabel metrik gabungan (CSV + Markdown + JSON) termasuk
+  throughput matching per rule set.
+
+Jalankan dari root project:
+    python rules_evaluation/evaluate_matrix.py [--workers 4] [--rules "Rules_Sup*_Conf*_v*.csv"]
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+DATA_DIR = os.path.join(PROJECT_ROOT, "Data")
+RULES_DIR = os.path.join(DATA_DIR, "rules")
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "matrix_run")
+
+EVALUATE_RULES_DIR = os.path.join(SCRIPT_DIR, "test_run_20260415")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, EVALUATE_RULES_DIR)
+import evaluate_rules as er  # noqa: E402
+from rca.batch import TransactionMatrix  # noqa: E402
+from rca.parallel import default_workers  # noqa: E402
+
+DATASET_PATTERN = "Master_Dataset_Gabungan*.csv"
+RULES_PATTERN = "Rules_Sup*_Conf*_v*.csv"
+RULES_NAME_RE = re.compile(r"Rules_Sup([\d.]+)_Conf([\d.]+)_v([\d.]+)\.csv$", re.IGNORECASE)
+
+# File yang menentukan isi data uji: jika berubah, cache dibuat ulang
+CACHE_SOURCES = [
+    os.path.join(EVALUATE_RULES_DIR, "evaluate_rules.py"),
+    os.path.join(PROJECT_ROOT, "rca", "tokenizer.py"),
+]
+
+
+def quiet(fn, *args):
+    """Panggil fungsi evaluate_rules tanpa log progres ke stdout"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+# ==========================================
+# 1. DATA UJI PER DATASET (preprocess + split sekali, di-cache)
+# ==========================================
+def cache_key(dataset_path):
+    h = hashlib.sha1()
+    st = os.stat(dataset_path)
+    h.update(f"{os.path.abspath(dataset_path)}|{st.st_size}|{st.st_mtime_ns}".encode())
+    h.update(f"{er.RANDOM_STATE}|{er.TEST_SIZE}|{er.TARGET_TEST_PER_CLASS}".encode())
+    for path in CACHE_SOURCES:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def prepare_test_set(dataset_path, cache_dir=CACHE_DIR, refresh=False):
+    """Return (path cache pickle data uji, dari_cache) untuk satu dataset"""
+    name = os.path.splitext(os.path.basename(dataset_path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}-{cache_key(dataset_path)}.pkl")
+    if os.path.exists(cache_path) and not refresh:
+        return cache_path, True
+
+    df_clean = quiet(er.preprocess_master_dataset, dataset_path)
+    _, df_test = quiet(er.split_and_balance, df_clean)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Cache lama dataset yang sama dibuang agar folder tidak menumpuk
+    for old in glob.glob(os.path.join(cache_dir, f"{name}-*.pkl")):
+        os.remove(old)
+    df_test[["Label", "items"]].to_pickle(cache_path)
+    return cache_path, False
+
+
+# ==========================================
+# 2. WORKER: satu task = satu rule file x semua dataset
+# ==========================================
+_WORKER_TEST_SETS = None
+
+
+def _init_worker(test_set_paths):
+    """Muat data uji & encode TransactionMatrix sekali per proses worker"""
+    global _WORKER_TEST_SETS
+    _WORKER_TEST_SETS = {}
+    for name, path in test_set_paths.items():
+        df_test = pd.read_pickle(path)
+        _WORKER_TEST_SETS[name] = (df_test, TransactionMatrix(df_test["items"]))
+
+
+def compute_metrics(y_actual, y_pred):
+    """Accuracy + precision/recall/F1 macro & weighted (sama dgn evaluate_and_output)"""
+    row = {"accuracy": accuracy_score(y_actual, y_pred)}
+    for average in ("macro", "weighted"):
+        p, r, f1, _ = precision_recall_fscore_support(
+            y_actual, y_pred, labels=er.TARGET_LABELS, average=average, zero_division=0
+        )
+        row.update({f"precision_{average}": p, f"recall_{average}": r, f"f1_{average}": f1})
+    return {k: round(float(v), 4) for k, v in row.items()}
+
+
+def evaluate_rule_file(rules_path):
+    """Evaluasi satu rule file ke semua dataset; return list baris hasil"""
+    sup, conf, version = RULES_NAME_RE.search(os.path.basename(rules_path)).groups()
+    t0 = time.perf_counter()
+    df_rules = quiet(er.load_rules, rules_path)
+    load_s = time.perf_counter() - t0
+
+    rows = []
+    for dataset, (df_test, transactions) in _WORKER_TEST_SETS.items():
+        t0 = time.perf_counter()
+        df_result, match_details = quiet(er.predict_with_rules, df_test, df_rules, transactions)
+        match_s = time.perf_counter() - t0
+        matched = sum(1 for d in match_details if d["matched"])
+        row = {
+            "dataset": dataset,
+            "rules_file": os.path.basename(rules_path),
+            "support": float(sup),
+            "confidence": float(conf),
+            "rules_version": version,
+            "n_rules": len(df_rules),
+            "test_samples": len(df_result),
+            "matched_count": matched,
+            "match_rate": round(matched / max(len(df_result), 1), 4),
+        }
+        row.update(compute_metrics(df_result["Label"].values, df_result["Prediksi"].values))
+        row.update({
+            "load_rules_ms": round(load_s * 1000, 1),
+            "match_ms": round(match_s * 1000, 1),
+            "rows_per_s": round(len(df_result) / match_s) if match_s > 0 else None,
+        })
+        rows.append(row)
+    return rows
+
+
+def run_matrix(rules_paths, test_set_paths, workers):
+    """Fan-out rule file ke worker; workers=1 -> langsung di proses ini"""
+    if workers <= 1:
+        _init_worker(test_set_paths)
+        return [row for path in rules_paths for row in evaluate_rule_file(path)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(test_set_paths,)
+    ) as pool:
+        results = pool.map(evaluate_rule_file, rules_paths)
+        return [row for rows in results for row in rows]
+
+
+# ==========================================
+# 3. OUTPUT TABEL GABUNGAN
+# ==========================================
+def to_markdown(df_matrix):
+    md = "## Tabel 4.X — Matriks Evaluasi Rules (semua grid x dataset)\n\n"
+    md += (
+        f"**Data Uji:** {er.TARGET_TEST_PER_CLASS}/kelas (split {1 - er.TEST_SIZE:.0%}/{er.TEST_SIZE:.0%}, "
+        f"random_state={er.RANDOM_STATE}) | urut F1 macro per dataset\n\n"
+    )
+    cols = [
+        "Rules", "Rules (n)", "Accuracy", "Precision (M)", "Recall (M)", "F1 (M)",
+        "F1 (W)", "Match Rate", "Baris/s",
+    ]
+    for dataset, group in df_matrix.groupby("dataset", sort=True):
+        md += f"### {dataset}\n\n"
+        md += "| " + " | ".join(f"**{c}**" for c in cols) + " |\n"
+        md += "|" + "---|" * len(cols) + "\n"
+        for _, r in group.iterrows():
+            md += (
+                f"| {r['rules_file']} | {r['n_rules']} | {r['accuracy']:.4f} | {r['precision_macro']:.4f} | "
+                f"{r['recall_macro']:.4f} | {r['f1_macro']:.4f} | {r['f1_weighted']:.4f} | "
+                f"{r['match_rate']:.2%} | {r['rows_per_s']:,} |\n"
+            )
+        md += "\n"
+    return md
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matriks evaluasi rule grid x dataset")
+    parser.add_argument("--rules", default=RULES_PATTERN, help="glob rule file di Data/rules/")
+    parser.add_argument("--datasets", default=DATASET_PATTERN, help="glob dataset di Data/")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--refresh-cache", action="store_true", help="preprocess & split ulang semua dataset")
+    args = parser.parse_args()
+
+    # Glob case-insensitive untuk suffix versi (v3.0 / V2.0)
+    rules_paths = sorted(
+        p for p in glob.glob(os.path.join(RULES_DIR, "*.csv"))
+        if fnmatch.fnmatch(os.path.basename(p).lower(), args.rules.lower())
+        and RULES_NAME_RE.search(os.path.basename(p))
+    )
+    dataset_paths = sorted(glob.glob(os.path.join(DATA_DIR, args.datasets)))
+    workers = max(1, min(args.workers or default_workers(), len(rules_paths) or 1))
+
+    print("=" * 70)
+    print("  MATRIKS EVALUASI RULES FP-GROWTH")
+    print(f"  {len(rules_paths)} rule file x {len(dataset_paths)} dataset | workers: {workers}")
+    print("=" * 70)
+
+    t_start = time.perf_counter()
+    test_set_paths = {}
+    for path in dataset_paths:
+        t0 = time.perf_counter()
+        cache_path, cached = prepare_test_set(path, refresh=args.refresh_cache)
+        name = os.path.splitext(os.path.basename(path))[0]
+        test_set_paths[name] = cache_path
+        status = "cache" if cached else "preprocess + split"
+        print(f"[DATA] {name}: {status} ({(time.perf_counter() - t0) * 1000:.0f}ms)")
+    t_prepare = time.perf_counter() - t_start
+
+    t0 = time.perf_counter()
+    rows = run_matrix(rules_paths, test_set_paths, workers)
+    t_eval = time.perf_counter() - t0
+
+    df_matrix = pd.DataFrame(rows)
+    if not df_matrix.empty:
+        df_matrix = df_matrix.sort_values(
+            ["dataset", "f1_macro", "accuracy", "rules_file"], ascending=[True, False, False, True]
+        ).reset_index(drop=True)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    csv_path = os.path.join(args.output_dir, "evaluation_matrix.csv")
+    md_path = os.path.join(args.output_dir, "evaluation_matrix.md")
+    json_path = os.path.join(args.output_dir, "evaluation_matrix.json")
+    df_matrix.to_csv(csv_path, index=False)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(to_markdown(df_matrix) if not df_matrix.empty else "")
+    summary = {
+        "timestamp": datetime.now().isoformat(),
+        "random_state": er.RANDOM_STATE,
+        "test_size": er.TEST_SIZE,
+        "test_per_class": er.TARGET_TEST_PER_CLASS,
+        "datasets": {name: os.path.basename(p) for name, p in test_set_paths.items()},
+        "rules_files": [os.path.basename(p) for p in rules_paths],
+        "workers": workers,
+        "prepare_s": round(t_prepare, 2),
+        "evaluate_s": round(t_eval, 2),
+        "results": df_matrix.to_dict("records"),
+    }
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"\nPreprocess/split: {t_prepare:.2f}s | Evaluasi {len(rows)} kombinasi: {t_eval:.2f}s")
+    if not df_matrix.empty:
+        print("\nRule set terbaik per dataset (F1 macro):")
+        best = df_matrix.groupby("dataset", sort=True).head(1)
+        print(best[["dataset", "rules_file", "n_rules", "accuracy", "f1_macro", "match_rate", "rows_per_s"]]
+              .to_string(index=False))
+    print(f"\n[OK] {csv_path}\n[OK] {md_path}\n[OK] {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,6 @@
 import pandas as pd
 import numpy as np
 import ast
-import re
 import os
 import json
 from datetime import datetime
@@ -19,7 +18,7 @@ from sklearn.metrics import (
     recall_score,
     f1_score,
 )
-from collections import defaultdict
+import sys
 
 # ==========================================
 # KONFIGURASI PATH
@@ -32,6 +31,10 @@ MASTER_DATASET = os.path.join(DATA_DIR, "Master_Dataset_Gabungan_v3.0.csv")
 RULES_FILE = os.path.join(DATA_DIR, "rules", "Rules_Sup0.01_Conf0.3_v3.0.csv")
 OUTPUT_DIR = SCRIPT_DIR  # Output to the same test_run folder
 
+sys.path.insert(0, PROJECT_ROOT)
+from rca.batch import TransactionMatrix  # noqa: E402
+from rca.tokenizer import MINING_STOPWORDS, MINING_TOKENIZER  # noqa: E402
+
 TARGET_LABELS = [
     "NORMAL",
     "LINK_FAILURE",
@@ -45,39 +48,17 @@ TEST_SIZE = 0.20
 TARGET_TEST_PER_CLASS = 500  # 20% of 2500 = 500 per class, total ~2500
 
 # ==========================================
-# 1. STOPWORDS (sama persis dengan 02_data_cleaning.py)
+# 1-2. STOPWORDS & PREPROCESSING (rca.tokenizer mode "mining",
+#      implementasi yang sama dengan 02_data_cleaning.py)
 # ==========================================
-STOPWORDS = {
-    "ether1", "ether2", "ether3", "ether4", "ether5", "ether6", "ether7",
-    "loading", "info", "input", "in", "out", "message", "log", "by",
-    "from", "to", "via", "changed", "set", "connection-state", "new",
-    "time", "date", "identity", "forward", "zone", "firewall", "router",
-    "system", "script", "debug", "topics", "active", "inactive",
-    "assigned", "deassigned", "address", "status", "state", "detected",
-    "using", "packet", "rule", "up", "running", "full", "established",
-    "connected", "reachable", "designated", "backup", "installed",
-    "added", "exchange", "route", "version", "change", "created",
-    "init", "twoway", "2-way", "exstart", "waiting", "negotiation",
-    "lsdb", "bdr", "dr", "instance", "account", "user", "logged",
-    "rebooted", "shutdown", "console", "ttys0", "api", "rest-api",
-    "dhcp", "dhcp-client", "monitor", "event", "size", "simple",
-    "got", "other", "monitor", "host", "rto",
-    "153", "130", "132", "133", "168", "192", "255",
-}
+STOPWORDS = MINING_STOPWORDS
 
 
-# ==========================================
-# 2. FUNGSI PREPROCESSING (identik dgn pipeline)
-# ==========================================
 def clean_text(text):
     """Cleaning + Case Folding + Stopwords Removal (identik dgn 02_data_cleaning.py)"""
     if not isinstance(text, str):
         return []
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-    words = text.split()
-    filtered_words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-    return filtered_words
+    return MINING_TOKENIZER.tokenize(text)
 
 
 def preprocess_master_dataset(filepath):
@@ -99,17 +80,8 @@ def preprocess_master_dataset(filepath):
     for lbl, cnt in df[label_col].value_counts().items():
         print(f"        {lbl}: {cnt}")
 
-    # Gabungkan kolom teks (sama seperti 02_data_cleaning.py)
-    df["full_text"] = (
-        df["source_router"].astype(str)
-        + " "
-        + df["topics"].astype(str)
-        + " "
-        + df["message"].astype(str)
-    )
-
-    # Terapkan cleaning
-    df["items"] = df["full_text"].apply(clean_text)
+    # Gabungkan kolom teks + cleaning (sama seperti 02_data_cleaning.py)
+    df["items"] = MINING_TOKENIZER.tokenize_frame(df)
 
     # Hapus baris kosong setelah cleaning
     initial_len = len(df)
@@ -187,9 +159,20 @@ def load_rules(rules_path):
     print(f"\n[3/5] Memuat Rules: {os.path.basename(rules_path)}")
     df_rules = pd.read_csv(rules_path)
     print(f"      Total Rules Awal: {len(df_rules)}")
+    return prepare_rules(df_rules)
+
+
+def prepare_rules(df_rules):
+    """
+    Parse rules FP-Growth (dari CSV atau langsung dari association_rules):
+    ekstrak diagnosis, bersihkan antecedents, urutkan untuk matching.
+    """
+    df_rules = df_rules.copy()
 
     # Parse antecedents dan consequents dari string representasi list
     def parse_list_str(s):
+        if isinstance(s, (list, tuple, set, frozenset)):
+            return list(s)
         if pd.isna(s):
             return []
         try:
@@ -221,13 +204,13 @@ def load_rules(rules_path):
         print(f"        {lbl}: {cnt} rules")
 
     # Hapus label dari antecedents (pastikan antecedent murni berisi kata kunci)
-    def clean_antecedents(row):
-        antecedents = row["antecedents_parsed"]
+    # (map per kolom, bukan apply axis=1: aman untuk file grid tanpa rule valid)
+    def clean_antecedents(antecedents):
         # Buang elemen yang merupakan label target
         cleaned = [item for item in antecedents if str(item).upper() not in TARGET_LABELS]
         return set(cleaned)
 
-    df_rules["antecedents_set"] = df_rules.apply(clean_antecedents, axis=1)
+    df_rules["antecedents_set"] = df_rules["antecedents_parsed"].map(clean_antecedents)
 
     # Filter rules dengan antecedents kosong
     df_rules = df_rules[df_rules["antecedents_set"].map(len) > 0]
@@ -244,92 +227,50 @@ def load_rules(rules_path):
 # ==========================================
 # 5. PATTERN MATCHING: INFERENSI
 # ==========================================
-def predict_with_rules(df_test, df_rules):
+def predict_with_rules(df_test, df_rules, transactions=None):
     """
     Pattern matching: untuk setiap log uji, cari rule yang antecedent-nya
     subset dari items log, lalu ambil prediksi dengan confidence tertinggi.
+    transactions: TransactionMatrix dari df_test["items"] yang sudah di-encode
+    (opsional; evaluasi banyak rule file cukup encode data uji sekali).
     """
     print(f"\n[4/5] Pattern Matching pada {len(df_test)} data uji...")
 
-    # Pre-convert rules ke list of dicts untuk kecepatan
-    rules_list = []
-    for _, rule in df_rules.iterrows():
-        rules_list.append({
-            "antecedents": rule["antecedents_set"],
-            "diagnosis": rule["diagnosis"],
-            "confidence": float(rule.get("confidence", 0)),
-            "lift": float(rule.get("lift", 0)),
-            "support": float(rule.get("support", 0)),
-        })
-
-    # Build inverted index untuk kecepatan
-    token_to_rules = defaultdict(list)
-    for idx, rule in enumerate(rules_list):
-        for token in rule["antecedents"]:
-            token_to_rules[token].append(idx)
-
-    predictions = []
-    match_count = 0
-    no_match_count = 0
-    match_details = []  # Untuk analisis detail
-
-    for i, (_, row) in enumerate(df_test.iterrows()):
-        items = row["items"]
-        if isinstance(items, str):
-            items = ast.literal_eval(items)
-        items_set = set(items)
-
-        # Cari candidate rules via inverted index
-        candidate_indices = set()
-        for token in items_set:
-            if token in token_to_rules:
-                for rule_idx in token_to_rules[token]:
-                    candidate_indices.add(rule_idx)
-
-        # Cek matching: antecedent subset dari items
-        best_rule = None
-        best_conf = -1.0
-        best_lift = -1.0
-
-        for rule_idx in candidate_indices:
-            rule = rules_list[rule_idx]
-            if rule["antecedents"].issubset(items_set):
-                conf = rule["confidence"]
-                lift = rule["lift"]
-                # Pilih rule terbaik: confidence tertinggi, tie-break oleh lift
-                if conf > best_conf or (conf == best_conf and lift > best_lift):
-                    best_rule = rule
-                    best_conf = conf
-                    best_lift = lift
-
-        if best_rule is not None:
-            predictions.append(best_rule["diagnosis"])
-            match_count += 1
-            match_details.append({
-                "actual": row["Label"],
-                "predicted": best_rule["diagnosis"],
-                "confidence": best_conf,
-                "lift": best_lift,
-                "matched": True,
-            })
-        else:
-            # Tidak ada rule yang cocok — fallback: prediksi "NORMAL"
-            # (Karena jika tidak ada anomali terdeteksi, asumsi NORMAL)
-            predictions.append("NORMAL")
-            no_match_count += 1
-            match_details.append({
-                "actual": row["Label"],
-                "predicted": "NORMAL",
-                "confidence": 0.0,
-                "lift": 0.0,
-                "matched": False,
-            })
-
-        if (i + 1) % 500 == 0:
-            print(f"      Progres: {i+1}/{len(df_test)} data diproses...")
+    # Batch matcher (rca.batch): transaksi CSR x matriks token-rule, ranking
+    # confidence desc, lift desc, tie -> urutan rule di df_rules (sama dengan loop lama)
+    if transactions is None:
+        transactions = TransactionMatrix(
+            ast.literal_eval(items) if isinstance(items, str) else items
+            for items in df_test["items"]
+        )
+    best = transactions.best_rules(
+        df_rules["antecedents_set"], df_rules["confidence"], df_rules["lift"]
+    )
+    matched = best >= 0
+    rule_pos = np.where(matched, best, 0)
+
+    # Tidak ada rule yang cocok — fallback: prediksi "NORMAL"
+    # (Karena jika tidak ada anomali terdeteksi, asumsi NORMAL)
+    if len(df_rules):
+        predictions = np.where(matched, df_rules["diagnosis"].to_numpy(dtype=object)[rule_pos], "NORMAL")
+        confidence = np.where(matched, df_rules["confidence"].to_numpy(dtype=float)[rule_pos], 0.0)
+        lift = np.where(matched, df_rules["lift"].to_numpy(dtype=float)[rule_pos], 0.0)
+    else:
+        predictions = np.full(len(best), "NORMAL", dtype=object)
+        confidence = lift = np.zeros(len(best))
+    match_count = int(matched.sum())
+    no_match_count = len(best) - match_count
+
+    # Detail per baris untuk analisis (actual, predicted, confidence, lift, matched)
+    match_details = [
+        {"actual": a, "predicted": p, "confidence": c, "lift": l, "matched": m}
+        for a, p, c, l, m in zip(
+            df_test["Label"].tolist(), predictions.tolist(), confidence.tolist(), lift.tolist(), matched.tolist()
+        )
+    ]
 
     df_test = df_test.copy()
-    df_test["Prediksi"] = predictions
+    df_test["Prediksi"] = list(predictions)
 
     print(f"      Selesai! Matched: {match_count}, No-Match (fallback NORMAL): {no_match_count}")
 
@@ -337,7 +278,85 @@ def predict_with_rules(df_test, df_rules):
 
 
 # ==========================================
-# 6. EVALUASI & OUTPUT
+# 6. BOOTSTRAP CONFIDENCE INTERVAL
+# ==========================================
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_LEVEL = 0.95
+BOOTSTRAP_CHUNK = 500  # resample per blok matriks indeks (~n_test x 500 int64)
+
+
+def metrics_from_confusion(cm):
+    """
+    Metrik dari tumpukan confusion matrix (..., k, k), baris = aktual.
+    Definisi sama dengan sklearn (labels=TARGET_LABELS, zero_division=0):
+    macro = rata-rata semua kelas, weighted = bobot support kelas aktual.
+    """
+    cm = cm.astype(np.float64)
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    actual = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    total = actual.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(actual > 0, tp / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        weights = actual / total[..., None]
+    metrics = {
+        "accuracy": tp.sum(axis=-1) / total,
+        "precision_macro": precision.mean(axis=-1),
+        "recall_macro": recall.mean(axis=-1),
+        "f1_macro": f1.mean(axis=-1),
+        "precision_weighted": (precision * weights).sum(axis=-1),
+        "recall_weighted": (recall * weights).sum(axis=-1),
+        "f1_weighted": (f1 * weights).sum(axis=-1),
+    }
+    for i, label in enumerate(TARGET_LABELS):
+        metrics[f"precision_{label}"] = precision[..., i]
+        metrics[f"recall_{label}"] = recall[..., i]
+        metrics[f"f1_{label}"] = f1[..., i]
+    return metrics
+
+
+def bootstrap_ci(y_actual, y_pred, n_resamples=BOOTSTRAP_RESAMPLES, level=BOOTSTRAP_LEVEL,
+                 seed=RANDOM_STATE):
+    """
+    Confidence interval bootstrap (percentile) untuk semua metrik evaluasi.
+    Resample dibuat sebagai matriks indeks (resample x n_test), lalu
+    confusion matrix semua resample dihitung sekaligus dengan satu bincount
+    per blok, tanpa loop Python per resample.
+    Return dict metrik -> [batas bawah, batas atas].
+    """
+    k = len(TARGET_LABELS)
+    label_ids = {label: i for i, label in enumerate(TARGET_LABELS)}
+    actual = np.array([label_ids[y] for y in y_actual], dtype=np.int64)
+    pred = np.array([label_ids[y] for y in y_pred], dtype=np.int64)
+    pair = actual * k + pred
+    n = len(pair)
+
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for start in range(0, n_resamples, BOOTSTRAP_CHUNK):
+        size = min(BOOTSTRAP_CHUNK, n_resamples - start)
+        idx = rng.integers(0, n, size=(size, n))
+        # Offset per resample agar satu bincount menghasilkan (size, k, k)
+        codes = pair[idx] + (np.arange(size) * k * k)[:, None]
+        cm = np.bincount(codes.ravel(), minlength=size * k * k).reshape(size, k, k)
+        for name, values in metrics_from_confusion(cm).items():
+            samples.setdefault(name, []).append(values)
+
+    alpha = (1 - level) / 2
+    return {
+        name: [round(float(v), 4) for v in np.quantile(np.concatenate(chunks), [alpha, 1 - alpha])]
+        for name, chunks in samples.items()
+    }
+
+
+def format_ci(value, ci):
+    return f"{value:.4f} [{ci[0]:.4f}–{ci[1]:.4f}]"
+
+
+# ==========================================
+# 7. EVALUASI & OUTPUT
 # ==========================================
 def evaluate_and_output(df_result, match_details, output_dir):
     """Generate Confusion Matrix & Metrics, simpan ke file."""
@@ -382,6 +401,10 @@ def evaluate_and_output(df_result, match_details, output_dir):
 
     metrics_df = pd.DataFrame(metrics_data)
 
+    # ---- BOOTSTRAP CI (resample pasangan aktual/prediksi) ----
+    ci = bootstrap_ci(y_actual, y_pred)
+    ci_label = f"CI {BOOTSTRAP_LEVEL:.0%} bootstrap ({BOOTSTRAP_RESAMPLES} resample)"
+
     print("\n" + "=" * 70)
     print("REKAPITULASI METRIK EVALUASI")
     print("=" * 70)
@@ -389,6 +412,9 @@ def evaluate_and_output(df_result, match_details, output_dir):
     print(metrics_df.to_string(index=False))
     print(f"\nRata-rata Macro:    Precision={precision_macro:.4f}  Recall={recall_macro:.4f}  F1={f1_macro:.4f}")
     print(f"Rata-rata Weighted: Precision={precision_weighted:.4f}  Recall={recall_weighted:.4f}  F1={f1_weighted:.4f}")
+    print(f"\n{ci_label}:")
+    for name in ("accuracy", "precision_macro", "recall_macro", "f1_macro", "f1_weighted"):
+        print(f"  {name:<18} [{ci[name][0]:.4f}, {ci[name][1]:.4f}]")
 
     # ==========================================
     # GENERATE MARKDOWN OUTPUT
@@ -406,14 +432,28 @@ def evaluate_and_output(df_result, match_details, output_dir):
     # --- Markdown: Metrics Table ---
     md_metrics = "## Tabel 4.X — Rekapitulasi Metrik Evaluasi\n\n"
     md_metrics += "**Konfigurasi:** Support = 0.01, Confidence = 0.30 | Data Uji = 2.500 baris seimbang (500/kelas)\n\n"
+    md_metrics += f"Nilai [bawah–atas] = {ci_label}, percentile.\n\n"
     md_metrics += "| **Kelas** | **Precision** | **Recall** | **F1-Score** |\n"
     md_metrics += "|---|---|---|---|\n"
-    for _, row in metrics_df.iterrows():
-        md_metrics += f"| {row['Kelas']} | {row['Precision']:.4f} | {row['Recall']:.4f} | {row['F1-Score']:.4f} |\n"
-
-    md_metrics += f"| **Rata-rata (Macro)** | **{precision_macro:.4f}** | **{recall_macro:.4f}** | **{f1_macro:.4f}** |\n"
-    md_metrics += f"| **Rata-rata (Weighted)** | **{precision_weighted:.4f}** | **{recall_weighted:.4f}** | **{f1_weighted:.4f}** |\n"
-    md_metrics += f"\n**Accuracy Keseluruhan: {accuracy:.4f} ({accuracy*100:.2f}%)**\n"
+    for i, label in enumerate(TARGET_LABELS):
+        md_metrics += (
+            f"| {label} | {format_ci(precision_per_class[i], ci[f'precision_{label}'])} | "
+            f"{format_ci(recall_per_class[i], ci[f'recall_{label}'])} | "
+            f"{format_ci(f1_per_class[i], ci[f'f1_{label}'])} |\n"
+        )
+
+    md_metrics += (
+        f"| **Rata-rata (Macro)** | **{format_ci(precision_macro, ci['precision_macro'])}** | "
+        f"**{format_ci(recall_macro, ci['recall_macro'])}** | **{format_ci(f1_macro, ci['f1_macro'])}** |\n"
+    )
+    md_metrics += (
+        f"| **Rata-rata (Weighted)** | **{format_ci(precision_weighted, ci['precision_weighted'])}** | "
+        f"**{format_ci(recall_weighted, ci['recall_weighted'])}** | **{format_ci(f1_weighted, ci['f1_weighted'])}** |\n"
+    )
+    md_metrics += (
+        f"\n**Accuracy Keseluruhan: {accuracy:.4f} ({accuracy*100:.2f}%)** "
+        f"— {ci_label}: [{ci['accuracy'][0]:.4f}–{ci['accuracy'][1]:.4f}]\n"
+    )
 
     # ==========================================
     # SIMPAN FILE OUTPUT
@@ -455,6 +495,13 @@ def evaluate_and_output(df_result, match_details, output_dir):
         "f1_weighted": round(f1_weighted, 4),
         "matched_count": sum(1 for d in match_details if d["matched"]),
         "no_match_count": sum(1 for d in match_details if not d["matched"]),
+        "bootstrap": {
+            "method": "percentile",
+            "resamples": BOOTSTRAP_RESAMPLES,
+            "level": BOOTSTRAP_LEVEL,
+            "seed": RANDOM_STATE,
+        },
+        "confidence_intervals": ci,
     }
     summary_path = os.path.join(output_dir, "evaluation_summary.json")
     with open(summary_path, "w", encoding="utf-8") as f:
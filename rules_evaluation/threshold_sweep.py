@@ -0,0 +1,292 @@
+# ==========================================
+# TUNING AMBANG PRIORITAS (FATAL / CRITICAL / DDoS COUNT)
+# ==========================================
+"""
+Sweep ambang prioritas dashboard terhadap data berlabel.
+
+Dashboard memberi prioritas dari lift rule terbaik (rca.diagnosis:
+FATAL_LIFT = 6.0, CRITICAL_LIFT = 3.0), override memberi prioritas tetap,
+dan issue DDoS dibuang jika jumlahnya < DDOS_THRESHOLD_COUNT = 20
+(dashboard.filter_issues). Skrip ini:
+
+1. Menjalankan pipeline dashboard (tokenizer + rule engine + override) SEKALI
+   ke dataset berlabel dan menyimpan per baris: diagnosis, confidence, lift,
+   prioritas override dan window waktu (cache di rules_evaluation/.cache/).
+2. Men-sweep grid ambang lift FATAL, lift CRITICAL, confidence minimum dan
+   jumlah minimum DDoS per window dengan operasi array: mask level prioritas
+   (pasangan lift x baris) dikalikan matriks baris valid (confidence x DDoS
+   count x baris), jadi seluruh grid = beberapa perkalian matriks.
+3. Melaporkan volume alert dan precision/recall per kombinasi ambang.
+
+Alert = baris terdiagnosis yang lolos confidence minimum dan filter DDoS;
+"kritis" = prioritas FATAL atau CRITICAL (metrik "Peringatan Kritis" di
+dashboard). Benar = diagnosis == map_diagnosis(Label).
+
+Jalankan dari root project:
+    python rules_evaluation/threshold_sweep.py [--dataset Data/...csv] [--window 60] [--refresh]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "threshold_sweep")
+MASTER_DATASET = os.path.join(PROJECT_ROOT, "Data", "Master_Dataset_Gabungan_v3.0.csv")
+
+sys.path.insert(0, PROJECT_ROOT)
+from rca.diagnosis import CRITICAL_LIFT, FATAL_LIFT, Diagnoser  # noqa: E402
+from rca.rule_index import load_engine  # noqa: E402
+from rca.rules import ACTIVE_RULES_PATH, map_diagnosis  # noqa: E402
+
+# Nilai produksi saat ini (dashboard.DDOS_THRESHOLD_COUNT tidak di-import
+# karena dashboard.py langsung menjalankan Streamlit saat di-import)
+DDOS_THRESHOLD_COUNT = 20
+DDOS_DIAGNOSIS = "DDoS"
+
+FATAL_GRID = [4.0, 5.0, 6.0, 7.0, 8.0, 10.0]
+CRITICAL_GRID = [1.5, 2.0, 2.5, 3.0, 4.0, 5.0]
+CONFIDENCE_GRID = [0.0, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+DDOS_GRID = [1, 5, 10, 20, 50, 100]
+
+
+# ==========================================
+# 1. SIMPAN HASIL MATCHING SEKALI
+# ==========================================
+def store_match_results(dataset_path, rules_path, window_s):
+    """
+    Jalankan pipeline dashboard ke dataset berlabel. Return DataFrame per
+    baris: label, diagnosis, confidence, lift (NaN jika dari override/tanpa
+    rule), override_priority ("" jika bukan override) dan window.
+    """
+    df = pd.read_csv(dataset_path)
+    messages = df["message"].astype(str).tolist()
+    devices = df["source_router"].fillna("").astype(str).tolist() if "source_router" in df else [""] * len(df)
+
+    diagnoser = Diagnoser(load_engine(rules_path))
+    tokens = diagnoser.tokenizer.tokenize_batch(messages)
+    best_rules = diagnoser.engine.match_many(tokens)
+    overrides = diagnoser.overrides
+
+    diagnosis, confidence, lift, override_priority = [], [], [], []
+    for msg, dev, rule in zip(messages, devices, best_rules):
+        entry = overrides.match(msg.lower(), overrides.device_flags(dev))
+        if entry is not None:
+            diagnosis.append(entry["diagnosis"])
+            confidence.append(entry["confidence"])
+            lift.append(np.nan)
+            override_priority.append(entry["priority"])
+        elif rule is not None:
+            diagnosis.append(rule["final_diagnosis"])
+            confidence.append(rule["confidence"])
+            lift.append(rule["lift"])
+            override_priority.append("")
+        else:
+            diagnosis.append(None)
+            confidence.append(np.nan)
+            lift.append(np.nan)
+            override_priority.append("")
+
+    # Window waktu untuk hitungan DDoS per analisis (baris tanpa waktu valid -> satu window)
+    times = pd.to_datetime(df["time"], errors="coerce") if "time" in df else pd.Series(pd.NaT, index=df.index)
+    seconds = (times - times.min()).dt.total_seconds()
+    window = np.where(seconds.notna(), seconds.fillna(0) // window_s, -1).astype(np.int64)
+
+    return pd.DataFrame({
+        "label": df["Label"].map(map_diagnosis).to_numpy(dtype=object),
+        "diagnosis": np.array(diagnosis, dtype=object),
+        "confidence": pd.to_numeric(pd.Series(confidence, dtype=object), errors="coerce").to_numpy(dtype=float),
+        "lift": np.array(lift, dtype=float),
+        "override_priority": np.array(override_priority, dtype=object),
+        "window": window,
+    })
+
+
+def load_match_results(dataset_path, rules_path, window_s, refresh=False):
+    name = os.path.splitext(os.path.basename(dataset_path))[0]
+    rules_name = os.path.splitext(os.path.basename(rules_path))[0]
+    cache_path = os.path.join(CACHE_DIR, f"matches-{name}-{rules_name}-w{window_s:g}.pkl")
+    stamp = max(os.path.getmtime(dataset_path), os.path.getmtime(rules_path))
+    if not refresh and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= stamp:
+        return pd.read_pickle(cache_path), True
+    results = store_match_results(dataset_path, rules_path, window_s)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    results.to_pickle(cache_path)
+    return results, False
+
+
+# ==========================================
+# 2. SWEEP VEKTOR
+# ==========================================
+def sweep(results, fatal_grid, critical_grid, confidence_grid, ddos_grid):
+    """
+    Evaluasi semua kombinasi ambang (pasangan lift dengan critical <= fatal).
+    Return DataFrame satu baris per kombinasi.
+    """
+    diagnosis = results["diagnosis"].to_numpy(dtype=object)
+    label = results["label"].to_numpy(dtype=object)
+    conf = results["confidence"].to_numpy(dtype=float)
+    lift = results["lift"].to_numpy(dtype=float)
+    override_prio = results["override_priority"].to_numpy(dtype=object)
+    window = results["window"].to_numpy()
+
+    diagnosed = pd.notna(diagnosis)
+    override = override_prio != ""
+    from_rule = diagnosed & ~override
+    correct = diagnosed & (diagnosis == label)
+    is_ddos = diagnosis == DDOS_DIAGNOSIS
+    n_anomaly = int(pd.notna(label).sum())
+
+    # Level prioritas per pasangan ambang lift: (P, N)
+    pairs = [(f, c) for f in fatal_grid for c in critical_grid if c <= f]
+    fatal_thr = np.array([p[0] for p in pairs])[:, None]
+    critical_thr = np.array([p[1] for p in pairs])[:, None]
+    lift_filled = np.where(from_rule, lift, -np.inf)[None, :]
+    fatal = (override & (override_prio == "FATAL"))[None, :] | (lift_filled >= fatal_thr)
+    critical_plus = fatal | (override & (override_prio == "CRITICAL"))[None, :] | (lift_filled >= critical_thr)
+
+    # Baris valid per (confidence, ddos count): (C, D, N)
+    conf_ok = diagnosed[None, :] & (override[None, :] | (np.nan_to_num(conf, nan=-1.0)[None, :] >= np.array(confidence_grid)[:, None]))
+    _, window_idx = np.unique(window, return_inverse=True)
+    n_windows = int(window_idx.max()) + 1 if len(window_idx) else 0
+    ddos_counts = np.stack([
+        np.bincount(window_idx[ok & is_ddos], minlength=n_windows) for ok in conf_ok
+    ]) if n_windows else np.zeros((len(confidence_grid), 0), dtype=np.int64)
+    row_ddos_count = ddos_counts[:, window_idx]  # (C, N)
+    ddos_ok = ~is_ddos[None, None, :] | (row_ddos_count[:, None, :] >= np.array(ddos_grid)[None, :, None])
+    valid = (conf_ok[:, None, :] & ddos_ok).reshape(-1, len(diagnosis)).astype(np.float32)  # (C*D, N)
+
+    # Semua hitungan = perkalian matriks (P, N) x (N, C*D)
+    crit_alerts = critical_plus.astype(np.float32) @ valid.T
+    crit_correct = (critical_plus & correct[None, :]).astype(np.float32) @ valid.T
+    crit_false_normal = (critical_plus & pd.isna(label)[None, :]).astype(np.float32) @ valid.T
+    fatal_alerts = fatal.astype(np.float32) @ valid.T
+    fatal_correct = (fatal & correct[None, :]).astype(np.float32) @ valid.T
+    alerts = valid.sum(axis=1)
+    alerts_correct = valid @ correct.astype(np.float32)
+    ddos_alerts = valid @ is_ddos.astype(np.float32)
+    ddos_correct = valid @ (is_ddos & correct).astype(np.float32)
+
+    cd = [(c, d) for c in confidence_grid for d in ddos_grid]
+    n_rows = len(diagnosis)
+
+    def ratio(num, den):
+        return np.divide(num, den, out=np.zeros_like(num, dtype=float), where=den > 0)
+
+    out = pd.DataFrame({
+        "fatal_lift": np.repeat(fatal_thr[:, 0], len(cd)),
+        "critical_lift": np.repeat(critical_thr[:, 0], len(cd)),
+        "min_confidence": np.tile([c for c, _ in cd], len(pairs)),
+        "ddos_min_count": np.tile([d for _, d in cd], len(pairs)),
+        "alerts": np.tile(alerts, len(pairs)).astype(np.int64),
+        "critical_alerts": crit_alerts.ravel().astype(np.int64),
+        "fatal_alerts": fatal_alerts.ravel().astype(np.int64),
+        "alerts_per_1k": np.round(np.tile(alerts, len(pairs)) / max(n_rows, 1) * 1000, 1),
+        "precision_all": np.round(np.tile(ratio(alerts_correct, alerts), len(pairs)), 4),
+        "precision_critical": np.round(ratio(crit_correct, crit_alerts).ravel(), 4),
+        "precision_fatal": np.round(ratio(fatal_correct, fatal_alerts).ravel(), 4),
+        "recall_critical": np.round(crit_correct.ravel() / max(n_anomaly, 1), 4),
+        "critical_on_normal": crit_false_normal.ravel().astype(np.int64),
+        "ddos_alerts": np.tile(ddos_alerts, len(pairs)).astype(np.int64),
+        "ddos_precision": np.round(np.tile(ratio(ddos_correct, ddos_alerts), len(pairs)), 4),
+    })
+    return out
+
+
+def pareto_front(df_sweep, coverage="recall_critical", quality="precision_critical"):
+    """
+    Kombinasi yang tidak dikalahkan: tidak ada kombinasi lain dengan recall
+    dan precision alert kritis yang sama-sama lebih tinggi.
+    """
+    ranked = df_sweep.sort_values([coverage, quality, "critical_alerts"], ascending=[False, False, True])
+    best_before = ranked[quality].cummax().shift(fill_value=-1.0)
+    front = ranked[ranked[quality] > best_before]
+    return front.sort_values(coverage)
+
+
+def to_markdown(df_sweep, front, current):
+    cols = [
+        "fatal_lift", "critical_lift", "min_confidence", "ddos_min_count", "alerts", "critical_alerts",
+        "precision_all", "precision_critical", "recall_critical", "critical_on_normal", "ddos_precision",
+    ]
+
+    def table(df):
+        md = "| " + " | ".join(f"**{c}**" for c in cols) + " |\n"
+        md += "|" + "---|" * len(cols) + "\n"
+        for _, r in df[cols].iterrows():
+            md += "| " + " | ".join(f"{v:g}" if isinstance(v, float) else str(v) for v in r) + " |\n"
+        return md
+
+    md = "## Sweep Ambang Prioritas — Volume Alert vs Precision\n\n"
+    md += f"Total kombinasi: {len(df_sweep)}\n\n### Ambang produksi saat ini\n\n" + table(current)
+    md += "\n### Pareto front (recall_critical vs precision_critical)\n\n" + table(front)
+    return md
+
+
+def parse_grid(text):
+    return [float(v) for v in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep ambang prioritas FATAL/CRITICAL/DDoS")
+    parser.add_argument("--dataset", default=MASTER_DATASET)
+    parser.add_argument("--rules", default=ACTIVE_RULES_PATH)
+    parser.add_argument("--window", type=float, default=60.0, help="ukuran window hitungan DDoS (detik)")
+    parser.add_argument("--fatal", default=",".join(map(str, FATAL_GRID)))
+    parser.add_argument("--critical", default=",".join(map(str, CRITICAL_GRID)))
+    parser.add_argument("--confidence", default=",".join(map(str, CONFIDENCE_GRID)))
+    parser.add_argument("--ddos", default=",".join(map(str, DDOS_GRID)))
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--refresh", action="store_true", help="hitung ulang hasil matching")
+    args = parser.parse_args()
+
+    rules_path = os.path.join(PROJECT_ROOT, args.rules)
+    t0 = time.perf_counter()
+    results, cached = load_match_results(args.dataset, rules_path, args.window, args.refresh)
+    t_store = time.perf_counter() - t0
+    print(
+        f"Hasil matching: {len(results)} baris, {int(results['diagnosis'].notna().sum())} terdiagnosis "
+        f"({'cache' if cached else 'dihitung'}, {t_store:.2f}s)"
+    )
+
+    # Nilai produksi selalu ikut di grid agar bisa dibandingkan
+    fatal_grid = sorted(set(parse_grid(args.fatal)) | {FATAL_LIFT})
+    critical_grid = sorted(set(parse_grid(args.critical)) | {CRITICAL_LIFT})
+    confidence_grid = sorted(set(parse_grid(args.confidence)) | {0.0})
+    ddos_grid = sorted(set(int(v) for v in parse_grid(args.ddos)) | {DDOS_THRESHOLD_COUNT})
+
+    t0 = time.perf_counter()
+    df_sweep = sweep(results, fatal_grid, critical_grid, confidence_grid, ddos_grid)
+    t_sweep = time.perf_counter() - t0
+    print(f"Sweep {len(df_sweep)} kombinasi ambang: {t_sweep * 1000:.0f}ms")
+
+    current = df_sweep[
+        (df_sweep["fatal_lift"] == FATAL_LIFT) & (df_sweep["critical_lift"] == CRITICAL_LIFT)
+        & (df_sweep["min_confidence"] == 0.0) & (df_sweep["ddos_min_count"] == DDOS_THRESHOLD_COUNT)
+    ]
+    front = pareto_front(df_sweep)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    csv_path = os.path.join(args.output_dir, "threshold_sweep.csv")
+    md_path = os.path.join(args.output_dir, "threshold_sweep.md")
+    df_sweep.to_csv(csv_path, index=False)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(to_markdown(df_sweep, front, current))
+
+    show = ["fatal_lift", "critical_lift", "min_confidence", "ddos_min_count", "critical_alerts",
+            "precision_critical", "recall_critical", "critical_on_normal"]
+    print("\nAmbang produksi saat ini:")
+    print(current[show].to_string(index=False))
+    print("\nPareto front (recall_critical vs precision_critical):")
+    print(front[show].to_string(index=False))
+    print(f"\n[OK] {csv_path}\n[OK] {md_path}")
+
+
+if __name__ == "__main__":
+    main()